@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the Large Corpus Model
+************************************
+
+Measures how :func:`dariah_topics.preprocessing.create_document_term_matrix()` \
+with ``large_corpus=True`` scales with the number of tokens. The corpus is \
+synthetic: documents of 1000 tokens drawn from a Zipf distribution over a \
+vocabulary growing with the corpus, which resembles natural language closely \
+enough for timing purposes. For small corpora, the former cell-by-cell \
+construction is timed as well, for all corpora the out-of-core construction \
+in shards.
+
+Run it with ``dariah_topics`` installed (e.g. ``pip install -e .``)::
+
+    $ python benchmarks/large_corpus_model.py --tokens 10000 100000 1000000
+"""
+
+import argparse
+from collections import Counter
+from functools import partial
+import time
+
+import numpy as np
+import pandas as pd
+
+from dariah_topics import preprocessing
+
+
+def synthetic_corpus(num_tokens, document_size=1000, seed=0):
+    """Creates a tokenized corpus with Zipf distributed tokens."""
+    random = np.random.RandomState(seed)
+    vocabulary_size = max(1000, int(num_tokens ** 0.7))
+    tokens = np.minimum(random.zipf(1.2, num_tokens), vocabulary_size)
+    vocabulary = np.array(['type{}'.format(n) for n in range(vocabulary_size + 1)], dtype=object)
+    tokenized_corpus = [vocabulary[tokens[n:n + document_size]].tolist()
+                        for n in range(0, num_tokens, document_size)]
+    document_labels = ['document{}'.format(n) for n in range(len(tokenized_corpus))]
+    return tokenized_corpus, document_labels
+
+
+def cell_by_cell_model(tokenized_corpus, document_labels):
+    """The former construction, setting one value per (document_id, type_id)."""
+    document_ids = {document_label: document_id for document_id, document_label in enumerate(document_labels, 1)}
+    type_ids = {}
+    bag_of_words = {document_ids[document_label]: Counter(type_ids.setdefault(token, len(type_ids) + 1) for token in tokenized_document)
+                    for document_label, tokenized_document in zip(document_labels, tokenized_corpus)}
+    tuples = [(document_id, type_id) for document_id in range(1, len(bag_of_words) + 1)
+              for type_id in bag_of_words[document_id] or [0]]
+    multi_index = pd.MultiIndex.from_tuples(tuples, names=['document_id', 'type_id'])
+    document_term_matrix = pd.DataFrame(np.zeros((len(multi_index), 1), dtype=int), index=multi_index)
+    for document_id, type_id in multi_index:
+        document_term_matrix.at[(document_id, type_id), 0] = bag_of_words[document_id].get(type_id, 0)
+    return document_term_matrix, document_ids, type_ids
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--tokens', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6],
+                        help="Corpus sizes in tokens.")
+    parser.add_argument('--shard-size', type=int, default=100,
+                        help="Number of documents per shard for the out-of-core construction.")
+    parser.add_argument('--cell-by-cell-limit', type=int, default=10 ** 5,
+                        help="Largest corpus to time the cell-by-cell construction with.")
+    args = parser.parse_args()
+
+    print("{:>12} {:>10} {:>10} {:>14} {:>11} {:>16}".format('tokens', 'documents', 'entries', 'vectorized (s)', 'sharded (s)',
+                                                            'cell-by-cell (s)'))
+    for num_tokens in args.tokens:
+        tokenized_corpus, document_labels = synthetic_corpus(num_tokens)
+        document_term_matrix, _, _ = preprocessing.create_document_term_matrix(tokenized_corpus, document_labels, True)
+        vectorized = measure(preprocessing.create_document_term_matrix, tokenized_corpus, document_labels, True)
+        sharded = measure(partial(preprocessing.create_document_term_matrix, shard_size=args.shard_size),
+                          tokenized_corpus, document_labels)
+        if num_tokens <= args.cell_by_cell_limit:
+            cell_by_cell = '{:.3f}'.format(measure(cell_by_cell_model, tokenized_corpus, document_labels))
+        else:
+            cell_by_cell = '-'
+        print("{:>12} {:>10} {:>10} {:>14.3f} {:>11.3f} {:>16}".format(num_tokens, len(tokenized_corpus), len(document_term_matrix),
+                                                                      vectorized, sharded, cell_by_cell))
+
+
+if __name__ == '__main__':
+    main()
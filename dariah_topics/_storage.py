@@ -0,0 +1,255 @@
+"""
+Storing Matrices, Corpora and LDA Models as Binary Files
+********************************************************
+
+Functions of this module are shared by :mod:`dariah_topics.preprocessing` \
+and :mod:`dariah_topics.postprocessing`, which both import it, so neither \
+of them has to import the other one for storage. NumPy arrays are saved as \
+``.npy`` files, which can be memory-mapped, strings as UTF-8 encoded tables \
+of bytes and offsets, and matrices as `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ \
+files written block by block.
+
+Contents
+********
+    * :class:`ModelBundle` gives memory-mapped access to a LDA model saved as \
+    NumPy arrays, also available as :class:`postprocessing.ModelBundle`.
+"""
+import bz2
+from functools import partial
+import gzip
+import json
+import os
+import numpy as np
+
+
+class ModelBundle:
+    """Memory-mapped LDA model.
+
+    With this class you can access a LDA model saved by :func:`postprocessing.save_model()` \
+    with ``bundle=True`` without unpickling it: The NumPy arrays of the bundle \
+    are memory-mapped, so loading is instant and processes reading the same \
+    bundle share its pages instead of holding one copy each. Pass it as \
+    ``model`` to :func:`postprocessing.show_topics()` and :func:`postprocessing.show_document_topics()`. \
+    Usually, you get a bundle from :func:`preprocessing.read_model()`.
+
+    Args:
+        directory (str): Path to the bundle directory.
+        mmap_mode (str, optional): Memory-map the arrays, see :func:`numpy.load()`.
+            If None, they are read into memory. Defaults to ``r``.
+
+    Attributes:
+        manifest (dict): Library, shapes, scalar hyperparameters and the names
+            of the arrays of the model.
+        topic_word (numpy.ndarray): Topic-word distributions, one row per topic.
+        doc_topic (numpy.ndarray): Document-topic distributions, one row per
+            document, or None.
+        alpha (numpy.ndarray): Prior of the document-topic distributions.
+        eta (numpy.ndarray): Prior of the topic-word distributions.
+
+    Example:
+        >>> import lda
+        >>> import tempfile
+        >>> from dariah_topics.postprocessing import save_model
+        >>> document_term_matrix = np.array([[2, 1, 0], [0, 1, 2]])
+        >>> model = lda.LDA(n_topics=2, n_iter=1, random_state=1).fit(document_term_matrix)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     save_model(model, tmpdir, bundle=True, vocabulary=['this', 'is', 'it'], document_labels=['one', 'two'])
+        ...     bundle = ModelBundle(tmpdir)
+        ...     bundle, bundle.vocabulary, bundle.document_labels, np.allclose(bundle.topic_word, model.topic_word_)
+        (<ModelBundle of a lda model with 2 topics>, ['this', 'is', 'it'], ['one', 'two'], True)
+    """
+    def __init__(self, directory, mmap_mode='r'):
+        with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as file:
+            self.manifest = json.load(file)
+        arrays = _load_arrays(directory, mmap_mode, self.manifest['arrays'])
+        self.topic_word = arrays['topic_word']
+        self.doc_topic = arrays.get('doc_topic')
+        hyperparameters = self.manifest['hyperparameters']
+        self.alpha = arrays.get('alpha', np.asarray(hyperparameters.get('alpha')))
+        self.eta = arrays.get('eta', np.asarray(hyperparameters.get('eta')))
+        self._arrays = arrays
+        self._vocabulary = None
+        self._document_labels = None
+
+    def __repr__(self):
+        return "<{} of a {} model with {} topics>".format(self.__class__.__name__, self.manifest['library'], self.num_topics)
+
+    @property
+    def document_labels(self):
+        """Labels of the documents of ``doc_topic``, or None."""
+        if self._document_labels is None and 'document_labels' in self._arrays:
+            self._document_labels = _decode_strings(self._arrays['document_labels'],
+                                                     self._arrays['document_labels_offsets'])
+        return self._document_labels
+
+    @property
+    def num_topics(self):
+        return self.topic_word.shape[0]
+
+    @property
+    def vocabulary(self):
+        """Types of the columns of ``topic_word``, or None."""
+        if self._vocabulary is None and 'vocabulary' in self._arrays:
+            self._vocabulary = _decode_strings(self._arrays['vocabulary'], self._arrays['vocabulary_offsets'])
+        return self._vocabulary
+
+
+def _count_digits(values):
+    """Counts the decimal digits of non-negative integers.
+
+    This private function is wrapped in :func:`_write_matrix_market()`.
+
+    Args:
+        values (numpy.ndarray): Non-negative integers.
+
+    Returns:
+        Number of digits of each value as NumPy array.
+
+    Example:
+        >>> _count_digits(np.array([0, 9, 10, 999, 1000])).tolist()
+        [1, 1, 2, 3, 4]
+    """
+    return np.searchsorted(10 ** np.arange(1, 19, dtype=np.int64), values, side='right') + 1
+
+
+def _decode_strings(blob, offsets):
+    """Decodes strings encoded by :func:`_encode_strings()`.
+
+    Args:
+        blob (numpy.ndarray): UTF-8 encoded strings as bytes.
+        offsets (numpy.ndarray): Start of each string in ``blob``, and its end.
+
+    Returns:
+        A list of strings.
+
+    Example:
+        >>> _decode_strings(*_encode_strings(['ein', 'schönes', 'Beispiel']))
+        ['ein', 'schönes', 'Beispiel']
+    """
+    data = np.asarray(blob, dtype=np.uint8).tobytes()
+    offsets = np.asarray(offsets).tolist()
+    return [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _encode_strings(strings):
+    """Encodes strings as a table of bytes and offsets.
+
+    This private function is used to store types and labels in binary files.
+
+    Args:
+        strings (list): Iterable of strings.
+
+    Returns:
+        UTF-8 encoded strings as NumPy array of bytes, and their offsets as
+            NumPy array (one more than the number of strings).
+    """
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.array([len(string) for string in encoded], dtype=np.int64))
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _load_arrays(directory, mmap_mode='r', names=None):
+    """Reads the NumPy arrays written by :func:`_save_arrays()`.
+
+    Args:
+        directory (str): Path to the directory.
+        mmap_mode (str, optional): Memory-map the arrays, see :func:`numpy.load()`.
+            Defaults to ``r``.
+        names (list, optional): Names of the arrays to read. Defaults to None,
+            i.e. all ``.npy`` files in ``directory``.
+
+    Returns:
+        A dictionary with names as keys and NumPy arrays as values.
+    """
+    if names is None:
+        names = [filename[:-4] for filename in os.listdir(directory) if filename.endswith('.npy')]
+    return {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode) for name in names}
+
+
+def _save_arrays(directory, **arrays):
+    """Writes NumPy arrays to a directory, one ``.npy`` file per array.
+
+    Use :func:`_load_arrays()` to read them (memory-mapped).
+
+    Args:
+        directory (str): Path to the directory, will be created if necessary.
+        **arrays: NumPy arrays with their names as keywords.
+
+    Returns:
+        None.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(directory, name + '.npy'), np.asarray(values))
+    return None
+
+
+def _write_matrix_market(filepath, num_documents, num_types, num_entries, blocks, compression=None):
+    """Writes blocks of entries to a Matrix Market file.
+
+    This private function is wrapped in :func:`postprocessing._save_matrix_market()` \
+    and used by :func:`preprocessing.create_document_term_matrix()` for sharded corpora. \
+    Each block is formatted at once and written to the file, so only one block \
+    has to be in memory. With ``compression``, each block is compressed on its \
+    own, i.e. the file consists of one gzip member or bzip2 stream per block, \
+    which every gzip or bzip2 reader accepts.
+    The position of each document is saved in an index (``filepath`` plus \
+    ``.index.npz``): the offset of its block in the file, its offset in the \
+    (decompressed) block and the length of its lines, in bytes. The lengths \
+    are computed from the number of digits of the IDs and frequencies, without \
+    searching the formatted text. A document must not be split across blocks.
+
+    Args:
+        filepath (str): Path to the Matrix Market file.
+        num_documents (int): Number of documents (rows).
+        num_types (int): Number of types (columns).
+        num_entries (int): Number of entries in all blocks.
+        blocks (iterable): Iterable of ``(document_ids, type_ids, frequencies)``
+            arrays. IDs start with 1.
+        compression (str, optional): Either ``gzip`` or ``bz2``. Defaults to None,
+            which means gzip if ``filepath`` ends with ``.gz``, bzip2 if it ends
+            with ``.bz2``, otherwise no compression.
+
+    Returns:
+        None.
+
+    Example:
+        >>> import tempfile
+        >>> blocks = [(np.array([1, 1]), np.array([1, 2]), np.array([2, 10])), (np.array([3]), np.array([2]), np.array([1]))]
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepath = os.path.join(tmpdir, 'document_term_matrix.mm')
+        ...     _write_matrix_market(filepath, 3, 2, 3, blocks)
+        ...     with open(filepath, 'r', encoding='utf-8') as file:
+        ...         file.read().split('\\n')
+        ...     [array.tolist() for array in np.load(filepath + '.index.npz').values()]
+        ['%%MatrixMarket matrix coordinate real general', '3 2 3', '1 1 2', '1 2 10', '3 2 1', '']
+        [[52, 0, 65], [0, 0, 0], [13, 0, 6]]
+    """
+    if compression is None:
+        compression = {'.gz': 'gzip', '.bz2': 'bz2'}.get(os.path.splitext(filepath)[1])
+    compress = {None: bytes, 'gzip': partial(gzip.compress, compresslevel=6), 'bz2': bz2.compress}[compression]
+    starts = np.zeros(num_documents, dtype=np.int64)
+    positions = np.zeros(num_documents, dtype=np.int64)
+    lengths = np.zeros(num_documents, dtype=np.int64)
+    with open(filepath, 'wb') as file:
+        header = "%%MatrixMarket matrix coordinate real general\n{} {} {}\n".format(num_documents, num_types, num_entries)
+        file.write(compress(header.encode('ascii')))
+        for document_ids, type_ids, frequencies in blocks:
+            entries = np.column_stack([document_ids, type_ids, frequencies]).astype(np.int64)
+            if not len(entries):
+                continue
+            line_ends = np.cumsum(_count_digits(entries).sum(axis=1) + 3)
+            first_lines = np.concatenate([[0], np.flatnonzero(entries[1:, 0] != entries[:-1, 0]) + 1])
+            document_starts = np.concatenate([[0], line_ends])[first_lines]
+            document_rows = entries[first_lines, 0] - 1
+            lengths[document_rows] = np.diff(np.append(document_starts, line_ends[-1]))
+            if compression is None:
+                starts[document_rows] = file.tell() + document_starts
+            else:
+                starts[document_rows] = file.tell()
+                positions[document_rows] = document_starts
+            file.write(compress(('%d %d %d\n' * len(entries) % tuple(entries.ravel().tolist())).encode('ascii')))
+    with open(filepath + '.index.npz', 'wb') as file:
+        np.savez(file, starts=starts, positions=positions, lengths=lengths)
+    return None
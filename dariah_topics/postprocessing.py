@@ -21,24 +21,36 @@ Recurrent variable names are based on the following conventions:
 
 Contents
 ********
-    * :func:`doc2bow()`
+    * :func:`doc2bow()` converts a document-term matrix to bags of words for Gensim.
     * :func:`save_document_term_matrix()` writes a document-term matrix to a `CSV <https://en.wikipedia.org/wiki/Comma-separated_values>`_
-    file or to a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file, respectively.
+    file, to a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file, or to \
+    binary files, which can be memory-mapped, respectively.
     * :func:`save_model()` saves a LDA model (except MALLET models, which will be saved \
-    by specifying a parameter of :func:`mallet.create_mallet_model()`).
+    by specifying a parameter of :func:`mallet.create_mallet_model()`), pickled \
+    or as bundle of NumPy arrays.
     * :func:`save_tokenized_corpus()` writes tokens of a tokenized corpus to plain text \
     files per document.
     * :func:`show_document_topics()` shows topic probabilities for each document.
+    * :func:`show_top_word_weights()` shows the top keys of all topics in a MALLET \
+    word-weights file, streamed and cached.
     * :func:`show_topics()` shows topics generated by a LDA model.
     * :func:`show_word_weights()` shows word probabilities for each topic.
+    * :class:`BagOfWordsCorpus` yields bags of words for Gensim lazily, from a \
+    document-term matrix or its memory-mapped binary files.
+    * :class:`ModelBundle` gives memory-mapped access to a LDA model saved as \
+    NumPy arrays.
 """
+import csv
+from functools import lru_cache, partial
 import itertools
-import operator
+import json
 import os
 import numpy as np
 import pandas as pd
 import pickle
 import logging
+from dariah_topics import preprocessing
+from dariah_topics._storage import _encode_strings, _load_arrays, _save_arrays, _write_matrix_market, ModelBundle
 
 log = logging.getLogger(__name__)
 
@@ -50,15 +62,17 @@ def doc2bow(document_term_matrix):
     to instantiate the :class:`gensim.models.LdaModel` class or get topic distributions \
     with :func:`gensim.models.LdaModel.get_document_topics()`.
 
+    The entries of the matrix are split into documents at once, by the offsets \
+    of the document IDs, see :class:`BagOfWordsCorpus`, which also yields the \
+    documents lazily, without creating the pandas Series.
+
     Args:
         document_term_matrix (pandas.DataFrame): A document-term matrix **designed
             for large corpora**.
 
     Returns:
-        List of lists containing tuples.
-    
-    Todo:
-        * Improve efficiency.
+        Pandas Series containing a list of ``(type_id, frequency)`` tuples for
+            each document.
 
     Example:
         >>> from dariah_topics import preprocessing
@@ -67,14 +81,15 @@ def doc2bow(document_term_matrix):
         >>> document_term_matrix, _, _ = preprocessing.create_document_term_matrix(tokenized_corpus, document_labels, True)
         >>> isinstance(doc2bow(document_term_matrix), pd.Series)
         True
+        >>> doc2bow(document_term_matrix)['1']
+        [(1, 1), (2, 1), (3, 1), (5, 1)]
     """
-    doc2bow = pd.Series()
-    for n, document in enumerate(document_term_matrix.index.groupby(document_term_matrix.index.get_level_values('document_id'))):
-        doc2bow[str(n)] = [(token, freq) for token, freq in zip(document_term_matrix.loc[document].index, document_term_matrix.loc[document][0])]
-    return doc2bow
+    corpus = BagOfWordsCorpus(document_term_matrix)
+    return pd.Series(list(corpus), index=[str(n) for n in range(len(corpus))], dtype=object)
 
 
-def save_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None, matrix_market=False):
+def save_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None, matrix_market=False, binary=False,
+                              compression=None):
     """Saves document-term matrix.
     
     Writes a ``document_term_matrix`` and, in case of a large corpus matrix, \
@@ -83,7 +98,17 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
     large corpora and ``matrix_market`` is True, the matrix will be saved in the \
     `Matrix Market format <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ (`.mm`). \
     Libraries like `scipy <https://www.scipy.org>`_ and `gensim <https://radimrehurek.com/gensim/>`_ \
-    are able to read and process the Matrix Market format.
+    are able to read and process the Matrix Market format. Set ``compression`` \
+    to ``gzip`` or ``bz2`` to save it as ``document_term_matrix.mm.gz`` or \
+    ``document_term_matrix.mm.bz2``, respectively. An index of the position \
+    of each document is saved next to it, see :class:`preprocessing.MatrixMarketCorpus`.
+    If ``binary`` is True, the matrix will be saved as NumPy arrays in the \
+    directory ``document_term_matrix``, which :func:`preprocessing.read_document_term_matrix()` \
+    reads memory-mapped, i.e. almost instantly and shared by all processes \
+    reading the same files. This works for all variants of ``document_term_matrix``, \
+    including :class:`preprocessing.SparseDocumentTermMatrix`, and keeps the \
+    data type of the frequencies. ``document_ids`` and ``type_ids`` will be \
+    saved as ``document_ids.npz`` and ``type_ids.npz``, see :meth:`preprocessing.Vocabulary.save()`.
     Use the function :func:`preprocessing.create_document_term_matrix()` to create a
     document-term matrix.
 
@@ -105,6 +130,10 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
         matrix_market (bool, optional): If True, matrix will be saved in Matrix
             Market format. Only for the large corpus variant of ``document_term_matrix``
             available. Defaults to False.
+        binary (bool, optional): If True, matrix will be saved in binary files.
+            Defaults to False.
+        compression (str, optional): Only with ``matrix_market``. Either ``gzip``
+            or ``bz2``. Defaults to None.
 
     Returns:
         None.
@@ -112,49 +141,82 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
     Example:
         >>> from dariah_topics import preprocessing
         >>> import os
-        >>> path = 'tmp'
+        >>> import tempfile
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> document_term_matrix = preprocessing.create_document_term_matrix(tokenized_corpus, document_labels)
-        >>> save_document_term_matrix(document_term_matrix=document_term_matrix, path=path)
-        >>> preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix.csv')) #doctest +NORMALIZE_WHITESPACE
-                      this   is  document  two  one
-        document_one   1.0  1.0       1.0  0.0  1.0
-        document_two   1.0  1.0       1.0  1.0  0.0
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     save_document_term_matrix(document_term_matrix=document_term_matrix, path=path)
+        ...     preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix.csv')) #doctest +NORMALIZE_WHITESPACE
+                      this  is  document  one  two
+        document_one     1   1         1    1    0
+        document_two     1   1         1    0    1
         >>> document_term_matrix, document_ids, type_ids = preprocessing.create_document_term_matrix(tokenized_corpus, document_labels, True)
-        >>> save_document_term_matrix(document_term_matrix, path, document_ids, type_ids)
-        >>> isinstance(preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix.csv')), pd.DataFrame)
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     save_document_term_matrix(document_term_matrix, path, document_ids, type_ids)
+        ...     isinstance(preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix.csv')), pd.DataFrame)
+        ...     save_document_term_matrix(document_term_matrix, path, document_ids, type_ids, binary=True)
+        ...     preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix')).equals(document_term_matrix)
+        True
         True
     """
     if not os.path.exists(path):
         log.info("Creating directory {} ...".format(path))
         os.makedirs(path)
+    if binary:
+        _save_binary_document_term_matrix(document_term_matrix, path, document_ids, type_ids)
+        return None
+    if isinstance(document_term_matrix, preprocessing.SparseDocumentTermMatrix):
+        document_term_matrix = document_term_matrix.to_dataframe()
     if not matrix_market:
         log.info("Saving document_term_matrix.csv to {} ...".format(path))
         document_term_matrix.to_csv(os.path.join(path, 'document_term_matrix.csv'))
     if isinstance(document_term_matrix.index, pd.MultiIndex) and not matrix_market:
         if document_ids and type_ids is not None:
             log.info("Saving document_ids.csv to {} ...".format(path))
-            pd.Series(document_ids).to_csv(os.path.join(path, 'document_ids.csv'))
+            pd.Series(dict(document_ids)).to_csv(os.path.join(path, 'document_ids.csv'))
             log.info("Saving type_ids.csv to {} ...".format(path))
-            pd.Series(type_ids).to_csv(os.path.join(path, 'type_ids.csv'))
+            pd.Series(dict(type_ids)).to_csv(os.path.join(path, 'type_ids.csv'))
         else:
             raise ValueError("You have to pass document_ids and type_ids as parameters.")
     elif isinstance(document_term_matrix.index, pd.MultiIndex) and matrix_market:
-        _save_matrix_market(document_term_matrix, path)
+        _save_matrix_market(document_term_matrix, path, compression)
     return None
 
 
-def save_model(model, filepath):
+def save_model(model, filepath, bundle=False, vocabulary=None, document_labels=None, doc2bow=None):
     """Saves a LDA model.
 
     With this function you can save a LDA model using :module:`pickle`. If you want \
     to save MALLET models, you have to specify a parameter of the function :func:`mallet.create_mallet_model()`.
 
+    With ``bundle=True``, the model is saved as a directory of NumPy arrays \
+    instead, which :func:`preprocessing.read_model()` reads memory-mapped as \
+    :class:`ModelBundle`, so several processes share one copy of the model:
+
+        * ``topic_word``: the topic-word distributions, one row per topic.
+        * ``doc_topic``: the document-topic distributions of the training corpus,
+          one row per document. For Gensim models, only if ``doc2bow`` is passed.
+        * ``vocabulary`` and ``document_labels`` as string tables.
+        * ``alpha`` and ``eta``, if they are vectors.
+        * ``manifest.json`` with the library, the shapes, scalar hyperparameters
+          and the names of the arrays, so arrays left in the directory by an
+          earlier bundle are not read.
+
     Args:
         model: Fitted LDA model produced by `Gensim <https://radimrehurek.com/gensim/>`_
             or `lda <https://pypi.python.org/pypi/lda>`_.
-        filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``.
+        filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``,
+            or to the bundle directory.
+        bundle (bool, optional): If True, save a model bundle instead of a pickle.
+            Defaults to False.
+        vocabulary (list, optional): Only for bundles. For lda, the vocabulary of
+            the document-term matrix. For Gensim, ``type_ids`` with a ``token()``
+            method, if the model has been trained without ``id2word``.
+        document_labels (list, optional): Only for bundles. Labels of the
+            documents of the training corpus.
+        doc2bow (list, optional): Only for bundles of Gensim models. The training
+            corpus, to save its document-topic distributions.
 
     Returns:
         None.
@@ -163,13 +225,18 @@ def save_model(model, filepath):
         >>> from lda import LDA
         >>> from gensim.models import LdaModel
         >>> from dariah_topics import preprocessing
-        >>> save_model(LDA, 'model.pickle')
-        >>> preprocessing.read_model('model.pickle') == LDA
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepath = os.path.join(tmpdir, 'model.pickle')
+        ...     save_model(LDA, filepath)
+        ...     preprocessing.read_model(filepath) == LDA
+        ...     save_model(LdaModel, filepath)
+        ...     preprocessing.read_model(filepath) == LdaModel
         True
-        >>> save_model(LdaModel, 'model.pickle')
-        >>> preprocessing.read_model('model.pickle') == LdaModel
         True
     """
+    if bundle:
+        return _save_model_bundle(model, filepath, vocabulary, document_labels, doc2bow)
     with open(filepath, 'wb') as file:
         pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
     return None
@@ -186,8 +253,9 @@ def save_tokenized_corpus(tokenized_corpus, document_labels, path):
 
     Args:
         tokenized_corpus (list): Tokenized corpus containing one or more
-            iterables containing tokens.
+            iterables containing tokens, or a :class:`preprocessing.TokenizedCorpus`.
         document_labels (list): Name of each `tokenized_document` in `tokenized_corpus`.
+            If None, the labels of a :class:`preprocessing.TokenizedCorpus`.
         path (str): Path to the output directory.
     
     Returns:
@@ -196,10 +264,11 @@ def save_tokenized_corpus(tokenized_corpus, document_labels, path):
     Example:
         >>> tokenized_corpus = [['this', 'is', 'a', 'tokenized', 'document']]
         >>> document_labels = ['document_label']
-        >>> path = 'tmp'
-        >>> save_tokenized_corpus(tokenized_corpus, document_labels, path)
-        >>> with open(os.path.join(path, 'document_label.txt'), 'r', encoding='utf-8') as file:
-        ...     file.read()
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     save_tokenized_corpus(tokenized_corpus, document_labels, path)
+        ...     with open(os.path.join(path, 'document_label.txt'), 'r', encoding='utf-8') as file:
+        ...         file.read()
         'this\\nis\\na\\ntokenized\\ndocument'
     """
     log.info("Saving tokenized corpus to {} ...".format(path))
@@ -207,6 +276,8 @@ def save_tokenized_corpus(tokenized_corpus, document_labels, path):
         log.info("Creating directory {} ...".format(path))
         os.makedirs(path)
 
+    if document_labels is None and isinstance(tokenized_corpus, preprocessing.TokenizedCorpus):
+        document_labels = tokenized_corpus.document_labels
     for tokenized_document, document_label in zip(tokenized_corpus, document_labels):
         log.debug("Current file: {}".format(document_label))
         with open(os.path.join(path, '{}.txt'.format(document_label)), 'w', encoding='utf-8') as file:
@@ -214,7 +285,7 @@ def save_tokenized_corpus(tokenized_corpus, document_labels, path):
     return None
 
 
-def show_document_topics(topics, model=None, document_labels=None, doc_topics_file=None, doc2bow=None, num_keys=3, easy_file_format=True):
+def show_document_topics(topics, model=None, document_labels=None, doc_topics_file=None, doc2bow=None, num_keys=3, easy_file_format=None):
     """Shows topic distribution for each document.
     
     With this function you can show the topic distributions for all documents in a pandas DataFrame. \
@@ -222,19 +293,26 @@ def show_document_topics(topics, model=None, document_labels=None, doc_topics_fi
     * `lda <https://pypi.python.org/pypi/lda>`_ model, you have to pass the model \
     as ``model`` and the document-term matrix vocabulary as ``vocabulary``.
     * `Gensim <https://radimrehurek.com/gensim/>`_ model, you have to pass only the model \
-    as ``model``.
+    as ``model``. If the model has been trained without ``id2word``, e.g. on \
+    :func:`doc2bow()` of a ``document_term_matrix`` with hashed type IDs, pass \
+    ``type_ids`` as ``vocabulary`` to translate the IDs to types.
     * `MALLET <http://mallet.cs.umass.edu/topics.php>`_ based workflow, you have to\
     pass only the ``doc_topics_file``.
     
     Args:
         topics (pandas.DataFrame, optional): Only for lda models. A pandas DataFrame
             containing all topics.
-        model (optional): lda or Gensim model.
+        model (optional): lda or Gensim model, or :class:`ModelBundle`.
         document_labels (list, optional): An list of all document labels.
+            For a :class:`ModelBundle`, defaults to its document labels.
         doc_topics_file (str, optional): Only for MALLET. Path to the doc-topics file.
         doc2bow (list, optional): A list of lists containing tuples of ``type_id`` and
             frequency.
         num_keys (int, optional): Number of top keys for each topic.
+        easy_file_format (bool, optional): Only for MALLET. If True, the
+            doc-topics file has the dense layout of MALLET 2.0.8 and later, if
+            False, the sparse layout of earlier versions. If None, the layout
+            is detected. Defaults to None.
     
     Returns:
         A pandas DataFrame with rows corresponding to topics and columns corresponding
@@ -246,7 +324,9 @@ def show_document_topics(topics, model=None, document_labels=None, doc_topics_fi
     from gensim.models import LdaModel, LdaMulticore
   
     index = [' '.join(keys[:num_keys]) for keys in topics.values]
-    if isinstance(model, LDA):
+    if isinstance(model, ModelBundle):
+        return _show_bundle_document_topics(model, document_labels, index)
+    elif isinstance(model, LDA):
         return _show_lda_document_topics(model, document_labels, index)
     elif isinstance(model, LdaModel) or isinstance(model, LdaMulticore):
         return _show_gensim_document_topics(doc2bow, model, document_labels, index)
@@ -254,6 +334,45 @@ def show_document_topics(topics, model=None, document_labels=None, doc_topics_fi
         return _show_mallet_document_topics(doc_topics_file, index, easy_file_format)
 
 
+def show_top_word_weights(word_weights_file, num_keys=10, chunksize=1000000):
+    """Shows the top keys and their weights of all topics in a MALLET word-weights file.
+
+    With this function you can read the ``num_keys`` keys with the largest \
+    weights of each topic from a ``topic_word_weights_file`` written by \
+    MALLET's ``train-topics``. The file is parsed once in blocks of \
+    ``chunksize`` lines, and only the top keys of each topic seen so far are \
+    kept, so files with millions of lines are never loaded as a whole. The \
+    result is cached for the file and its modification time, so later calls, \
+    e.g. by :func:`show_topic_key_weights()` for one topic after another, \
+    don't read the file again.
+
+    Args:
+        word_weights_file (str): Path to MALLET's word-weights file.
+        num_keys (int, optional): Number of top keys for each topic. Defaults to 10.
+        chunksize (int, optional): Number of lines parsed at once. Defaults to
+            1000000.
+
+    Returns:
+        A pandas DataFrame with the columns ``topic_id``, ``key`` and ``weight``,
+            sorted by topic and descending weight.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as tmpfile:
+        ...     tmpfile.write(b'0\\tthis\\t0.5\\n0\\tis\\t0.4\\n0\\ta\\t0.3\\n1\\tthis\\t0.1\\n1\\tis\\t0.2\\n1\\ta\\t0.3') and True
+        ...     tmpfile.flush()
+        ...     show_top_word_weights(tmpfile.name, 2, chunksize=2) #doctest: +NORMALIZE_WHITESPACE
+        True
+           topic_id   key  weight
+        0         0  this     0.5
+        1         0    is     0.4
+        2         1     a     0.3
+        3         1    is     0.2
+    """
+    top_word_weights, _ = _read_top_word_weights(word_weights_file, num_keys, chunksize)
+    return top_word_weights.drop('row', axis=1)
+
+
 def show_topics(model=None, vocabulary=None, topic_keys_file=None, num_keys=10):
     """Shows topics of LDA model.
     
@@ -263,13 +382,16 @@ def show_topics(model=None, vocabulary=None, topic_keys_file=None, num_keys=10):
     as ``model`` and the document-term matrix vocabulary as ``vocabulary``.
     * `Gensim <https://radimrehurek.com/gensim/>`_ model, you have to pass only the model \
     as ``model``.
+    * :class:`ModelBundle`, you have to pass only the bundle as ``model``.
     * `MALLET <http://mallet.cs.umass.edu/topics.php>`_ based workflow, you have to\
     pass only the ``topic_keys_file``.
     
     Args:
-        model (optional): lda or Gensim model.
-        vocabulary (list, optional): Only for lda. The vocabulary of the 
-            document-term matrix.
+        model (optional): lda or Gensim model, or :class:`ModelBundle`.
+        vocabulary (list, optional): For lda, the vocabulary of the
+            document-term matrix. For Gensim, ``type_ids`` with a ``token()``
+            method, e.g. :class:`preprocessing.HashingVocabulary`. For a
+            :class:`ModelBundle`, defaults to its vocabulary.
         topic_keys_file (str): Only for MALLET. Path to the topic keys file.
         num_keys (int, optional): Number of top keys for each topic. 
     
@@ -282,10 +404,12 @@ def show_topics(model=None, vocabulary=None, topic_keys_file=None, num_keys=10):
     from lda.lda import LDA
     from gensim.models import LdaModel, LdaMulticore
     
-    if isinstance(model, LDA):
+    if isinstance(model, ModelBundle):
+        return _show_bundle_topics(model, vocabulary, num_keys)
+    elif isinstance(model, LDA):
         return _show_lda_topics(model, vocabulary, num_keys)
     elif isinstance(model, LdaModel) or isinstance(model, LdaMulticore):
-        return _show_gensim_topics(model, num_keys)
+        return _show_gensim_topics(model, num_keys, vocabulary)
     elif topic_keys_file is not None:
         return _show_mallet_topics(topic_keys_file)
 
@@ -294,10 +418,13 @@ def show_word_weights(word_weights_file, num_tokens):
         """Read Mallet word_weigths file
 
         Description:
-            Reads Mallet word_weigths into pandas DataFrame.
+            Reads the ``num_tokens`` largest weights of a Mallet word_weigths
+            file into pandas DataFrame. The file is not loaded as a whole, but
+            streamed by :func:`show_top_word_weights()`.
 
         Args:
             word_weigts_file: Word_weights_file created with Mallet
+            num_tokens (int): Number of rows.
 
         Returns: Pandas DataFrame
         
@@ -316,8 +443,93 @@ def show_word_weights(word_weights_file, num_tokens):
             1         0    is     0.4
 
         """
-        word_weights = pd.read_table(word_weights_file, header=None, sep='\t', names=['document', 'token', 'weight'])
-        return word_weights.sort_values('weight', ascending=False)[:num_tokens]
+        top_word_weights, _ = _read_top_word_weights(word_weights_file, num_tokens)
+        order = np.lexsort((top_word_weights['row'].values, -top_word_weights['weight'].values))[:num_tokens]
+        word_weights = top_word_weights.iloc[order].set_index('row')
+        word_weights.index.name = None
+        return word_weights.rename(columns={'topic_id': 'document', 'key': 'token'})
+
+
+class BagOfWordsCorpus:
+    """Re-iterable bag-of-words corpus for Gensim.
+
+    With this class you can pass a ``document_term_matrix`` designed for large \
+    corpora to Gensim, e.g. to :class:`gensim.models.LdaMulticore`, without \
+    creating a list of bags of words: Each iteration yields one list of \
+    ``(type_id, frequency)`` tuples per document, converted block by block \
+    from the arrays of the matrix. The matrix can also be the directory \
+    ``document_term_matrix`` written by :func:`save_document_term_matrix()` \
+    with ``binary=True``, which is read memory-mapped. Empty documents yield \
+    empty lists.
+
+    Args:
+        document_term_matrix (pandas.DataFrame): A document-term matrix designed
+            for large corpora, or the path to its binary files.
+        blocksize (int, optional): Number of entries converted at once. Defaults
+            to 100000.
+
+    Example:
+        >>> from dariah_topics import preprocessing
+        >>> tokenized_corpus = [['this', 'is', 'this'], [], ['is', 'it']]
+        >>> document_term_matrix, _, _ = preprocessing.create_document_term_matrix(tokenized_corpus, ['one', 'two', 'three'], True)
+        >>> corpus = BagOfWordsCorpus(document_term_matrix)
+        >>> len(corpus), list(corpus)
+        (3, [[(1, 2), (2, 1)], [], [(2, 1), (3, 1)]])
+        >>> corpus[2]
+        [(2, 1), (3, 1)]
+    """
+    def __init__(self, document_term_matrix, blocksize=100000):
+        if isinstance(document_term_matrix, pd.DataFrame):
+            document_ids = document_term_matrix.index.get_level_values('document_id').to_numpy()
+            type_ids = document_term_matrix.index.get_level_values('type_id').to_numpy()
+            frequencies = document_term_matrix.iloc[:, 0].to_numpy()
+        else:
+            with open(os.path.join(document_term_matrix, 'manifest.json'), 'r', encoding='utf-8') as file:
+                variant = json.load(file)['variant']
+            if variant != 'large':
+                raise ValueError("Only document-term matrices designed for large corpora are supported, not {}.".format(variant))
+            arrays = _load_arrays(document_term_matrix)
+            document_ids, type_ids, frequencies = arrays['document_id'], arrays['type_id'], arrays['frequency']
+        if len(document_ids) and np.any(document_ids[1:] < document_ids[:-1]):
+            order = np.argsort(document_ids, kind='mergesort')
+            document_ids, type_ids, frequencies = document_ids[order], type_ids[order], frequencies[order]
+        self.type_ids = type_ids
+        self.frequencies = frequencies
+        self.offsets = np.concatenate([[0], np.flatnonzero(document_ids[1:] != document_ids[:-1]) + 1,
+                                       [len(document_ids)] if len(document_ids) else []]).astype(np.int64)
+        self.blocksize = blocksize
+
+    def __getitem__(self, n):
+        return next(self._bags(n, n + 1))
+
+    def __iter__(self):
+        num_documents = len(self)
+        start = 0
+        while start < num_documents:
+            end = int(np.searchsorted(self.offsets, self.offsets[start] + self.blocksize, side='right')) - 1
+            end = min(max(end, start + 1), num_documents)
+            yield from self._bags(start, end)
+            start = end
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return "<{} with {} documents>".format(self.__class__.__name__, len(self))
+
+    def _bags(self, start, end):
+        if not 0 <= start < end <= len(self):
+            raise IndexError(start)
+        offsets = self.offsets[start:end + 1]
+        type_ids = np.asarray(self.type_ids[offsets[0]:offsets[-1]])
+        frequencies = np.asarray(self.frequencies[offsets[0]:offsets[-1]])
+        stored = frequencies != 0
+        stored_before = np.zeros(len(stored) + 1, dtype=np.int64)
+        np.cumsum(stored, out=stored_before[1:])
+        entries = list(zip(type_ids[stored].tolist(), frequencies[stored].tolist()))
+        offsets = stored_before[offsets - offsets[0]].tolist()
+        for bag_start, bag_end in zip(offsets[:-1], offsets[1:]):
+            yield entries[bag_start:bag_end]
 
 
 def _grouper(n, iterable, fillvalue=None):
@@ -337,6 +549,66 @@ def _grouper(n, iterable, fillvalue=None):
     return itertools.zip_longest(*args, fillvalue=fillvalue)
 
 
+def _show_bundle_document_topics(model, document_labels, index):
+    """Creates a document-topic matrix from a :class:`ModelBundle`.
+
+    Args:
+        model (ModelBundle): Memory-mapped LDA model.
+        document_labels (list): Labels of the documents. If None, the labels
+            of the bundle.
+        index (list): Labels of the topics.
+
+    Returns:
+        DataFrame with one row per topic and one column per document.
+
+    Raises:
+        ValueError, if the bundle has no document-topic distributions.
+    """
+    if model.doc_topic is None:
+        raise ValueError("The model bundle contains no document-topic distributions.")
+    if document_labels is None:
+        document_labels = model.document_labels
+    return pd.DataFrame(np.asarray(model.doc_topic).T, index=index, columns=document_labels)
+
+
+def _show_bundle_topics(model, vocabulary, num_keys):
+    """Converts the topic-word distributions of a :class:`ModelBundle` to a DataFrame.
+
+    Only the ``num_keys`` largest weights of each topic are sorted.
+
+    Args:
+        model (ModelBundle): Memory-mapped LDA model.
+        vocabulary (list): Types of the model. If None, the vocabulary of the bundle.
+        num_keys (int): Number of top keywords for each topic.
+
+    Returns:
+        DataFrame.
+
+    Example:
+        >>> import lda
+        >>> import tempfile
+        >>> document_term_matrix = np.array([[5, 1, 0], [0, 1, 5]])
+        >>> model = lda.LDA(n_topics=2, n_iter=50, random_state=1).fit(document_term_matrix)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     save_model(model, tmpdir, bundle=True, vocabulary=['this', 'is', 'it'])
+        ...     topics = _show_bundle_topics(ModelBundle(tmpdir), None, 2)
+        >>> topics.equals(_show_lda_topics(model, ['this', 'is', 'it'], 2))
+        True
+    """
+    log.info("Accessing topics from model bundle ...")
+    if vocabulary is None:
+        vocabulary = model.vocabulary
+    vocabulary = np.asarray(vocabulary, dtype=object)
+    num_keys = min(num_keys, model.topic_word.shape[1])
+    topics = []
+    for topic_distribution in model.topic_word:
+        top = np.argpartition(topic_distribution, -num_keys)[-num_keys:]
+        topics.append(vocabulary[top[np.argsort(topic_distribution[top], kind='stable')[::-1]]])
+    index = ['Topic {}'.format(n) for n in range(len(topics))]
+    columns = ['Key {}'.format(n) for n in range(num_keys)]
+    return pd.DataFrame(topics, index=index, columns=columns)
+
+
 def _show_gensim_document_topics(doc2bow, model, document_labels, index):
     """Creates a document-topic-matrix.
     
@@ -375,7 +647,7 @@ def _show_gensim_document_topics(doc2bow, model, document_labels, index):
     return pd.DataFrame(document_topics, index=index, columns=document_labels)
 
 
-def _show_gensim_topics(model, num_keys=10):
+def _show_gensim_topics(model, num_keys=10, vocabulary=None):
     """Converts gensim output to DataFrame.
 
     Description:
@@ -385,6 +657,8 @@ def _show_gensim_topics(model, num_keys=10):
     Args:
         model: Gensim LDA model.
         num_keys (int): Number of top keywords for topic.
+        vocabulary (optional): ``type_ids`` with a ``token()`` method to
+            translate the IDs of the model to types. Defaults to None.
 
     Returns:
         DataFrame.
@@ -403,8 +677,12 @@ def _show_gensim_topics(model, num_keys=10):
     """
     log.info("Accessing topics from Gensim model ...")
     topics = []
-    for n, topic in model.show_topics(formatted=False, num_words=num_keys):
-        topics.append([key[0] for key in topic])
+    if vocabulary is not None:
+        for n in range(model.num_topics):
+            topics.append([vocabulary.token(type_id) for type_id, _ in model.get_topic_terms(n, topn=num_keys)])
+    else:
+        for n, topic in model.show_topics(formatted=False, num_words=num_keys):
+            topics.append([key[0] for key in topic])
     index = ['Topic {}'.format(n) for n in range(len(topics))]
     columns = ['Key {}'.format(n) for n in range(num_keys)]
     return pd.DataFrame(topics, index=index, columns=columns)
@@ -484,15 +762,30 @@ def _show_lda_topics(model, vocabulary, num_keys):
     return pd.DataFrame(topics, index=index, columns=columns)
 
 
-def _show_mallet_document_topics(doc_topics_file, index, easy_file_format):
+def _show_mallet_document_topics(doc_topics_file, index, easy_file_format=None, chunksize=100000):
     """Shows document-topic-mapping.
+
+    Reads both layouts of MALLET's doc-topics file: The dense layout (MALLET \
+    2.0.8 and later) with one proportion per topic, and the sparse layout \
+    (earlier versions, starting with a ``#doc name topic proportion`` header) \
+    with pairs of topic and proportion. The file is read in blocks of \
+    ``chunksize`` lines, whose values are parsed at once by NumPy into a \
+    preallocated float32 array, so multi-gigabyte files need little more \
+    memory than the resulting matrix.
+
     Args:
-        outfolder (str): Folder for MALLET output.
-        doc_topics (str): Name of MALLET's doc_topic file. Defaults to 'doc_topics.txt'.
-        topic_keys (str): Name of MALLET's topic_keys file. Defaults to 'topic_keys.txt'.
+        doc_topics_file (str): Path to MALLET's doc-topics file.
+        index (list): Labels of the topics.
+        easy_file_format (bool, optional): If True, the file has the dense
+            layout, if False, the sparse one. If None, the layout is detected.
+            Defaults to None.
+        chunksize (int, optional): Number of lines parsed at once. Defaults
+            to 100000.
+
+    Returns:
+        DataFrame with one row per topic and one column per document, labeled
+            with the file name of the document without extension.
 
-    ToDo: Prettify docnames
-    
     Example:
         >>> import tempfile
         >>> index = ['first topic', 'second topic']
@@ -504,42 +797,59 @@ def _show_mallet_document_topics(doc_topics_file, index, easy_file_format):
                       document_one  document_two
         first topic            0.1           0.4
         second topic           0.2           0.5
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as tmpfile:
+        ...     tmpfile.write(b'#doc name topic proportion ...\\n'
+        ...                   b'0\\tfile:/corpus/document_one.txt\\t1\\t0.75\\t0\\t0.25\\t\\n'
+        ...                   b'1\\tfile:/corpus/document_two.txt\\t0\\t0.5\\t\\n') and True
+        ...     tmpfile.flush()
+        ...     _show_mallet_document_topics(tmpfile.name, index, chunksize=1) #doctest: +NORMALIZE_WHITESPACE
+        True
+                      document_one  document_two
+        first topic           0.25           0.5
+        second topic          0.75           0.0
     """
-    document_topics_triples = []
+    num_lines = 0
+    with open(doc_topics_file, 'rb') as file:
+        for block in iter(partial(file.read, 2 ** 20), b''):
+            num_lines += block.count(b'\n')
+    num_lines += 1
+    document_topics = np.zeros((num_lines, len(index)), dtype=np.float32)
+    document_ids = {}
     document_labels = []
-    topics = []
     with open(doc_topics_file, 'r', encoding='utf-8') as file:
-        for line in file:
-            l = line.lstrip()
-            if l.startswith('#'):
-                lines = file.readlines()
-                for line in lines:
-                    documet_number, document_label, *values = line.rstrip().split('\t')
-                    document_labels.append(os.path.splitext(os.path.basename(document_label))[0])
-                    for topic, share in _grouper(2, values):
-                        triple = (document_label, int(topic), float(share))
-                        topics.append(int(topic))
-                        document_topics_triples.append(triple)
-            else:
-                easy_file_format = True
+        lines = iter(file)
+        if easy_file_format is None:
+            first_line = next(lines, '')
+            easy_file_format = not first_line.lstrip().startswith('#')
+            if easy_file_format:
+                lines = itertools.chain([first_line], lines)
+        elif not easy_file_format:
+            lines = itertools.dropwhile(lambda line: line.lstrip().startswith('#'), lines)
+        while True:
+            chunk = list(itertools.islice(lines, chunksize))
+            if not chunk:
                 break
-    if easy_file_format:
-        document_topics = pd.read_table(doc_topics_file, sep='\t', header=None)
-        document_topics.index = [os.path.splitext(os.path.basename(document_label))[0] for document_label in document_topics[1]]
-        document_topics = document_topics.drop([0, 1], axis=1)
-        document_topics.columns = index
-        return document_topics.T
-    else:
-        document_topics_triples = sorted(document_topics_triples, key=operator.itemgetter(0, 1))
-        document_labels = sorted(document_labels)
-        num_documents = len(document_labels)
-        num_topics = len(topics)
-        document_topics = np.zeros((num_documents, num_topics))
-        for triple in document_topics_triples:
-            document_label, topic, share = triple
-            index_num = document_labels.index(document_label)
-            document_topics[index_num, topic] = share
-    return pd.DataFrame(document_topics, index=index, columns=columns.T)
+            rows, values, counts = [], [], []
+            for line in chunk:
+                fields = line.rstrip().split('\t', 2)
+                if len(fields) < 2:
+                    continue
+                document_label = os.path.splitext(os.path.basename(fields[1]))[0]
+                if document_label not in document_ids:
+                    document_ids[document_label] = len(document_labels)
+                    document_labels.append(document_label)
+                rows.append(document_ids[document_label])
+                value = fields[2] if len(fields) > 2 else ''
+                values.append(value)
+                counts.append(value.count('\t') + 1 if value else 0)
+            values = np.fromstring(' '.join(value for value in values if value), dtype=np.float32, sep=' ')
+            if easy_file_format:
+                document_topics[rows] = values.reshape(len(rows), len(index))
+            else:
+                rows = np.repeat(np.array(rows, dtype=np.int64), np.array(counts, dtype=np.int64) // 2)
+                document_topics[rows, values[0::2].astype(np.int64)] = values[1::2]
+    document_topics = document_topics[:len(document_labels)]
+    return pd.DataFrame(document_topics.T, index=index, columns=document_labels)
 
 
 def _show_mallet_topics(path_to_topic_keys_file):
@@ -577,7 +887,232 @@ def _show_mallet_topics(path_to_topic_keys_file):
     return pd.DataFrame(topics, index=index, columns=columns)
 
 
-def _save_matrix_market(document_term_matrix, path):
+def _token(vocabulary, type_id):
+    """Returns the type of an identifier, or an empty string if there is none.
+
+    Example:
+        >>> from dariah_topics import preprocessing
+        >>> vocabulary = preprocessing.Vocabulary.from_dict({'this': 1})
+        >>> _token(vocabulary, 0), _token(vocabulary, 1)
+        ('', 'this')
+    """
+    try:
+        return vocabulary.token(type_id)
+    except KeyError:
+        return ''
+
+
+def _read_top_word_weights(word_weights_file, num_keys, chunksize=1000000):
+    """Reads the top keys of each topic from a MALLET word-weights file.
+
+    This private function is wrapped in :func:`show_top_word_weights()`, \
+    :func:`show_word_weights()` and :func:`show_topic_key_weights()`. The \
+    result is cached for the absolute path, the modification time and the \
+    size of the file.
+
+    Args:
+        word_weights_file (str): Path to MALLET's word-weights file.
+        num_keys (int): Number of top keys for each topic.
+        chunksize (int, optional): Number of lines parsed at once. Defaults to
+            1000000.
+
+    Returns:
+        A pandas DataFrame with the columns ``topic_id``, ``key``, ``weight`` and
+            ``row`` (the line number in the file), sorted by topic, descending
+            weight and line number, and a dictionary with topic IDs as keys and
+            the start and end of their rows in the DataFrame as values.
+    """
+    filepath = os.path.abspath(word_weights_file)
+    stat = os.stat(filepath)
+    return _read_top_word_weights_cached(filepath, stat.st_mtime_ns, stat.st_size, num_keys, chunksize)
+
+
+@lru_cache(maxsize=16)
+def _read_top_word_weights_cached(filepath, mtime, size, num_keys, chunksize):
+    """Reads the top keys of each topic, see :func:`_read_top_word_weights()`.
+
+    ``mtime`` and ``size`` are only part of the cache key.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as tmpfile:
+        ...     tmpfile.write(b'0\\tthis\\t0.5\\n1\\tthis\\t0.2\\n0\\tis\\t0.5\\n0\\tNA\\t0.6') and True
+        ...     tmpfile.flush()
+        ...     top_word_weights, offsets = _read_top_word_weights_cached(tmpfile.name, 0, 0, 2, 1)
+        True
+        >>> top_word_weights.values.tolist(), offsets
+        ([[0, 'NA', 0.6, 3], [0, 'this', 0.5, 0], [1, 'this', 0.2, 1]], {0: (0, 2), 1: (2, 3)})
+    """
+    log.info("Reading top {} keys per topic from {} ...".format(num_keys, filepath))
+    topic_ids = np.zeros(0, dtype=np.int64)
+    keys = np.zeros(0, dtype=object)
+    weights = np.zeros(0, dtype=np.float64)
+    rows = np.zeros(0, dtype=np.int64)
+    chunks = pd.read_csv(filepath, sep='\t', header=None, names=['topic_id', 'key', 'weight'], quoting=csv.QUOTE_NONE,
+                         keep_default_na=False, dtype={'topic_id': np.int64, 'key': object, 'weight': np.float64},
+                         chunksize=chunksize)
+    start = 0
+    for chunk in chunks:
+        topic_ids = np.concatenate([topic_ids, chunk['topic_id'].values])
+        keys = np.concatenate([keys, chunk['key'].values.astype(object)])
+        weights = np.concatenate([weights, chunk['weight'].values])
+        rows = np.concatenate([rows, np.arange(start, start + len(chunk), dtype=np.int64)])
+        start += len(chunk)
+        order = np.lexsort((rows, -weights, topic_ids))
+        topic_ids, keys, weights, rows = topic_ids[order], keys[order], weights[order], rows[order]
+        group_starts = np.flatnonzero(np.concatenate([[True], topic_ids[1:] != topic_ids[:-1]])) if len(topic_ids) else []
+        ranks = np.arange(len(topic_ids)) - np.repeat(group_starts, np.diff(np.append(group_starts, len(topic_ids))))
+        top = ranks < num_keys
+        topic_ids, keys, weights, rows = topic_ids[top], keys[top], weights[top], rows[top]
+    top_word_weights = pd.DataFrame({'topic_id': topic_ids, 'key': keys, 'weight': weights, 'row': rows})
+    unique_topic_ids, starts, counts = np.unique(topic_ids, return_index=True, return_counts=True)
+    offsets = {topic_id: (start, start + count) for topic_id, start, count in
+               zip(unique_topic_ids.tolist(), starts.tolist(), counts.tolist())}
+    return top_word_weights, offsets
+
+
+def _save_binary_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None):
+    """Writes a ``document_term_matrix`` to binary files.
+
+    This private function is wrapped in :func:`save_document_term_matrix()`. \
+    The matrix is saved in the directory ``document_term_matrix`` as one \
+    ``.npy`` file per NumPy array and a ``manifest.json`` with its variant \
+    (``dense``, ``sparse`` or ``large``) and shape:
+
+        * ``dense``: ``values``, and document labels and types as string tables
+          (``index``, ``index_offsets``, ``columns``, ``columns_offsets``).
+        * ``sparse``: ``data``, ``indices`` and ``indptr`` of the compressed
+          sparse row matrix, and the same string tables.
+        * ``large``: ``document_id``, ``type_id`` and ``frequency`` of each entry.
+
+    Document labels and types are saved as strings.
+
+    Args:
+        document_term_matrix (pandas.DataFrame): Document-term matrix, or
+            :class:`preprocessing.SparseDocumentTermMatrix`.
+        path (str): Path to the output directory.
+        document_ids (dict, optional): Only required for large corpora. Defaults to None.
+        type_ids (dict, optional): Only required for large corpora. Defaults to None.
+
+    Returns:
+        None.
+
+    Example:
+        >>> import tempfile
+        >>> document_term_matrix = pd.DataFrame([[1, 0], [2, 1]], index=['one', 'two'], columns=['this', 'is'])
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     _save_binary_document_term_matrix(document_term_matrix, tmpdir)
+        ...     sorted(os.listdir(os.path.join(tmpdir, 'document_term_matrix')))
+        ['columns.npy', 'columns_offsets.npy', 'index.npy', 'index_offsets.npy', 'manifest.json', 'values.npy']
+    """
+    directory = os.path.join(path, 'document_term_matrix')
+    log.info("Saving {} to binary files ...".format(directory))
+    if isinstance(document_term_matrix, preprocessing.SparseDocumentTermMatrix):
+        variant = 'sparse'
+        matrix = document_term_matrix.matrix
+        arrays = {'data': matrix.data, 'indices': matrix.indices, 'indptr': matrix.indptr}
+    elif isinstance(document_term_matrix.index, pd.MultiIndex):
+        if document_ids is None or type_ids is None:
+            raise ValueError("You have to pass document_ids and type_ids as parameters.")
+        variant = 'large'
+        arrays = {'document_id': document_term_matrix.index.get_level_values('document_id').values,
+                  'type_id': document_term_matrix.index.get_level_values('type_id').values,
+                  'frequency': document_term_matrix[0].values}
+    else:
+        variant = 'dense'
+        arrays = {'values': document_term_matrix.values}
+    if variant != 'large':
+        for name, labels in [('index', document_term_matrix.index), ('columns', document_term_matrix.columns)]:
+            arrays[name], arrays[name + '_offsets'] = _encode_strings(str(label) for label in labels)
+    _save_arrays(directory, **arrays)
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump({'variant': variant, 'shape': list(document_term_matrix.shape)}, file)
+    for name, token2id in [('document_ids', document_ids), ('type_ids', type_ids)]:
+        if token2id is not None:
+            log.info("Saving {}.npz to {} ...".format(name, path))
+            if not isinstance(token2id, preprocessing.Vocabulary):
+                token2id = preprocessing.Vocabulary.from_dict(token2id)
+            token2id.save(os.path.join(path, name + '.npz'))
+    return None
+
+
+def _save_model_bundle(model, directory, vocabulary=None, document_labels=None, doc2bow=None):
+    """Writes a LDA model to a directory of NumPy arrays.
+
+    This private function is wrapped in :func:`save_model()`.
+
+    Args:
+        model: Fitted LDA model produced by Gensim or lda.
+        directory (str): Path to the bundle directory.
+        vocabulary (list, optional): Types of the model, see :func:`save_model()`.
+        document_labels (list, optional): Labels of the training documents.
+        doc2bow (list, optional): Training corpus of a Gensim model.
+
+    Returns:
+        None.
+
+    Example:
+        >>> import tempfile
+        >>> from gensim.models import LdaModel
+        >>> doc2bow = [[(0, 2), (1, 1)], [(1, 1), (2, 2)]]
+        >>> model = LdaModel(doc2bow, num_topics=2, iterations=1, passes=1, random_state=1)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     _save_model_bundle(model, tmpdir, doc2bow=doc2bow)
+        ...     sorted(os.listdir(tmpdir))
+        ['alpha.npy', 'doc_topic.npy', 'eta.npy', 'manifest.json', 'topic_word.npy', 'vocabulary.npy', 'vocabulary_offsets.npy']
+    """
+    from lda.lda import LDA
+    from gensim.models import LdaModel
+
+    log.info("Saving model bundle to {} ...".format(directory))
+    if isinstance(model, LDA):
+        library = 'lda'
+        topic_word = model.topic_word_
+        doc_topic = model.doc_topic_
+        parameters = ['alpha', 'eta', 'n_iter', 'random_state']
+    elif isinstance(model, LdaModel):
+        library = 'gensim'
+        topic_word = model.get_topics()
+        doc_topic = None
+        if doc2bow is not None:
+            doc_topic = np.zeros((len(doc2bow), model.num_topics), dtype=topic_word.dtype)
+            for n, document in enumerate(doc2bow):
+                for topic, share in model.get_document_topics(document, minimum_probability=0):
+                    doc_topic[n, topic] = share
+        if vocabulary is None:
+            vocabulary = model.id2word
+        parameters = ['alpha', 'eta', 'passes', 'iterations', 'decay', 'offset', 'random_state']
+    else:
+        raise TypeError("Only lda and Gensim models can be saved as bundle, not {}.".format(type(model).__name__))
+
+    arrays = {'topic_word': topic_word}
+    if doc_topic is not None:
+        arrays['doc_topic'] = doc_topic
+    if vocabulary is not None:
+        if hasattr(vocabulary, 'token'):
+            vocabulary = [_token(vocabulary, type_id) for type_id in range(topic_word.shape[1])]
+        elif not isinstance(vocabulary, (list, tuple, np.ndarray, pd.Index)):
+            vocabulary = [vocabulary[type_id] for type_id in range(topic_word.shape[1])]
+        arrays['vocabulary'], arrays['vocabulary_offsets'] = _encode_strings(str(token) for token in vocabulary)
+    if document_labels is not None:
+        arrays['document_labels'], arrays['document_labels_offsets'] = \
+            _encode_strings(str(label) for label in document_labels)
+    hyperparameters = {}
+    for name in parameters:
+        value = getattr(model, name, None)
+        if isinstance(value, np.ndarray) and value.ndim:
+            arrays[name] = value
+        elif isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            hyperparameters[name] = value.item() if isinstance(value, np.number) else value
+    _save_arrays(directory, **arrays)
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump({'library': library, 'shape': list(topic_word.shape),
+                   'num_documents': None if doc_topic is None else len(doc_topic),
+                   'hyperparameters': hyperparameters, 'arrays': sorted(arrays)}, file)
+    return None
+
+
+def _save_matrix_market(document_term_matrix, path, compression=None, blocksize=100000):
     """
     Writes a `document_term_matrix` designed for large corpora to `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file (`.mm`). Libraries like `scipy <https://www.scipy.org>`_
     and `gensim <https://radimrehurek.com/gensim/>`_ are able to read and process
@@ -592,30 +1127,49 @@ def _save_matrix_market(document_term_matrix, path):
             with `document_ids` for level 0 and `type_ids` for level 1. Will be
             saved as `document_term_matrix.mm`.
         path (str): Path to the output directory.
+        compression (str, optional): Either ``gzip`` or ``bz2``. Defaults to None.
+        blocksize (int, optional): Approximate number of entries written at once.
+            Defaults to 100000.
 
     Returns:
         None.
 
     Example:
+        >>> import tempfile
+        >>> from dariah_topics import preprocessing
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_term_matrix, _, _ = preprocessing.create_document_term_matrix(tokenized_corpus, ['one', 'two'], True)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     _save_matrix_market(document_term_matrix, tmpdir)
+        ...     with open(os.path.join(tmpdir, 'document_term_matrix.mm'), 'r', encoding='utf-8') as file:
+        ...         file.read().split('\\n')[:3]
+        ['%%MatrixMarket matrix coordinate real general', '2 5 8', '1 1 1']
     """
-    num_docs = document_term_matrix.index.get_level_values('document_id').max()
-    num_types = document_term_matrix.index.get_level_values('type_id').max()
-    sum_counts = document_term_matrix[0].sum()
-    header = "{} {} {}\n".format(num_docs, num_types, sum_counts)
-
-    with open(os.path.join(path, 'document_term_matrix.mm'), 'w', encoding='utf-8') as file:
-        file.write("%%MatrixMarket matrix coordinate real general\n")
-        file.write(header)
-        document_term_matrix.to_csv(file, sep=' ', header=None)
+    document_ids = document_term_matrix.index.get_level_values('document_id').values
+    type_ids = document_term_matrix.index.get_level_values('type_id').values
+    frequencies = document_term_matrix[0].values
+    entries = frequencies != 0
+    num_documents = document_ids.max() if len(document_ids) else 0
+    num_types = type_ids.max() if len(type_ids) else 0
+    document_ids, type_ids, frequencies = document_ids[entries], type_ids[entries], frequencies[entries]
+    document_starts = np.flatnonzero(document_ids[1:] != document_ids[:-1]) + 1
+    cuts = np.unique(document_starts[np.searchsorted(document_starts, np.arange(blocksize, len(document_ids), blocksize))
+                                     .clip(max=max(len(document_starts) - 1, 0))]) if len(document_starts) else []
+    bounds = [0] + [int(cut) for cut in cuts] + [len(document_ids)]
+    blocks = ((document_ids[start:end], type_ids[start:end], frequencies[start:end])
+              for start, end in zip(bounds[:-1], bounds[1:]))
+    filename = 'document_term_matrix.mm' + {None: '', 'gzip': '.gz', 'bz2': '.bz2'}[compression]
+    _write_matrix_market(os.path.join(path, filename), num_documents, num_types, int(entries.sum()), blocks, compression)
     return None
 
+
 def show_topic_key_weights(topic_no, num_keys, model=None, vocabulary=None, topic_word_weights_file=None, sort_ascending=None):
     if vocabulary is not None and topic_word_weights_file is None:
         key_weights = _show_lda_key_weights(model, vocabulary, topic_no, num_keys)
     elif vocabulary is None and topic_word_weights_file is None:
         key_weights = _show_gensim_key_weights(model, topic_no, num_keys)
     elif topic_word_weights_file is not None:
-        key_weights = _show_mallet_key_weights(topic_word_weights_file, topic_no)
+        key_weights = _show_mallet_key_weights(topic_word_weights_file, topic_no, num_keys, sort_ascending)
     if sort_ascending is None:
         return pd.Series(key_weights)[:num_keys]
     else:
@@ -627,7 +1181,12 @@ def _show_lda_key_weights(model, vocabulary, topic_no, num_keys):
 def _show_gensim_key_weights(model, topic_no, num_keys):
     return dict(model.show_topic(topic_no, num_keys))
 
-def _show_mallet_key_weights(topic_word_weights_file, topic_no):
+def _show_mallet_key_weights(topic_word_weights_file, topic_no, num_keys=None, sort_ascending=None):
+    if num_keys is not None and sort_ascending is False:
+        top_word_weights, offsets = _read_top_word_weights(topic_word_weights_file, num_keys)
+        start, end = offsets.get(topic_no, (0, 0))
+        key_weights = top_word_weights.iloc[start:end]
+        return dict(zip(key_weights['key'], key_weights['weight']))
     key_weights = pd.read_table(topic_word_weights_file, sep='\t', header=None, names=['topic_id', 'key', 'weight'])
     key_weights = key_weights[key_weights['topic_id'] == topic_no].drop('topic_id', axis=1)
     return key_weights.set_index('key')['weight'].to_dict()
@@ -15,7 +15,8 @@ conventions:
     * ``dkpro_document`` means a pandas DataFrame containing tokens and additional \
     information, e.g. *part-of-speech tags* or *lemmas*, produced by `DARIAH-DKPro-Wrapper <https://github.com/DARIAH-DE/DARIAH-DKPro-Wrapper>`_.
     * ``tokenized_corpus`` means an iterable containing at least one ``tokenized_document`` \
-    or ``dkpro_document``.
+    or ``dkpro_document``, or a :class:`TokenizedCorpus`, which stores identifiers \
+    instead of tokens.
     * ``tokenized_document`` means an iterable containing tokens of a ``document``.
     * ``document_labels`` means an iterable containing names of each ``document`` \
     and must have as much elements as ``corpus`` or ``tokenized_corpus`` does.
@@ -25,116 +26,277 @@ conventions:
     and only one column corresponding to word frequencies. The first column of the \
     MultiIndex corresponds to a document ID (based on ``document_labels``) and the \
     second column to a type ID. The first variant is designed for small and the \
-    second for large corpora.
+    second for large corpora. The first variant is also available as \
+    :class:`SparseDocumentTermMatrix`.
     * ``token2id`` means a dictionary containing a token as key and an unique identifier \
-    as key, e.g. ``{'first_document': 0, 'second_document': 1}``.
+    as key, e.g. ``{'first_document': 0, 'second_document': 1}``. ``type_ids`` \
+    created by :func:`create_document_term_matrix()` are a :class:`Vocabulary`, \
+    which can be used like a dictionary.
 
 Contents
 ********
     * :func:`add_token2id` adds a token to a ``document_ids`` or ``type_ids`` dictionary \
     and assigns an unique identifier.
     * :func:`create_document_term_matrix()` creates a document-term matrix, for either \
-    small or large corpora.
+    small or large corpora, or out-of-core for corpora larger than memory.
     * :func:`filter_pos_tags()` filters a ``dkpro_document`` by specific \
     *part-of-speech tags* and returns either tokens or, if available, lemmas.
     * :func:`find_hapax_legomena()` determines *hapax legomena* based on frequencies \
     of a ``document_term_matrix``.
     * :func:`find_stopwords()` determines *most frequent words* based on frequencies \
     of a ``document_term_matrix``.
-    * :func:`read_document_term_matrix()` reads a document-term matrix from a CSV file.
+    * :func:`read_document_term_matrix()` reads a document-term matrix from a CSV \
+    file or memory-mapped binary files.
     * :func:`read_from_pathlist()` reads one or multiple files based on a pathlist.
     * :func:`read_matrix_market_file()` reads a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ \
     file for `Gensim <https://radimrehurek.com/gensim/>`_.
-    * :func:`read_model()` reads a LDA model.
+    * :func:`read_model()` reads a LDA model, pickled or as memory-mapped bundle.
     * :func:`read_token2id()` reads a ``document_ids`` or ``type_ids`` dictionary \
-    from a CSV file.
+    from a CSV file, or a :class:`Vocabulary` from a binary file.
     * :func:`remove_features()` removes features from a ``document_term_matrix``.
     * :func:`segment()` is a wrapper for :func:`segment_fuzzy()` and segments a \
     ``tokenized_document`` into segments of a certain number of tokens, respecting existing chunks.
     * :func:`segment_fuzzy()` segments a ``tokenized_document``, tolerating existing \
     chunks (like paragraphs).
+    * :func:`segment_spans()` computes the spans of segments from the lengths \
+    of chunks, following the rules of :func:`segment_fuzzy()`.
     * :func:`split_paragraphs()` splits a ``document`` or ``dkpro_document`` by paragraphs.
+    * :func:`stream_paragraphs()` splits a ``document``, an open file or a \
+    ``dkpro_document`` by paragraphs, one paragraph after another.
+    * :func:`stream_dkpro_corpus()` reads lemmas or tokens with selected \
+    *part-of-speech tags* from DARIAH-DKPro-Wrapper output, file by file.
+    * :func:`stream_tokenized_corpus()` reads, tokenizes and segments files one \
+    after another.
     * :func:`tokenize()` tokenizes a ``document`` based on a Unicode regular expression.
+    * :func:`tokenize_corpus()` tokenizes all documents of a ``corpus`` in parallel.
+    * :func:`top_ngrams()` determines the most frequent n-grams of a ``tokenized_corpus`` \
+    in fixed memory.
+    * :class:`CorpusStatistics` counts frequencies of a ``document_term_matrix`` \
+    once for stopwords, hapax legomena and document frequency filters.
+    * :class:`HashingVocabulary` assigns identifiers to types by hashing, and \
+    is used as ``type_ids`` instead of a :class:`Vocabulary` for very large corpora.
+    * :class:`MatrixMarketCorpus` streams a plain or compressed Matrix Market \
+    file for Gensim, with random access to documents.
+    * :class:`PreprocessingCache` stores tokenized documents on disk and serves \
+    them on the next run without reading and tokenizing the files again.
+    * :class:`SparseDocumentTermMatrix` is a sparse ``document_term_matrix`` for \
+    small corpora, which can be converted to a pandas DataFrame.
+    * :class:`TokenizedCorpus` stores a ``tokenized_corpus`` as identifiers in \
+    one flat array.
+    * :class:`Vocabulary` assigns identifiers to types while counting them, and \
+    is used as ``type_ids``.
 """
 
 
-from collections import Counter, defaultdict
+from array import array
+import bz2
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+import codecs
 import csv
-from itertools import chain
-from gensim.corpora import MmCorpus
+from functools import partial
+from itertools import chain, count, islice, repeat
+import hashlib
+import gzip
+import heapq
+import json
 import os
 from lxml import etree
 import numpy as np
 import pandas as pd
 import pickle
+import queue
 import regex
+from scipy.sparse import csr_matrix
 import logging
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import zlib
+from dariah_topics._storage import _decode_strings, _encode_strings, _load_arrays, _save_arrays, \
+    _write_matrix_market, ModelBundle
 
 log = logging.getLogger(__name__)
 
+_UNREADABLE = (OSError, UnicodeDecodeError, etree.XMLSyntaxError)
+
 
 def add_token2id(token, token2id):
     """Adds token to token2id dictionary.
 
     With this function you can append a ``token`` to an existing ``token2id`` \
-    dictionary. If ``token2id`` has *x* elements with *n* identifiers, ``token`` \
-    will be element *x + 1* with identifier *n + 1*. 
+    dictionary or :class:`Vocabulary`. If the highest identifier in ``token2id`` \
+    is *n*, ``token`` will get the identifier *n + 1*. 
 
     Args:
         token (str): Token.
-        token2id (dict): A dictionary with tokens as keys and identifiers as values.
+        token2id (dict): A dictionary with tokens as keys and identifiers as values,
+            or a :class:`Vocabulary`.
 
     Returns:
         An extended token2id dictionary.
     
     Raises:
-        ValueError, if ``token`` has alread an ID in ``token2id``.
+        KeyError, if ``token`` has alread an ID in ``token2id``.
+        ValueError, if ``token2id`` is a frozen :class:`Vocabulary`.
         
     Example:
         >>> token = 'example'
         >>> token2id = {'text': 0}
         >>> len(add_token2id(token, token2id)) == 2
         True
+        >>> add_token2id('another', {'text': 1, 'example': 3})['another']
+        4
+        >>> add_token2id('another', Vocabulary(['text']).freeze())
+        Traceback (most recent call last):
+        ...
+        ValueError: Cannot add another to a frozen vocabulary.
     """
-    if token in token2id.keys():
+    if token in token2id:
         raise KeyError("{} has already an ID in token2id. Access its value with token2id[token].".format(token))
-    token2id[token] = len(token2id) + 1
+    if isinstance(token2id, Vocabulary):
+        if token2id.frozen:
+            raise ValueError("Cannot add {} to a frozen vocabulary.".format(token))
+        token2id.add(token)
+    else:
+        token2id[token] = max(token2id.values(), default=0) + 1
     return token2id
 
 
-def create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=False):
+def create_document_term_matrix(tokenized_corpus, document_labels=None, large_corpus=False, sparse=False,
+                                shard_size=None, processes=None, matrix_market=None, tmpdir=None,
+                                hashing=False, n_features=2 ** 20, reverse_lookup=None,
+                                min_df=None, max_df=None, min_tf=None, keep_n=None,
+                                ngram_range=None, max_ngrams=None):
     """Creates a document-term matrix.
 
     With this function you can create a document-term-matrix where rows \
     correspond to documents in the collection and columns correspond to terms. \
     Use the function :func:`read_from_pathlist()` to read and :func:`tokenize()` \
-    to tokenize your text files.
+    to tokenize your text files. Documents are counted one after another, so \
+    ``tokenized_corpus`` may also be a generator, e.g. :func:`stream_tokenized_corpus()`, \
+    which yields ``(document_label, tokenized_document)`` pairs. A :class:`TokenizedCorpus` \
+    is counted at once, without looking up its tokens again.
+    If the corpus does not fit into memory, even as large corpus model, set \
+    ``shard_size``: Shards of ``shard_size`` documents are counted by worker \
+    processes and written to disk, afterwards their vocabularies are merged \
+    (type IDs are assigned in alphabetical order). Set ``matrix_market`` to \
+    stream the matrix directly into a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ \
+    file instead of creating a pandas DataFrame.
+    For exploratory analyses of very large corpora, set ``hashing`` to True: \
+    Tokens are hashed to one of ``n_features`` type IDs by a :class:`HashingVocabulary` \
+    instead of being collected in a vocabulary (different types may get the \
+    same ID). To still get readable types, e.g. for :func:`find_stopwords()`, \
+    set ``reverse_lookup`` to the number of types remembered per ID.
+    Rare and common types can be pruned while the matrix is created, with \
+    ``min_df``, ``max_df``, ``min_tf`` and ``keep_n``. Pruned types are never \
+    added to the matrix, and ``type_ids`` are contiguous afterwards.
+    With ``ngram_range``, n-grams are counted as types, too (see :func:`tokenize()`). \
+    To keep the memory bounded, set ``max_ngrams``: A first pass over the corpus \
+    picks the ``max_ngrams`` most frequent n-grams (with :func:`top_ngrams()`, \
+    in fixed memory), and only these are counted in the second pass. So, \
+    ``tokenized_corpus`` has to be a list (or another iterable you can iterate \
+    over twice) in this case.
 
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable containing one
-            or more iterables containing tokens.
-        document_labels (list): Name or label of each text file.
+            or more iterables containing tokens. If ``document_labels`` is None,
+            an iterable of ``(document_label, tokenized_document)`` pairs, or
+            a :class:`TokenizedCorpus`.
+        document_labels (list, optional): Name or label of each text file.
+            Defaults to None.
         large_corpus (bool, optional): Set to True, if ``tokenized_corpus`` is
-            very large. Defaults to False.
+            very large. Document labels have to be unique in this case, also
+            with ``shard_size``. Defaults to False.
+        sparse (bool, optional): Only for small corpora. If True, the matrix
+            will be returned as :class:`SparseDocumentTermMatrix` instead of a
+            pandas DataFrame. Defaults to False.
+        shard_size (int, optional): Number of documents per shard. If not None,
+            the corpus is counted out-of-core and a large corpus model is
+            created. Defaults to None.
+        processes (int, optional): Only with ``shard_size``. Number of worker
+            processes. If None, the number of CPUs will be used. If 1, shards
+            will be counted in the calling process. Defaults to None.
+        matrix_market (str, optional): Only with ``shard_size``. Path to a
+            Matrix Market file the matrix will be written to. Defaults to None.
+        tmpdir (str, optional): Only with ``shard_size``. Directory for the
+            temporary shard files. Defaults to None, the default temporary
+            directory of your system.
+        hashing (bool, optional): If True, type IDs are hashes of the tokens.
+            Not available with ``shard_size``. Defaults to False.
+        n_features (int, optional): Only with ``hashing``. Number of type IDs.
+            Defaults to 2 ** 20.
+        reverse_lookup (int, optional): Only with ``hashing``. Number of types
+            remembered per type ID. Defaults to None.
+        min_df (int or float, optional): Minimum document frequency of a type,
+            as number of documents (int) or proportion of all documents (float).
+            Defaults to None.
+        max_df (int or float, optional): Maximum document frequency of a type,
+            as number of documents (int) or proportion of all documents (float).
+            Defaults to None.
+        min_tf (int, optional): Minimum frequency of a type in the corpus.
+            Defaults to None.
+        keep_n (int, optional): Keep only the ``keep_n`` most frequent types
+            left after the other thresholds. Defaults to None.
+        ngram_range (tuple, optional): Smallest and largest ``n`` of n-grams,
+            e.g. ``(1, 2)`` for tokens and bigrams. Defaults to None, i.e. only
+            tokens.
+        max_ngrams (int, optional): Only with ``ngram_range``. Number of n-grams
+            (with ``n`` larger than 1) to count. Defaults to None, i.e. all.
 
     Returns:
-        Document-term matrix as pandas DataFrame.
+        Document-term matrix as pandas DataFrame or :class:`SparseDocumentTermMatrix`.
+            If ``large_corpus`` is True, additionally ``document_ids`` and ``type_ids``.
+            If ``matrix_market`` is set, its path instead of the document-term matrix.
 
     Example:
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> create_document_term_matrix(tokenized_corpus, document_labels) #doctest: +NORMALIZE_WHITESPACE
-                      this   is  document  two  one
-        document_one   1.0  1.0       1.0  0.0  1.0
-        document_two   1.0  1.0       1.0  1.0  0.0
+                      this  is  document  one  two
+        document_one     1   1         1    1    0
+        document_two     1   1         1    0    1
+        >>> isinstance(create_document_term_matrix(tokenized_corpus, document_labels, sparse=True), SparseDocumentTermMatrix)
+        True
         >>> document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, True)
-        >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, dict)
+        >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, Vocabulary)
         True
+        >>> labeled_corpus = zip(document_labels, tokenized_corpus)
+        >>> create_document_term_matrix(labeled_corpus, large_corpus=True)[1]
+        {'document_one': 1, 'document_two': 2}
+        >>> document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, shard_size=1, processes=1)
+        >>> list(type_ids)
+        ['document', 'is', 'one', 'this', 'two']
+        >>> create_document_term_matrix(tokenized_corpus, document_labels, hashing=True, n_features=8, reverse_lookup=1) #doctest: +NORMALIZE_WHITESPACE
+                      this  document  one
+        document_one     2         1    1
+        document_two     2         2    0
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, True, min_df=2, keep_n=2)
+        >>> dict(type_ids)
+        {'this': 1, 'is': 2}
+        >>> create_document_term_matrix(tokenized_corpus, document_labels, ngram_range=(2, 2), max_ngrams=1) #doctest: +NORMALIZE_WHITESPACE
+                      this is
+        document_one        1
+        document_two        1
     """
-    if large_corpus:
-        return _create_large_corpus_model(tokenized_corpus, document_labels)
+    if isinstance(tokenized_corpus, TokenizedCorpus) and document_labels is None:
+        document_labels = tokenized_corpus.document_labels
+    if ngram_range is not None:
+        tokenized_corpus, document_labels = _add_ngrams(tokenized_corpus, document_labels, ngram_range, max_ngrams), None
+    type_ids = HashingVocabulary(n_features, reverse_lookup) if hashing else None
+    pruning = {'min_df': min_df, 'max_df': max_df, 'min_tf': min_tf, 'keep_n': keep_n}
+    if shard_size is not None:
+        if hashing:
+            raise ValueError("Hashing is not available for sharded corpora.")
+        return _create_sharded_corpus_model(tokenized_corpus, document_labels, shard_size, processes, matrix_market, tmpdir, pruning)
+    elif large_corpus:
+        return _create_large_corpus_model(tokenized_corpus, document_labels, type_ids, pruning)
+    elif sparse:
+        return _create_sparse_corpus_model(tokenized_corpus, document_labels, type_ids, pruning)
     else:
-        return _create_small_corpus_model(tokenized_corpus, document_labels)
+        return _create_small_corpus_model(tokenized_corpus, document_labels, type_ids, pruning)
 
 
 def filter_pos_tags(dkpro_document, pos_tags=['ADJ', 'V', 'NN'], lemma=True):
@@ -173,18 +335,27 @@ def filter_pos_tags(dkpro_document, pos_tags=['ADJ', 'V', 'NN'], lemma=True):
         yield tokenized_document['Token']
 
 
-def find_hapax_legomena(document_term_matrix, type_ids=None):
+def find_hapax_legomena(document_term_matrix, type_ids=None, by=None):
     """Creates a list with hapax legommena.
 
-    With this function you can determine *hapax legomena* for each document. \
-    Use the function :func:`create_document_term_matrix()` to create a \
-    document-term matrix.
+    With this function you can determine *hapax legomena* for each document, \
+    i.e. types occurring at most once in every document. For large corpora, \
+    types occurring only once in the whole corpus. Set ``by`` to ``term_frequency`` \
+    to get the latter for all variants of ``document_term_matrix``. Use the function \
+    :func:`create_document_term_matrix()` to create a document-term matrix. \
+    If you need stopwords, too, pass a :class:`CorpusStatistics` instead, to \
+    count the frequencies only once.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
+        document_term_matrix (pandas.DataFrame): A document-term matrix, either
+            as pandas DataFrame or :class:`SparseDocumentTermMatrix`, or
+            :class:`CorpusStatistics`.
         type_ids (dict): A dictionary with types as key and identifiers as values.
             If ``document_term_matrix`` is designed for large corpora, you have
             to commit ``type_ids``, too.
+        by (str, optional): Either ``max_frequency`` (at most once in every
+            document) or ``term_frequency`` (once in the corpus). Defaults to
+            None, ``term_frequency`` for large corpora, otherwise ``max_frequency``.
 
     Returns:
         Hapax legomena in a list.
@@ -195,17 +366,18 @@ def find_hapax_legomena(document_term_matrix, type_ids=None):
         >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
         >>> find_hapax_legomena(document_term_matrix)
         ['hapax']
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+        >>> find_hapax_legomena(document_term_matrix)
+        ['hapax']
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> find_hapax_legomena(document_term_matrix, type_ids)
         ['hapax']
+        >>> document_term_matrix = create_document_term_matrix([['hapax', 'word'], ['word']], ['one', 'two'])
+        >>> find_hapax_legomena(document_term_matrix), find_hapax_legomena(document_term_matrix, by='term_frequency')
+        (['word', 'hapax'], ['hapax'])
     """
     log.info("Determining hapax legomena ...")
-    if isinstance(document_term_matrix.index, pd.MultiIndex):
-        log.debug("Large corpus model ...")
-        return _hapax_legomena_large_corpus_model(document_term_matrix, type_ids)
-    else:
-        log.debug("Small corpus model ...")
-        return document_term_matrix.loc[:, document_term_matrix.max() == 1].columns.tolist()
+    return _corpus_statistics(document_term_matrix, type_ids).hapax_legomena(by)
 
 
 def find_stopwords(document_term_matrix, most_frequent_tokens=100, type_ids=None):
@@ -215,10 +387,13 @@ def find_stopwords(document_term_matrix, most_frequent_tokens=100, type_ids=None
     *stopwords*. First, you have to translate your corpus into a document-term \
     matrix.
     Use the function :func:`create_document_term_matrix()` to create a \
-    document-term matrix.
+    document-term matrix. If you need hapax legomena, too, pass a \
+    :class:`CorpusStatistics` instead, to count the frequencies only once.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
+        document_term_matrix (pandas.DataFrame): A document-term matrix, either
+            as pandas DataFrame or :class:`SparseDocumentTermMatrix`, or
+            :class:`CorpusStatistics`.
         most_frequent_tokens (int, optional): Treshold for most frequent tokens.
         type_ids (dict): If ``document_term_matrix`` is designed for large corpora,
             you have to commit ``type_ids``, too.
@@ -232,32 +407,38 @@ def find_stopwords(document_term_matrix, most_frequent_tokens=100, type_ids=None
         >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
         >>> find_stopwords(document_term_matrix, 1)
         ['stopword']
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+        >>> find_stopwords(document_term_matrix, 1)
+        ['stopword']
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> find_stopwords(document_term_matrix, 1, type_ids)
         ['stopword']
+        >>> statistics = CorpusStatistics(document_term_matrix, type_ids)
+        >>> find_stopwords(statistics, 1), find_hapax_legomena(statistics)
+        (['stopword'], ['hapax'])
     """
     log.info("Determining stopwords ...")
-    if isinstance(document_term_matrix.index, pd.MultiIndex):
-        log.debug("Large corpus model ...")
-        return _stopwords_large_corpus_model(document_term_matrix, type_ids, most_frequent_tokens)
-    else:
-        log.debug("Small corpus model ...")
-        return document_term_matrix.iloc[:, :most_frequent_tokens].columns.tolist()
+    return _corpus_statistics(document_term_matrix, type_ids).stopwords(most_frequent_tokens)
 
 
-def read_document_term_matrix(filepath):
+def read_document_term_matrix(filepath, mmap_mode='r'):
     """Reads a document-term matrix from CSV file.
 
     With this function you can read a CSV file containing a document-term \
-    matrix.
+    matrix. If ``filepath`` is a directory written by :func:`postprocessing.save_document_term_matrix()` \
+    with ``binary=True``, the NumPy arrays of the matrix will be memory-mapped \
+    instead of parsed, which is much faster for large matrices.
     Use the function :func:`create_document_term_matrix()` to create a document-term \
     matrix.
 
     Args:
-        filepath (str): Path to CSV file.
+        filepath (str): Path to CSV file, or to binary document-term matrix directory.
+        mmap_mode (str, optional): Only for binary files. Memory-map the arrays,
+            see :func:`numpy.load()`. If None, they are read into memory.
+            Defaults to ``r``.
 
     Returns:
-        A document-term matrix as pandas DataFrame.
+        A document-term matrix as pandas DataFrame, or :class:`SparseDocumentTermMatrix`.
     
     Example:
         >>> import tempfile
@@ -277,6 +458,8 @@ def read_document_term_matrix(filepath):
         document_id type_id   
         1           1        1
     """
+    if os.path.isdir(filepath):
+        return _read_binary_document_term_matrix(filepath, mmap_mode)
     document_term_matrix = pd.read_csv(filepath)
     if 'document_id' and 'type_id' in document_term_matrix:
         return document_term_matrix.set_index(['document_id', 'type_id'])
@@ -286,7 +469,8 @@ def read_document_term_matrix(filepath):
         return document_term_matrix
 
 
-def read_from_pathlist(pathlist, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None):
+def read_from_pathlist(pathlist, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None,
+                       workers=None, prefetch=None, streaming=False, errors='raise'):
     """Reads text files based on a pathlist.
 
     With this function you can read multiple file formats:
@@ -298,6 +482,21 @@ def read_from_pathlist(pathlist, file_format=None, xpath_expression='//tei:text'
     CSV files, you have the ability to select specific columns via ``columns``. \
     If there are multiple file formats in ``pathlist``, do not specify ``file_format`` \
     and file extensions will be considered.
+    If ``workers`` is set, files are read and parsed by a pool of threads, \
+    which is faster if reading is slow (e.g. on network file systems) or \
+    parsing releases the GIL (e.g. lxml). Documents are still yielded in the \
+    order of ``pathlist``, at most ``prefetch`` files are read ahead.
+    A file that cannot be read (it is missing, not UTF-8 encoded or not \
+    well-formed XML) raises an error, with or without ``workers``. If you \
+    set ``errors`` to ``skip``, it is logged and skipped instead, but keep \
+    in mind that the documents are not aligned with ``pathlist`` anymore.
+    XML files can be huge, e.g. whole volumes of a newspaper. If ``streaming`` \
+    is True, an XML ``document`` is a generator of the texts of the matching \
+    elements, which are parsed incrementally, see :func:`_iterparse_xml()`, \
+    with ``workers`` by the thread that read the file. Only simple XPath expressions \
+    like ``//tei:div`` are supported then. If the file turns out to be malformed \
+    after its first part, the error is raised while consuming the generator, \
+    or, with ``errors='skip'``, the generator ends early.
 
     Args:
         pathlist (list): One or more paths to text files.
@@ -309,12 +508,21 @@ def read_from_pathlist(pathlist, file_format=None, xpath_expression='//tei:text'
         sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
         columns (list, optional): Column name or names for CSV files. If None, the
             whole file will be processed. Defaults to None.
+        workers (int, optional): Number of threads. If None, files are read
+            one after another by the calling thread. Defaults to None.
+        prefetch (int, optional): Only with ``workers``. Maximum number of files
+            read ahead. Defaults to None, twice the number of ``workers``.
+        streaming (bool, optional): If True, XML files are parsed incrementally.
+            Defaults to False.
+        errors (str, optional): Either ``raise`` or ``skip``, the handling of
+            files that cannot be read. Defaults to ``raise``.
 
     Yields:
         A ``document`` as str or, in case of a CSV file, a ``dkpro_document`` as a pandas DataFrame.
+            In case of an XML file, also a list or generator of parts of the ``document``.
 
     Raises:
-        ValueError, if ``file_format`` is not supported.
+        ValueError, if ``file_format`` or ``errors`` is not supported.
 
     Example:
         >>> import tempfile
@@ -331,54 +539,51 @@ def read_from_pathlist(pathlist, file_format=None, xpath_expression='//tei:text'
         True
         True
         ['This is the first example.', 'This is the second example.']
+        >>> list(read_from_pathlist(['missing.txt'], workers=2, errors='skip'))
+        []
     """
-    log.info("Reading {} files ...".format(len(pathlist)))
-    for n, file in enumerate(pathlist):
-        log.debug("File #{}".format(n))
-        _, extension = os.path.splitext(file)
-        if file_format == 'text' or extension == '.txt':
-            yield _read_txt(file)
-        elif file_format == 'xml' or extension == '.xml':
-            yield _read_xml(file, xpath_expression)
-        elif file_format == 'csv' or extension == '.csv':
-            yield _read_csv(file, sep, csv_columns)
-        else:
-            if file_format is None:
-                log.error("Skipping {}, because the file format {} is not supported.".format(file, extension))
-                pass
-            else:
-                raise ValueError("Unable to read {}, because the file format {} is not supported.".format(file, file_format))
+    files = _read_files(pathlist, file_format, xpath_expression, sep, csv_columns, workers, prefetch, streaming, errors)
+    for _, _, document in files:
+        yield document
 
 
 def read_matrix_market_file(filepath):
     """Reads a Matrix Market file for Gensim.
 
     With this function you can read a Matrix Market file to process it with \
-    `Gensim <https://radimrehurek.com/gensim/>`_.
+    `Gensim <https://radimrehurek.com/gensim/>`_. The file may be compressed \
+    (``.mm.gz`` or ``.mm.bz2``), and is streamed by a :class:`MatrixMarketCorpus`, \
+    which can be used like :class:`gensim.corpora.MmCorpus`.
 
     Args:
         filepath (str): Path to Matrix Market file.
 
     Returns:
-        Matrix Market model for Gensim.
+        Matrix Market corpus for Gensim.
     """
-    if os.path.splitext(filepath)[1] != '.mm':
+    if not filepath.endswith(('.mm', '.mm.gz', '.mm.bz2')):
         raise ValueError("The file {} is not a Matrix Market file.".format(filepath))
-    return MmCorpus(filepath)
+    return MatrixMarketCorpus(filepath)
 
 
-def read_model(filepath):
+def read_model(filepath, mmap_mode='r'):
     """Reads a LDA model.
 
     With this function you can read a LDA model, if it was saved using :module:`pickle`.
     If you want to read MALLET models, you have to specify a parameter of the
-    function :func:`create_mallet_model()`.
+    function :func:`create_mallet_model()`. If ``filepath`` is a directory written \
+    by :func:`postprocessing.save_model()` with ``bundle=True``, the NumPy arrays \
+    of the model will be memory-mapped instead of unpickled.
 
     Args:
-        filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``.
+        filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``,
+            or to a model bundle directory.
+        mmap_mode (str, optional): Only for model bundles. Memory-map the arrays,
+            see :func:`numpy.load()`. If None, they are read into memory.
+            Defaults to ``r``.
 
     Returns:
-        A LDA model.
+        A LDA model, or a :class:`ModelBundle`.
 
     Example:
         >>> import lda
@@ -397,6 +602,9 @@ def read_model(filepath):
         ...     read_model(tmpfile.name) == a
         True
     """
+    if os.path.isdir(filepath):
+        log.info("Reading model bundle {} ...".format(filepath))
+        return ModelBundle(filepath, mmap_mode)
     with open(filepath, 'rb') as model:
         return pickle.load(model)
 
@@ -404,13 +612,15 @@ def read_model(filepath):
 def read_token2id(filepath):
     """Reads a token2id dictionary from CSV file.
 
-    With this function you can read a CSV-file containing a document or type dictionary.
+    With this function you can read a CSV-file containing a document or type dictionary. \
+    If ``filepath`` has the extension ``.npz``, a :class:`Vocabulary` written by \
+    :meth:`Vocabulary.save()` will be read.
 
     Args:
-        filepath (str): Path to CSV file.
+        filepath (str): Path to CSV or ``.npz`` file.
 
     Returns:
-        A dictionary.
+        A dictionary or :class:`Vocabulary`.
     
     Example:
         >>> import tempfile
@@ -420,29 +630,48 @@ def read_token2id(filepath):
         ...     read_token2id(tmpfile.name)
         True
         {0: 'this', 1: 'is', 2: 'an', 3: 'example'}
+        >>> with tempfile.NamedTemporaryFile(suffix='.npz') as tmpfile:
+        ...     Vocabulary(['this', 'is', 'an', 'example']).save(tmpfile.name)
+        ...     read_token2id(tmpfile.name)['example']
+        4
     """
+    if os.path.splitext(filepath)[1] == '.npz':
+        return Vocabulary.load(filepath)
     dictionary = pd.read_csv(filepath, header=None)
     dictionary.index = dictionary[0]
     dictionary = dictionary[1]
     return dictionary.to_dict()
     
     
-def remove_features(features, document_term_matrix=None, tokenized_corpus=None, type_ids=None):
+def remove_features(features, document_term_matrix=None, tokenized_corpus=None, type_ids=None, materialize=True):
     """Removes features based on a list of tokens.
 
     With this function you can clean your corpus (either a document-term matrix \
     or a ``tokenized_corpus``) from *stopwords* and *hapax legomena*.
     Use the function :func:`create_document_term_matrix()` or :func:`tokenize` to \
     create a document-term matrix or to tokenize your corpus, respectively.
+    The ``features`` are collected in a set once, and each ``tokenized_document`` \
+    is filtered by lookups in this set. If ``materialize`` is False, the \
+    documents are filtered lazily, one after another, so ``tokenized_corpus`` \
+    can be a generator, e.g. :func:`tokenize_corpus()`. From a :class:`TokenizedCorpus`, \
+    the identifiers of ``features`` are removed at once.
 
     Args:
         features (list): A list of tokens.
-        document_term_matrix (pandas.DataFrame, optional): A document-term matrix.
-        tokenized_corpus (list, optional): An iterable of one or more ``tokenized_document``.
-        type_ids (dict, optional): A dictionary with types as key and identifiers as values.
+        document_term_matrix (pandas.DataFrame, optional): A document-term matrix,
+            either as pandas DataFrame or :class:`SparseDocumentTermMatrix`.
+        tokenized_corpus (list, optional): An iterable of one or more ``tokenized_document``,
+            or a :class:`TokenizedCorpus`.
+        type_ids (dict, optional): A dictionary with types as key and identifiers as values,
+            or a :class:`Vocabulary`. The types will not be removed from ``type_ids``,
+            use :meth:`Vocabulary.prune()` to do so.
+        materialize (bool, optional): Only for ``tokenized_corpus``. If False,
+            a generator will be returned. Defaults to True.
 
     Returns:
-        A clean document-term matrix as pandas DataFrame or ``tokenized_corpus`` as list.
+        A clean document-term matrix as pandas DataFrame (or :class:`SparseDocumentTermMatrix`,
+            respectively) or ``tokenized_corpus`` as list of lists (or generator,
+            or :class:`TokenizedCorpus`).
 
     Example:
         >>> document_labels = ['document']
@@ -450,41 +679,58 @@ def remove_features(features, document_term_matrix=None, tokenized_corpus=None,
         >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
         >>> features = ['this']
         >>> remove_features(features, document_term_matrix) #doctest: +NORMALIZE_WHITESPACE
-                   is  document    a
-        document  1.0       1.0  1.0
+                  is  a  document
+        document   1  1         1
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+        >>> remove_features(features, document_term_matrix).columns.tolist()
+        ['is', 'a', 'document']
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> len(remove_features(features, document_term_matrix, type_ids=type_ids))
         3
-        >>> list(remove_features(features, tokenized_corpus=tokenized_corpus))
+        >>> remove_features(features, tokenized_corpus=tokenized_corpus)
         [['is', 'a', 'document']]
+        >>> clean_tokenized_corpus = remove_features(features, tokenized_corpus=iter(tokenized_corpus), materialize=False)
+        >>> next(clean_tokenized_corpus)
+        ['is', 'a', 'document']
     """
     log.info("Removing features ...")
     if document_term_matrix is not None and tokenized_corpus is None:
-        if isinstance(document_term_matrix.index, pd.MultiIndex):
+        if isinstance(document_term_matrix, SparseDocumentTermMatrix):
+            return _remove_features_from_small_corpus_model(document_term_matrix, features)
+        elif isinstance(document_term_matrix.index, pd.MultiIndex):
             return _remove_features_from_large_corpus_model(document_term_matrix, type_ids, features)
         else:
             return _remove_features_from_small_corpus_model(document_term_matrix, features)
+    elif document_term_matrix is None and isinstance(tokenized_corpus, TokenizedCorpus):
+        return tokenized_corpus.remove(features)
     elif document_term_matrix is None and tokenized_corpus is not None:
-        clean_tokenized_corpus = pd.Series() # schöner machen
-        for n, tokenized_document in enumerate(tokenized_corpus):
-            clean_tokenized_corpus[str(n)] = _remove_features_from_tokenized_document(tokenized_document, features)
+        features = frozenset(features)
+        clean_tokenized_corpus = (_remove_features_from_tokenized_document(tokenized_document, features)
+                                  for tokenized_document in tokenized_corpus)
+        if materialize:
+            return list(clean_tokenized_corpus)
         return clean_tokenized_corpus
     else:
         raise ValueError("Commit either document-term matrix or tokenized_corpus.")
 
 
 def segment(document, segment_size=1000, tolerance=0, chunker=None,
-            tokenizer=None, flatten_chunks=True, materialize=True):
+            tokenizer=None, flatten_chunks=True, materialize=True, document_label=None):
     """Segments a document into segments of about ``segment_size`` tokens, respecting existing chunks.
 
     Consider you have a document. You wish to split the document into \
     segments of about 1000 tokens, but you prefer to keep paragraphs together \
     if this does not increase or decrease the token size by more than 5%.
-    This is a convenience wrapper around :func:`segment_fuzzy()`.
+    This is a convenience wrapper around :func:`segment_spans()` (or, if \
+    ``flatten_chunks`` is False or a function, :func:`segment_fuzzy()`): The \
+    boundaries of the segments are computed from the lengths of the chunks, \
+    and each segment is sliced from the tokens once. If ``document`` is a \
+    :class:`TokenizedCorpus`, each of its documents is segmented by \
+    :meth:`TokenizedCorpus.segment()`.
 
     Args:
         document (list): The document to process. This is an iterable of
-            chunks, each of which is an iterable of tokens.
+            chunks, each of which is an iterable of tokens, or a :class:`TokenizedCorpus`.
         segment_size (int): The target size of each segment, in tokens. Defaults
             to 1000.
         tolerance (float, optional): How much may the actual segment size differ from
@@ -502,6 +748,9 @@ def segment(document, segment_size=1000, tolerance=0, chunker=None,
             tokens. This can also be a one-argument function in order to
             customize the un-chunking. Defaults to True.
         materialize (bool, optional): If True, materializes the segments. Defaults to True.
+        document_label (str, optional): If not None, ``(segment_label, segment)``
+            pairs are returned, with segment labels like ``document_label_0001``.
+            Defaults to None.
 
     Example:
         >>> segment([['This', 'is', 'the', 'first', 'chunk'],
@@ -511,19 +760,24 @@ def segment(document, segment_size=1000, tolerance=0, chunker=None,
         ['chunk', 'this'],
         ['is', 'the'],
         ['second', 'chunk']]
+        >>> segment([['This', 'is', 'the', 'first', 'chunk']], 3, document_label='document')
+        [('document_0001', ['This', 'is', 'the']), ('document_0002', ['first', 'chunk'])]
     """
+    if isinstance(document, TokenizedCorpus):
+        return document.segment(segment_size, tolerance)
     if chunker is not None:
         document = chunker(document)
     if tokenizer is not None:
         document = map(tokenizer, document)
 
-    segments = segment_fuzzy(document, segment_size, tolerance)
-
-    if flatten_chunks:
-        if not callable(flatten_chunks):
-            def flatten_chunks(segment):
-                return list(chain.from_iterable(segment))
-        segments = map(flatten_chunks, segments)
+    if flatten_chunks and not callable(flatten_chunks):
+        segments = _flat_segments(document, segment_size, tolerance)
+    else:
+        segments = segment_fuzzy(document, segment_size, tolerance)
+        if flatten_chunks:
+            segments = map(flatten_chunks, segments)
+    if document_label is not None:
+        segments = zip(map(partial(_segment_label, document_label), count(1)), segments)
     if materialize:
         segments = list(segments)
     return segments
@@ -595,6 +849,76 @@ def segment_fuzzy(document, segment_size=5000, tolerance=0.05):
         yield current_segment
 
 
+def segment_spans(chunk_lengths, segment_size=5000, tolerance=0.05):
+    """Computes segments of a document from the lengths of its chunks.
+
+    This is the engine of :func:`segment()` and :func:`TokenizedCorpus.segment()`, \
+    following the rules of :func:`segment_fuzzy()`: A chunk (like a paragraph) \
+    is kept in one segment if the segment does not differ from ``segment_size`` \
+    by more than ``tolerance`` tokens, otherwise the chunk is split. Instead \
+    of the tokens, only the lengths of the chunks are needed, and instead of \
+    segments, their spans (start and end of each segment in the tokens of the \
+    whole document) are yielded. So, the segments can be sliced from a list \
+    or viewed in a NumPy array without copying any token.
+    Unlike :func:`segment_fuzzy()`, a chunk which would be moved to the next \
+    segment although it is the only chunk of the current one is kept in the \
+    current segment (:func:`segment_fuzzy()` would not terminate).
+
+    Args:
+        chunk_lengths (list): Iterable of the number of tokens of each chunk.
+        segment_size (int, optional): The target length of each segment in tokens.
+            Defaults to 5000.
+        tolerance (float, optional): How much may the actual segment size differ from
+            the ``segment_size``? If ``0 < tolerance < 1``, this is interpreted as a
+            fraction of the ``segment_size``, otherwise it is interpreted as an
+            absolute number. If ``tolerance < 0``, chunks are never split apart.
+            Defaults to 0.05.
+
+    Yields:
+        ``(start, end)`` pairs, the span of each segment.
+
+    Example:
+        >>> list(segment_spans([5, 5], 2))
+        [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)]
+        >>> list(segment_spans([5, 5, 5, 5], 8, 2))
+        [(0, 10), (10, 20)]
+    """
+    if tolerance > 0 and tolerance < 1:
+        tolerance = round(segment_size * tolerance)
+
+    start = end = size = carry = 0
+    is_open = False
+    chunk_lengths = iter(chunk_lengths)
+    while True:
+        if carry:
+            length, carry = carry, 0
+        else:
+            length = next(chunk_lengths, None)
+            if length is None:
+                break
+        is_open = True
+        end += length
+        size += length
+
+        if size >= segment_size:
+            too_long = size - segment_size
+            too_short = segment_size - (size - length)
+
+            if tolerance >= 0 and min(too_long, too_short) > tolerance:
+                end -= too_long
+                carry = too_long
+            elif too_long >= too_short and size > length:
+                end -= length
+                carry = length
+            yield start, end
+            start = end
+            size = 0
+            is_open = False
+
+    if is_open:
+        yield start, end
+
+
 def split_paragraphs(document, sep=regex.compile(r'\n')):
     """Splits the given document by paragraphs.
 
@@ -632,7 +956,229 @@ def split_paragraphs(document, sep=regex.compile(r'\n')):
         return [paragraphs for _, paragraphs in grouped_document]
 
 
-def tokenize(document, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True):
+def stream_dkpro_corpus(pathlist, document_labels=None, pos_tags=['ADJ', 'V', 'NN'], lemma=True, sep='\t',
+                        chunksize=100000, workers=None, prefetch=None, errors='raise'):
+    """Reads and filters DARIAH-DKPro-Wrapper output files one after another.
+
+    With this function you can read `DARIAH-DKPro-Wrapper <https://github.com/DARIAH-DE/DARIAH-DKPro-Wrapper>`_ \
+    output like :func:`read_from_pathlist()` and :func:`filter_pos_tags()` \
+    would do, but with much less memory: Only the columns ``CPOS`` and \
+    ``Lemma`` (or ``Token``) are read, as categorical columns, in chunks of \
+    ``chunksize`` rows, and tokens not tagged with one of ``pos_tags`` are \
+    dropped while reading. Each file becomes a ``tokenized_document`` as \
+    list, ready for :func:`create_document_term_matrix()`. If ``workers`` is \
+    set, files are read by a pool of threads like in :func:`read_from_pathlist()`. \
+    Files that cannot be read are handled according to ``errors``, as in \
+    :func:`read_from_pathlist()`, with or without ``workers``.
+
+    Args:
+        pathlist (list): One or more paths to CSV files.
+        document_labels (list, optional): Name or label of each file. If None,
+            the file names without extensions will be used. Defaults to None.
+        pos_tags (list, optional): List of desired POS-tags. Defaults
+            to ``['ADJ', 'V', 'NN']``.
+        lemma (bool, optional): If True, lemmas will be selected, otherwise tokens.
+            Defaults to True.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
+        chunksize (int, optional): Number of rows read at once. Defaults to 100000.
+        workers (int, optional): Number of threads. If None, files are read
+            one after another by the calling thread. Defaults to None.
+        prefetch (int, optional): Only with ``workers``. Maximum number of files
+            read ahead. Defaults to None, twice the number of ``workers``.
+        errors (str, optional): Either ``raise`` or ``skip``, the handling of
+            files that cannot be read. Defaults to ``raise``.
+
+    Yields:
+        ``(document_label, tokenized_document)`` pairs.
+
+    Raises:
+        ValueError, if ``errors`` is not supported, or a file lacks the
+            selected columns.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.csv') as tmpfile:
+        ...     tmpfile.write(b"Token\\tLemma\\tCPOS\\nThis\\tthis\\tART\\nwas\\tbe\\tV\\na\\ta\\tART\\ndocument\\tdocument\\tNN") and True
+        ...     tmpfile.flush()
+        ...     list(stream_dkpro_corpus([tmpfile.name], ['document'], chunksize=2))
+        True
+        [('document', ['be', 'document'])]
+    """
+    _check_errors(errors)
+    read_dkpro = partial(_read_dkpro, pos_tags=pos_tags, lemma=lemma, sep=sep, chunksize=chunksize)
+    pathlist = list(pathlist)
+    if document_labels is None:
+        document_labels = [os.path.splitext(os.path.basename(str(path)))[0] for path in pathlist]
+    log.info("Reading {} lemmas or tokens of {} files ...".format(pos_tags, len(pathlist)))
+    if workers is None:
+        for document_label, file in zip(document_labels, pathlist):
+            try:
+                tokenized_document = read_dkpro(file)
+            except _UNREADABLE as error:
+                _skip_unreadable(file, error, errors)
+                continue
+            yield document_label, tokenized_document
+        return
+
+    for document_label, (file, future) in zip(document_labels, _prefetch(read_dkpro, pathlist, workers, prefetch)):
+        try:
+            tokenized_document = future.result()
+        except _UNREADABLE as error:
+            _skip_unreadable(file, error, errors)
+            continue
+        yield document_label, tokenized_document
+
+
+def stream_paragraphs(document, sep=regex.compile(r'\n'), blocksize=2 ** 20, encoding='utf-8'):
+    """Splits a document by paragraphs, one paragraph after another.
+
+    With this function you can split a document like :func:`split_paragraphs()`, \
+    but the paragraphs are yielded lazily, and the document may also be an \
+    open file (in text or binary mode) or a :class:`mmap.mmap`: It is read in \
+    blocks of ``blocksize`` characters (or bytes, which are decoded \
+    incrementally), and only the text after the last separator is carried \
+    over to the next block. So, even files larger than memory can be passed \
+    to :func:`segment()` with ``chunker=stream_paragraphs``. The last \
+    separator of a block is only used once the next block has been read, in \
+    case it continues there, e.g. ``\\n\\s*\\n`` split between two blocks. \
+    The search resumes at this separator, or where a separator cut off by the \
+    end of the block begins (a partial match), so the text is searched only \
+    once, also if a paragraph spans many blocks.
+    In case of a ``dkpro_document``, runs of rows with the same ``ParagraphId`` \
+    are yielded, without grouping the whole DataFrame.
+
+    Args:
+        document Union(str, file, mmap.mmap, pandas.DataFrame): Document text, an
+            open file containing it, or DARIAH-DKPro-Wrapper output.
+        sep (regex.Regex, optional): Separator indicating a paragraph. Patterns
+            of :mod:`re` are compiled with :mod:`regex`.
+        blocksize (int, optional): Number of characters or bytes read at once.
+            Defaults to 2 ** 20.
+        encoding (str, optional): Encoding of files opened in binary mode and of
+            :class:`mmap.mmap` objects. Defaults to ``utf-8``.
+
+    Yields:
+        Paragraphs, except those containing only whitespaces.
+
+    Example:
+        >>> import io
+        >>> document = "First paragraph\\nsecond paragraph.\\n\\nLast paragraph."
+        >>> list(stream_paragraphs(document)) == split_paragraphs(document)
+        True
+        >>> list(stream_paragraphs(io.BytesIO(document.encode('utf-8')), blocksize=8))
+        ['First paragraph', 'second paragraph.', 'Last paragraph.']
+        >>> segment(io.StringIO(document), 4, chunker=stream_paragraphs, tokenizer=tokenize)
+        [['first', 'paragraph', 'second', 'paragraph'], ['last', 'paragraph']]
+    """
+    if isinstance(document, pd.DataFrame):
+        paragraph_ids = document['ParagraphId'].to_numpy()
+        boundaries = np.flatnonzero(paragraph_ids[1:] != paragraph_ids[:-1]) + 1
+        starts = [0] + boundaries.tolist()
+        ends = boundaries.tolist() + [len(paragraph_ids)]
+        for start, end in zip(starts, ends):
+            if start < end:
+                yield document.iloc[start:end].set_index('ParagraphId')
+        return
+    if not hasattr(sep, 'match'):
+        sep = regex.compile(sep)
+    elif not isinstance(sep, type(regex.compile(''))):
+        sep = regex.compile(sep.pattern, sep.flags)
+    if isinstance(document, str):
+        blocks = [document]
+    else:
+        blocks = iter(partial(document.read, blocksize), document.read(0))
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    position = 0
+    for block in chain(blocks, [None]):
+        if block is None:
+            buffer += decoder.decode(b'', final=True)
+        elif isinstance(block, str):
+            buffer += block
+        else:
+            buffer += decoder.decode(block)
+        start = 0
+        last_match = partial_match = None
+        for match in sep.finditer(buffer, position, partial=block is not None):
+            if match.partial:
+                partial_match = match
+                break
+            if last_match is not None:
+                if buffer[start:last_match.start()].strip():
+                    yield buffer[start:last_match.start()]
+                start = last_match.end()
+            last_match = match
+        if block is None and last_match is not None:
+            if buffer[start:last_match.start()].strip():
+                yield buffer[start:last_match.start()]
+            start = last_match.end()
+        elif last_match is not None:
+            position = last_match.start()
+        elif partial_match is not None:
+            position = partial_match.start()
+        else:
+            position = len(buffer)
+        last_match = partial_match = match = None
+        buffer = buffer[start:]
+        position -= start
+    if buffer.strip():
+        yield buffer
+
+
+def stream_tokenized_corpus(pathlist, document_labels=None, file_format=None, pattern=r'\p{L}+\p{P}?\p{L}+',
+                            lower=True, segment_size=None, tolerance=0.05, chunker=None, **kwargs):
+    """Reads, tokenizes and segments text files one after another.
+
+    With this function you can chain :func:`read_from_pathlist()`, :func:`tokenize()` \
+    and optionally :func:`segment()` as generators. Only one ``document`` is read \
+    at a time, and its tokens are yielded lazily (or, if it is segmented, one \
+    segment after another). Pass the result to :func:`create_document_term_matrix()` \
+    to count the tokens in the same pass, so the memory needed depends on the \
+    size of the vocabulary and the document-term matrix, not on the size of \
+    the corpus.
+
+    Args:
+        pathlist (list): One or more paths to text or XML files.
+        document_labels (list, optional): Name or label of each file. If None,
+            the file names without extensions will be used. Defaults to None.
+        file_format (str, optional): Format of the files, see :func:`read_from_pathlist()`.
+            Defaults to None.
+        pattern (str, optional): Regular expression to match tokens.
+        lower (boolean, optional): If True, lowers all characters. Defaults to True.
+        segment_size (int, optional): If not None, each document will be segmented
+            into segments of about ``segment_size`` tokens, labeled with the
+            document label and a four-digit number. Defaults to None.
+        tolerance (float, optional): Tolerance for the segment size, see :func:`segment()`.
+            Defaults to 0.05.
+        chunker (callable, optional): A one-argument function that cuts a document
+            into chunks before segmenting, e.g. :func:`split_paragraphs()`.
+            Defaults to None.
+        **kwargs: Additional arguments for :func:`read_from_pathlist()`, e.g.
+            ``xpath_expression``, ``workers``, ``streaming`` or ``errors``. With
+            ``streaming``, the parts of an XML file are tokenized one after
+            another and treated as chunks when segmenting. With ``errors='skip'``,
+            files that cannot be read are skipped, and the labels of the other
+            files stay with them.
+
+    Yields:
+        ``(document_label, tokenized_document)`` pairs.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as tmpfile:
+        ...     tmpfile.write(b"This is the first and last example.") and True
+        ...     tmpfile.flush()
+        ...     labeled_corpus = stream_tokenized_corpus([tmpfile.name], ['document'], segment_size=3, tolerance=0)
+        ...     [(document_label, list(tokenized_document)) for document_label, tokenized_document in labeled_corpus]
+        True
+        [('document_0001', ['this', 'is', 'the']), ('document_0002', ['first', 'and', 'last']), ('document_0003', ['example'])]
+    """
+    for _, labeled_segments in _tokenize_files(pathlist, document_labels, file_format, pattern, lower, segment_size,
+                                               tolerance, chunker, **kwargs):
+        yield from labeled_segments
+
+
+def tokenize(document, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True, ngram_range=None):
     """Tokenizes with Unicode regular expressions.
 
     With this function you can tokenize a ``document`` with a regular expression. \
@@ -642,11 +1188,17 @@ def tokenize(document, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True):
     letters. So, one letter words will not match. In case you want to lower \
     all tokens, set the argument ``lower`` to True (it is by default).    
     Use the functions :func:`read_from_pathlist()` to read your text files.
+    If ``ngram_range`` is set, e.g. to ``(1, 2)``, `n-grams <https://en.wikipedia.org/wiki/N-gram>`_ \
+    are yielded, too: first all unigrams, then all bigrams, etc., the tokens \
+    of an n-gram separated by a space.
 
     Args:
         document (str): Document text.
-        pattern (str, optional): Regular expression to match tokens.
+        pattern (str, optional): Regular expression to match tokens. This can
+            also be a compiled :class:`regex.Regex`.
         lower (boolean, optional): If True, lowers all characters. Defaults to True.
+        ngram_range (tuple, optional): Smallest and largest ``n`` of n-grams.
+            Defaults to None, i.e. only tokens.
 
     Yields:
         All matching tokens in the ``document``.
@@ -654,113 +1206,1893 @@ def tokenize(document, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True):
     Example:
         >>> list(tokenize("This is 1 example text."))
         ['this', 'is', 'example', 'text']
+        >>> list(tokenize("This is 1 example text.", ngram_range=(2, 3)))
+        ['this is', 'is example', 'example text', 'this is example', 'is example text']
     """
     log.debug("Tokenizing document ...")
     if lower:
         log.debug("Lowering all characters ...")
         document = document.lower()
-    compiled_pattern = regex.compile(pattern)
-    tokenized_document = compiled_pattern.finditer(document)
+    if not hasattr(pattern, 'finditer'):
+        pattern = regex.compile(pattern)
+    tokenized_document = pattern.finditer(document)
+    if ngram_range is not None:
+        yield from _ngrams([match.group() for match in tokenized_document], ngram_range)
+        return
     for match in tokenized_document:
         yield match.group()
 
 
-def _create_bag_of_words(document_labels, tokenized_corpus):
-    """Creates a bag-of-words model.
+def tokenize_corpus(corpus, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True, processes=None, chunksize=64):
+    """Tokenizes a corpus in parallel.
 
-    This private function is wrapped in :func:`_create_large_corpus_model()`. The \
-    first level consists of the document label as key, and the dictionary \
-    of counts as value. The second level consists of type ID as key, and the \
-    count of types in document pairs as value.
+    With this function you can tokenize all documents of a ``corpus`` using \
+    multiple processes, each of them tokenizing a chunk of ``chunksize`` documents \
+    at once with :func:`tokenize()`. The regular expression is compiled only \
+    once per process. Tokenized documents are yielded in the same order as \
+    ``corpus``, as soon as they are available. Documents are read from ``corpus`` \
+    only when needed, at most two chunks per process are tokenized or waiting \
+    at the same time, so ``corpus`` can be a generator, e.g. :func:`read_from_pathlist()`.
 
     Args:
-        document_labels (list): Iterable of document labels.
-        tokenized_corpus (list): Tokenized corpus as an iterable
-            containing one or more iterables containing tokens.
+        corpus (list): Iterable of ``document`` (str).
+        pattern (str, optional): Regular expression to match tokens.
+        lower (boolean, optional): If True, lowers all characters. Defaults to True.
+        processes (int, optional): Number of worker processes. If None, the
+            number of CPUs will be used. If 1, documents will be tokenized in
+            the calling process. Defaults to None.
+        chunksize (int, optional): Number of documents per chunk. Defaults to 64.
+
+    Yields:
+        A ``tokenized_document`` as list for each ``document``.
+
+    Example:
+        >>> corpus = ["This is 1 example text.", "This is another example."]
+        >>> list(tokenize_corpus(corpus, processes=2, chunksize=1))
+        [['this', 'is', 'example', 'text'], ['this', 'is', 'another', 'example']]
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    log.info("Tokenizing corpus with {} processes ...".format(processes))
+    documents = iter(corpus)
+    if processes == 1:
+        compiled_pattern = regex.compile(pattern)
+        for document in documents:
+            yield list(tokenize(document, compiled_pattern, lower))
+        return
+
+    with multiprocessing.Pool(processes, initializer=_init_tokenize_worker, initargs=(pattern, lower)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * processes:
+                chunk = list(islice(documents, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_tokenize_chunk, (chunk,)))
+            if not pending:
+                break
+            for tokenized_document in pending.popleft().get():
+                yield tokenized_document
+
+
+def top_ngrams(tokenized_corpus, ngram_range=(2, 2), n=1000, capacity=None):
+    """Determines the most frequent n-grams in fixed memory.
+
+    With this function you can find frequent n-grams, e.g. collocations like \
+    *new york*, in a corpus of any size. The n-grams are counted by the \
+    `Space-Saving <https://doi.org/10.1007/978-3-540-30570-5_27>`_ algorithm: \
+    At most ``capacity`` n-grams are counted at a time, and a new n-gram \
+    replaces the one with the lowest count (inheriting its count). So, the \
+    counts may be overestimated, but every n-gram occurring more often than \
+    the total number of n-grams divided by ``capacity`` is found. For exact \
+    counts, pass the result to :func:`create_document_term_matrix()`, or use \
+    ``max_ngrams`` there.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable containing one
+            or more iterables containing tokens.
+        ngram_range (tuple, optional): Smallest and largest ``n`` of n-grams.
+            Defaults to ``(2, 2)``.
+        n (int, optional): Number of n-grams to return. Defaults to 1000.
+        capacity (int, optional): Maximum number of n-grams counted at a time.
+            Defaults to None, ten times ``n``.
 
     Returns:
-        A bag-of-words model as dictionary of dictionaries, document IDs and type IDs.
+        A list of the ``n`` most frequent n-grams.
+
+    Example:
+        >>> tokenized_corpus = [['new', 'york', 'is', 'new'], ['new', 'york', 'is', 'big']]
+        >>> top_ngrams(tokenized_corpus, n=2)
+        ['new york', 'york is']
+    """
+    if capacity is None:
+        capacity = 10 * n
+    log.info("Counting {}-grams, at most {} at a time ...".format('-'.join(map(str, ngram_range)), capacity))
+    counts = {}
+    heap = []
+    for tokenized_document in tokenized_corpus:
+        for ngram in _ngrams(list(tokenized_document), ngram_range):
+            if ngram in counts:
+                counts[ngram] += 1
+            elif len(counts) < capacity:
+                counts[ngram] = 1
+                heapq.heappush(heap, (1, ngram))
+            else:
+                while True:
+                    count_, minimum = heapq.heappop(heap)
+                    if counts[minimum] == count_:
+                        break
+                    heapq.heappush(heap, (counts[minimum], minimum))
+                del counts[minimum]
+                counts[ngram] = count_ + 1
+                heapq.heappush(heap, (count_ + 1, ngram))
+    return heapq.nlargest(n, counts, key=counts.__getitem__)
+
+
+class CorpusStatistics:
+    """Frequencies of types and lengths of documents in a corpus.
+
+    With this class you can count term frequencies, document frequencies and \
+    document lengths of a ``document_term_matrix`` in one vectorized pass, \
+    and determine stopwords, hapax legomena or types with too low or too high \
+    document frequencies from the cached counts afterwards. All variants of \
+    ``document_term_matrix`` are supported, for large corpora ``type_ids`` \
+    are required. :func:`find_stopwords()` and :func:`find_hapax_legomena()` \
+    accept a :class:`CorpusStatistics`, too.
+
+    Args:
+        document_term_matrix (pandas.DataFrame): A document-term matrix, either
+            as pandas DataFrame or :class:`SparseDocumentTermMatrix`.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values, or a :class:`Vocabulary`. Only required, if
+            ``document_term_matrix`` is designed for large corpora. Defaults to None.
+
+    Attributes:
+        term_frequency (pandas.Series): Frequency of each type in the corpus.
+        document_frequency (pandas.Series): Number of documents each type occurs in.
+        document_lengths (pandas.Series): Number of tokens of each document,
+            by document label (or document ID for large corpora).
+        max_frequency (pandas.Series): Highest frequency of each type in a
+            single document.
+        num_documents (int): Number of documents.
 
     Example:
-        >>> document_labels = ['exampletext']
-        >>> tokenized_corpus = [['this', 'is', 'an', 'example', 'text']]
-        >>> bag_of_words, document_ids, type_ids = _create_bag_of_words(document_labels, tokenized_corpus)
-        >>> isinstance(bag_of_words, dict) and isinstance(document_ids, dict) and isinstance(type_ids, dict)
+        >>> tokenized_corpus = [['this', 'is', 'this'], ['this', 'is', 'it']]
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, ['one', 'two'])
+        >>> statistics = CorpusStatistics(document_term_matrix)
+        >>> statistics.term_frequency.tolist(), statistics.document_frequency.tolist()
+        ([3, 2, 1], [2, 2, 1])
+        >>> statistics.stopwords(1), statistics.hapax_legomena()
+        (['this'], ['is', 'it'])
+        >>> statistics.filter_document_frequency(min_df=2), statistics.filter_document_frequency(max_df=0.5)
+        (['it'], ['this', 'is'])
+    """
+    def __init__(self, document_term_matrix, type_ids=None):
+        log.info("Counting frequencies ...")
+        large_corpus = isinstance(document_term_matrix.index, pd.MultiIndex)
+        if isinstance(document_term_matrix, SparseDocumentTermMatrix):
+            matrix = document_term_matrix.matrix
+            term_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+            document_frequency = np.asarray((matrix > 0).sum(axis=0)).ravel()
+            max_frequency = matrix.max(axis=0).toarray().ravel()
+            document_lengths = np.asarray(matrix.sum(axis=1)).ravel()
+            types, documents = document_term_matrix.columns, document_term_matrix.index
+        elif large_corpus:
+            if type_ids is None:
+                raise ValueError("You have to pass type_ids as parameter.")
+            document_id_arr = document_term_matrix.index.get_level_values('document_id').values
+            type_id_arr = document_term_matrix.index.get_level_values('type_id').values
+            frequencies = document_term_matrix[0].values
+            dtype = frequencies.dtype
+            term_frequency = np.bincount(type_id_arr, weights=frequencies).astype(dtype)
+            document_frequency = np.bincount(type_id_arr[frequencies > 0], minlength=len(term_frequency))
+            max_frequency = np.zeros(len(term_frequency), dtype=dtype)
+            np.maximum.at(max_frequency, type_id_arr, frequencies)
+            used_type_ids = np.flatnonzero(term_frequency[1:]) + 1
+            id2type = _id2type(type_ids)
+            types = pd.Index([id2type(type_id) for type_id in used_type_ids.tolist()])
+            term_frequency = term_frequency[used_type_ids]
+            document_frequency = document_frequency[used_type_ids]
+            max_frequency = max_frequency[used_type_ids]
+            document_lengths = np.bincount(document_id_arr, weights=frequencies).astype(dtype)[1:]
+            documents = pd.RangeIndex(1, len(document_lengths) + 1, name='document_id')
+        else:
+            values = document_term_matrix.values
+            term_frequency = values.sum(axis=0)
+            document_frequency = (values > 0).sum(axis=0)
+            max_frequency = values.max(axis=0)
+            document_lengths = values.sum(axis=1)
+            types, documents = document_term_matrix.columns, document_term_matrix.index
+        self.term_frequency = pd.Series(term_frequency, index=types)
+        self.document_frequency = pd.Series(document_frequency, index=types)
+        self.max_frequency = pd.Series(max_frequency, index=types)
+        self.document_lengths = pd.Series(document_lengths, index=documents)
+        self.num_documents = len(documents)
+        self._large_corpus = large_corpus
+
+    def __len__(self):
+        return len(self.term_frequency)
+
+    def __repr__(self):
+        return "<{} with {} types in {} documents>".format(self.__class__.__name__, len(self), self.num_documents)
+
+    def filter_document_frequency(self, min_df=None, max_df=None):
+        """Determines types occurring in too few or too many documents.
+
+        Args:
+            min_df (int or float, optional): Minimum document frequency, as
+                number of documents (int) or proportion of all documents (float).
+                Defaults to None.
+            max_df (int or float, optional): Maximum document frequency, as
+                number of documents (int) or proportion of all documents (float).
+                Defaults to None.
+
+        Returns:
+            Types with a document frequency lower than ``min_df`` or higher
+                than ``max_df`` in a list, e.g. for :func:`remove_features()`.
+        """
+        document_frequency = self.document_frequency.values
+        outside = np.zeros(len(document_frequency), dtype=bool)
+        if min_df is not None:
+            outside |= document_frequency < _absolute_threshold(min_df, self.num_documents)
+        if max_df is not None:
+            outside |= document_frequency > _absolute_threshold(max_df, self.num_documents)
+        return self.document_frequency.index[outside].tolist()
+
+    def hapax_legomena(self, by=None):
+        """Determines types occurring at most once in every document.
+
+        For large corpora, types occurring only once in the whole corpus, like \
+        :func:`find_hapax_legomena()`.
+
+        Args:
+            by (str, optional): Either ``max_frequency`` or ``term_frequency``.
+                Defaults to None, ``term_frequency`` for large corpora, otherwise
+                ``max_frequency``.
+
+        Returns:
+            Hapax legomena in a list.
+        """
+        if by is None:
+            by = 'term_frequency' if self._large_corpus else 'max_frequency'
+        if by not in {'max_frequency', 'term_frequency'}:
+            raise ValueError("Hapax legomena are determined by max_frequency or term_frequency, not {}.".format(by))
+        frequencies = getattr(self, by)
+        return frequencies.index[frequencies.values == 1].tolist()
+
+    def stopwords(self, most_frequent_tokens=100):
+        """Determines the most frequent types.
+
+        Returns:
+            Most frequent tokens in a list.
+        """
+        return self.top(most_frequent_tokens).index.tolist()
+
+    def top(self, n=10, by='term_frequency'):
+        """Returns the types with the highest frequencies.
+
+        Types with equal frequencies keep the order of the ``document_term_matrix``.
+
+        Args:
+            n (int, optional): Number of types. Defaults to 10.
+            by (str, optional): Either ``term_frequency`` or ``document_frequency``.
+                Defaults to ``term_frequency``.
+
+        Returns:
+            A pandas Series with types as index and frequencies as values.
+        """
+        frequencies = getattr(self, by)
+        order = np.argsort(-frequencies.values, kind='mergesort')[:n]
+        return frequencies.iloc[order]
+
+
+class HashingVocabulary(Mapping):
+    """Mapping of types to identifiers by hashing, without storing the types.
+
+    With this class you can use the `hashing trick <https://en.wikipedia.org/wiki/Feature_hashing>`_ \
+    instead of a :class:`Vocabulary`: The identifier of a type is its `CRC32 <https://en.wikipedia.org/wiki/Cyclic_redundancy_check>`_ \
+    checksum modulo ``n_features`` (plus 1, because identifiers start with 1), \
+    so it is the same for every run and every process, but different types \
+    may share an identifier. The memory needed does not depend on the size \
+    of the vocabulary. Like a :class:`Vocabulary`, frequencies and document \
+    frequencies are counted per identifier.
+    If ``reverse_lookup`` is set, up to ``reverse_lookup`` types are remembered \
+    per identifier, and :meth:`token()` returns the most frequent one of them. \
+    Iterating over a :class:`HashingVocabulary` yields only remembered types, \
+    and only those are members of it, although every type has an identifier.
+
+    Args:
+        n_features (int, optional): Number of identifiers. Defaults to 2 ** 20.
+        reverse_lookup (int, optional): Number of types remembered per identifier.
+            Defaults to None.
+
+    Example:
+        >>> vocabulary = HashingVocabulary(n_features=8, reverse_lookup=1)
+        >>> sorted(vocabulary.update(['this', 'is', 'this']).items())
+        [(8, 3)]
+        >>> vocabulary['is'], vocabulary.token(8), vocabulary.token(1)
+        (8, 'this', '#1')
+        >>> dict(vocabulary), 'this' in vocabulary, 'is' in vocabulary
+        ({'this': 8}, True, False)
+    """
+    def __init__(self, n_features=2 ** 20, reverse_lookup=None):
+        self.n_features = n_features
+        self.reverse_lookup = reverse_lookup
+        self.frequencies = array('q', bytes(8 * n_features))
+        self.document_frequencies = array('q', bytes(8 * n_features))
+        self.num_documents = 0
+        self._samples = {}
+
+    def __getitem__(self, token):
+        return zlib.crc32(token.encode('utf-8')) % self.n_features + 1
+
+    def __iter__(self):
+        return (token for samples in self._samples.values() for token in samples)
+
+    def __len__(self):
+        return sum(len(samples) for samples in self._samples.values())
+
+    def __contains__(self, token):
+        return isinstance(token, str) and token in self._samples.get(self[token], ())
+
+    def __repr__(self):
+        return "<{} with {} features>".format(self.__class__.__name__, self.n_features)
+
+    def id2token(self):
+        """Returns a dictionary with used identifiers as keys and types as values, e.g. for Gensim."""
+        ids = np.flatnonzero(np.frombuffer(self.frequencies, dtype=np.int64)) + 1
+        return {id_: self.token(id_) for id_ in ids.tolist()}
+
+    def token(self, type_id):
+        """Returns the most frequent remembered type of an identifier.
+
+        If no type has been remembered, a placeholder like ``#42`` is returned.
+
+        Raises:
+            KeyError, if ``type_id`` is not a valid identifier.
+        """
+        if not 0 < type_id <= self.n_features:
+            raise KeyError(type_id)
+        samples = self._samples.get(type_id)
+        if samples:
+            return samples.most_common(1)[0][0]
+        return '#{}'.format(type_id)
+
+    def update(self, tokenized_document):
+        """Counts the tokens of a document.
+
+        Args:
+            tokenized_document (list): Iterable of tokens.
+
+        Returns:
+            A :class:`collections.Counter` with identifiers as keys and
+                frequencies in ``tokenized_document`` as values.
+        """
+        bag_of_words = Counter()
+        for token, frequency in Counter(tokenized_document).items():
+            id_ = self[token]
+            bag_of_words[id_] += frequency
+            if self.reverse_lookup:
+                samples = self._samples.setdefault(id_, Counter())
+                if token in samples or len(samples) < self.reverse_lookup:
+                    samples[token] += frequency
+        for id_, frequency in bag_of_words.items():
+            self.frequencies[id_ - 1] += frequency
+            self.document_frequencies[id_ - 1] += 1
+        self.num_documents += 1
+        return bag_of_words
+
+
+class MatrixMarketCorpus:
+    """Streamed corpus of a Matrix Market file for Gensim.
+
+    With this class you can read a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ \
+    file, plain or compressed with gzip (``.gz``) or bzip2 (``.bz2``), like \
+    :class:`gensim.corpora.MmCorpus` does: Each iteration yields one list of \
+    ``(type_id, frequency)`` tuples per document, with type IDs starting with \
+    0. The file is read in blocks of ``blocksize`` bytes, which are parsed at \
+    once. If the file has been written by :func:`postprocessing.save_document_term_matrix()` \
+    or :func:`create_document_term_matrix()`, an index of the position of \
+    each document has been saved next to it, and ``corpus[n]`` reads only the \
+    lines of the ``n``-th document (and, if compressed, decompresses only \
+    its block). Otherwise, the file is read up to the document.
+
+    Args:
+        filepath (str): Path to the Matrix Market file.
+        blocksize (int, optional): Number of bytes read at once. Defaults to 2 ** 20.
+
+    Example:
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing
+        >>> tokenized_corpus = [['this', 'is', 'this'], [], ['is', 'it']]
+        >>> document_term_matrix, _, _ = create_document_term_matrix(tokenized_corpus, ['one', 'two', 'three'], True)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     postprocessing.save_document_term_matrix(document_term_matrix, tmpdir, matrix_market=True, compression='gzip')
+        ...     corpus = MatrixMarketCorpus(os.path.join(tmpdir, 'document_term_matrix.mm.gz'))
+        ...     len(corpus), list(corpus), corpus[2]
+        (3, [[(0, 2.0), (1, 1.0)], [], [(1, 1.0), (2, 1.0)]], [(1, 1.0), (2, 1.0)])
+    """
+    def __init__(self, filepath, blocksize=2 ** 20):
+        self.filepath = filepath
+        self.blocksize = blocksize
+        self.compression = {'.gz': 'gzip', '.bz2': 'bz2'}.get(os.path.splitext(filepath)[1])
+        with self._open() as file:
+            self.num_docs, self.num_terms, self.num_nnz = self._read_header(file)
+        index = filepath + '.index.npz'
+        if os.path.exists(index):
+            with np.load(index) as arrays:
+                self.index = np.column_stack([arrays['starts'], arrays['positions'], arrays['lengths']])
+        else:
+            self.index = None
+
+    def __getitem__(self, n):
+        if not 0 <= n < self.num_docs:
+            raise IndexError(n)
+        if self.index is None:
+            return next(islice(self, n, None))
+        start, position, length = self.index[n].tolist()
+        if not length:
+            return []
+        with open(self.filepath, 'rb') as file:
+            file.seek(start)
+            if self.compression is None:
+                data = file.read(length)
+            else:
+                decompressor = zlib.decompressobj(31) if self.compression == 'gzip' else bz2.BZ2Decompressor()
+                data = b''
+                while len(data) < position + length:
+                    block = file.read(self.blocksize)
+                    if not block:
+                        break
+                    data += decompressor.decompress(block)
+                data = data[position:position + length]
+        entries = np.array(data.split(), dtype=np.float64).reshape(-1, 3)
+        return list(zip((entries[:, 1].astype(np.int64) - 1).tolist(), entries[:, 2].tolist()))
+
+    def __iter__(self):
+        document_id = 1
+        bag = []
+        with self._open() as file:
+            self._read_header(file)
+            carry = b''
+            for block in chain(iter(partial(file.read, self.blocksize), b''), [b'\n']):
+                block = carry + block
+                end = block.rfind(b'\n') + 1
+                carry = block[end:]
+                entries = np.array(block[:end].split(), dtype=np.float64).reshape(-1, 3)
+                if not len(entries):
+                    continue
+                document_ids = entries[:, 0].astype(np.int64)
+                type_ids = (entries[:, 1].astype(np.int64) - 1).tolist()
+                frequencies = entries[:, 2].tolist()
+                bounds = [0] + (np.flatnonzero(document_ids[1:] != document_ids[:-1]) + 1).tolist() + [len(entries)]
+                for start, end in zip(bounds[:-1], bounds[1:]):
+                    if document_ids[start] != document_id:
+                        yield bag
+                        for _ in range(document_id + 1, int(document_ids[start])):
+                            yield []
+                        document_id = int(document_ids[start])
+                        bag = []
+                    bag.extend(zip(type_ids[start:end], frequencies[start:end]))
+        if self.num_docs:
+            yield bag
+        for _ in range(document_id + 1, self.num_docs + 1):
+            yield []
+
+    def __len__(self):
+        return self.num_docs
+
+    def __repr__(self):
+        return "<{} with {} documents, {} types and {} entries>".format(self.__class__.__name__, self.num_docs, self.num_terms, self.num_nnz)
+
+    def _open(self):
+        if self.compression == 'gzip':
+            return gzip.open(self.filepath, 'rb')
+        elif self.compression == 'bz2':
+            return bz2.open(self.filepath, 'rb')
+        return open(self.filepath, 'rb')
+
+    @staticmethod
+    def _read_header(file):
+        if not file.readline().startswith(b'%%MatrixMarket matrix coordinate'):
+            raise ValueError("The file is not a Matrix Market file in coordinate format.")
+        line = file.readline()
+        while line.startswith(b'%'):
+            line = file.readline()
+        num_documents, num_types, num_entries = map(int, line.split())
+        return num_documents, num_types, num_entries
+
+
+class PreprocessingCache:
+    """Persistent cache of tokenized documents.
+
+    With this class you can read and tokenize files once and serve the \
+    ``tokenized_document`` from disk on every following run. An entry is keyed \
+    on the path of the file, on its version (either its modification time and \
+    size, or, if ``key`` is ``'content'``, the SHA-1 checksum of its content) \
+    and on the parameters of :func:`stream_tokenized_corpus()`, i.e. pattern, \
+    lowering, segmenting and reading options. Storing a new version of a file \
+    removes the entries of its older versions, and :meth:`invalidate()` \
+    removes all entries of a path, even if the file has been changed or \
+    deleted. :meth:`tokenize_pathlist()` computes the key of each file once \
+    and lists the cache directory once per call. Each entry is one ``.npz`` file holding the types of \
+    a file as UTF-8 string table, its tokens as identifiers and the offsets \
+    of its segments. If ``max_size`` is set, the least recently used entries \
+    are removed as soon as the cache exceeds ``max_size`` bytes (after \
+    :meth:`tokenize_pathlist()` has stored all its files).
+
+    Args:
+        directory (str): Path to the cache directory, will be created if necessary.
+        max_size (int, optional): Maximum size of the cache in bytes. Defaults
+            to None, i.e. unlimited.
+        key (str, optional): Either ``'stat'`` (path, modification time and size)
+            or ``'content'`` (checksum of the content). Defaults to ``'stat'``.
+
+    Example:
+        >>> import tempfile
+        >>> cache = PreprocessingCache(tempfile.mkdtemp())
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as tmpfile:
+        ...     tmpfile.write(b"This is the first and last example.") and True
+        ...     tmpfile.flush()
+        ...     cold = list(cache.tokenize_pathlist([tmpfile.name], ['document'], segment_size=4))
+        ...     warm = list(cache.tokenize_pathlist([tmpfile.name], ['document'], segment_size=4))
+        True
+        >>> warm
+        [('document_0001', ['this', 'is', 'the', 'first']), ('document_0002', ['and', 'last', 'example'])]
+        >>> cold == warm, len(cache)
+        (True, 1)
+    """
+    version = 2
+
+    def __init__(self, directory, max_size=None, key='stat'):
+        if key not in {'stat', 'content'}:
+            raise ValueError("Unknown key '{}', use either 'stat' or 'content'.".format(key))
+        self.directory = directory
+        self.max_size = max_size
+        self.key = key
+        os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __repr__(self):
+        return "<{} with {} entries in '{}'>".format(self.__class__.__name__, len(self), self.directory)
+
+    @property
+    def size(self):
+        """Size of all entries in bytes."""
+        return sum(os.path.getsize(entry) for entry in self._entries())
+
+    def clear(self):
+        """Removes all entries.
+
+        Returns:
+            None.
+        """
+        for entry in self._entries():
+            os.remove(entry)
+        return None
+
+    def get(self, file, **parameters):
+        """Returns the cached segments of a file.
+
+        Args:
+            file (str): Path to the file.
+            **parameters: Parameters the file has been tokenized with.
+
+        Returns:
+            A list of ``tokenized_document`` as lists, or None, if the file is
+                not in the cache.
+        """
+        return self._get(self._entry(file, parameters))
+
+    def invalidate(self, file):
+        """Removes the entries of a file for all parameters.
+
+        Args:
+            file (str): Path to the file.
+
+        Returns:
+            Number of removed entries.
+        """
+        removed = self._path_entries(file)
+        for entry in removed:
+            os.remove(entry)
+        return len(removed)
+
+    def put(self, file, segments, **parameters):
+        """Stores the segments of a file.
+
+        Args:
+            file (str): Path to the file.
+            segments (list): List of ``tokenized_document``, e.g. only one for
+                an unsegmented file.
+            **parameters: Parameters the file has been tokenized with.
+
+        Returns:
+            None.
+        """
+        self._put(file, self._entry(file, parameters), segments, self._path_entries(file))
+        if self.max_size is not None:
+            self._evict()
+        return None
+
+    def tokenize_pathlist(self, pathlist, document_labels=None, file_format=None, pattern=r'\p{L}+\p{P}?\p{L}+',
+                          lower=True, segment_size=None, tolerance=0.05, chunker=None, **kwargs):
+        """Reads, tokenizes and segments files, or serves them from the cache.
+
+        Takes the same arguments and yields the same pairs as :func:`stream_tokenized_corpus()`. \
+        A file in the cache is neither read nor tokenized, all other files are \
+        processed by one call of :func:`stream_tokenized_corpus()` (so ``workers`` \
+        read them in parallel) and stored. Files that cannot be read raise an \
+        error or, with ``errors='skip'``, are logged and skipped. A ``chunker`` \
+        is part of the key by its name only, so use \
+        a different name if you change its behaviour.
+
+        Yields:
+            ``(document_label, tokenized_document)`` pairs, with
+                ``tokenized_document`` as list.
+        """
+        parameters = dict(kwargs, file_format=file_format, pattern=getattr(pattern, 'pattern', pattern), lower=lower,
+                          segment_size=segment_size, tolerance=tolerance, chunker=_qualified_name(chunker))
+        for name in ['workers', 'prefetch', 'errors']:
+            parameters.pop(name, None)
+        if document_labels is None:
+            document_labels = (_default_label(file) for file in pathlist)
+        snapshot = {}
+        for entry in self._entries():
+            snapshot.setdefault(os.path.basename(entry).split('_')[0], []).append(entry)
+        files = []
+        for file, document_label in zip(pathlist, document_labels):
+            path_entries = snapshot.get(self._path_key(file), [])
+            try:
+                entry = self._entry(file, parameters)
+            except OSError:
+                entry = None
+            files.append((file, document_label, entry, path_entries, entry in path_entries))
+        misses = [(file, document_label) for file, document_label, _, _, cached in files if not cached]
+        tokenized_misses = iter([])
+        if misses:
+            tokenized_misses = _tokenize_files([file for file, _ in misses], [label for _, label in misses],
+                                               file_format, pattern, lower, segment_size, tolerance, chunker, **kwargs)
+        tokenized_miss = next(tokenized_misses, None)
+        position = 0
+        hits = 0
+        try:
+            for file, document_label, entry, path_entries, cached in files:
+                segments = self._get(entry) if cached else None
+                if segments is not None:
+                    hits += 1
+                    if segment_size is None:
+                        yield document_label, segments[0]
+                    else:
+                        for n, tokenized_segment in enumerate(segments, 1):
+                            yield _segment_label(document_label, n), tokenized_segment
+                    continue
+                if not cached:
+                    n, position = position, position + 1
+                    if tokenized_miss is None or tokenized_miss[0] != n:
+                        continue
+                    labeled_segments = tokenized_miss[1]
+                    tokenized_miss = next(tokenized_misses, None)
+                else:
+                    log.debug("{} has been removed from the cache meanwhile.".format(file))
+                    labeled_segments = chain.from_iterable(labeled_segments for _, labeled_segments in
+                                                           _tokenize_files([file], [document_label], file_format, pattern,
+                                                                           lower, segment_size, tolerance, chunker, **kwargs))
+                labeled_segments = [(label, list(tokenized_segment)) for label, tokenized_segment in labeled_segments]
+                if labeled_segments:
+                    if entry is None:
+                        entry = self._entry(file, parameters)
+                    self._put(file, entry, [tokenized_segment for _, tokenized_segment in labeled_segments], path_entries)
+                yield from labeled_segments
+            log.info("Served {} files from the cache.".format(hits))
+        finally:
+            if self.max_size is not None:
+                self._evict()
+
+    def _entries(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith('.npz') and not name.endswith('.partial.npz')]
+
+    def _entry(self, file, parameters):
+        parameters = json.dumps(parameters, sort_keys=True, default=str)
+        parameters_key = hashlib.sha1('{}:{}'.format(self.version, parameters).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, '{}_{}_{}.npz'.format(self._path_key(file), self._file_key(file), parameters_key))
+
+    def _evict(self):
+        entries = sorted((os.stat(entry).st_mtime_ns, os.path.getsize(entry), entry) for entry in self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry in entries:
+            if size <= self.max_size:
+                break
+            log.debug("Evicting {} from the cache ...".format(entry))
+            os.remove(entry)
+            size -= entry_size
+
+    def _file_key(self, file):
+        if self.key == 'content':
+            checksum = hashlib.sha1()
+            with open(file, 'rb') as handle:
+                for block in iter(partial(handle.read, 2 ** 20), b''):
+                    checksum.update(block)
+            return checksum.hexdigest()
+        stat = os.stat(file)
+        identity = '{}:{}'.format(stat.st_mtime_ns, stat.st_size)
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def _get(self, entry):
+        try:
+            with np.load(entry) as arrays:
+                types = np.array(_decode_strings(arrays['types'], arrays['type_offsets']), dtype=object)
+                tokens, offsets = arrays['tokens'], arrays['segment_offsets'].tolist()
+        except FileNotFoundError:
+            return None
+        os.utime(entry)
+        tokens = types[tokens]
+        return [tokens[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def _path_entries(self, file):
+        prefix = self._path_key(file) + '_'
+        return [entry for entry in self._entries() if os.path.basename(entry).startswith(prefix)]
+
+    def _path_key(self, file):
+        return hashlib.sha1(os.path.abspath(str(file)).encode('utf-8')).hexdigest()
+
+    def _put(self, file, entry, segments, path_entries):
+        segments = [list(tokenized_segment) for tokenized_segment in segments]
+        vocabulary = {}
+        id2type = []
+        token_ids = []
+        for tokenized_segment in segments:
+            for token in tokenized_segment:
+                if token not in vocabulary:
+                    vocabulary[token] = len(id2type)
+                    id2type.append(token)
+                token_ids.append(vocabulary[token])
+        tokens = np.array(token_ids, dtype=np.int32)
+        segment_offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        segment_offsets[1:] = np.cumsum([len(tokenized_segment) for tokenized_segment in segments])
+        types, type_offsets = _encode_strings(id2type)
+        partial_entry = entry[:-len('.npz')] + '.{}.partial.npz'.format(os.getpid())
+        np.savez(partial_entry, types=types, type_offsets=type_offsets, tokens=tokens, segment_offsets=segment_offsets)
+        os.replace(partial_entry, entry)
+        version = os.path.basename(entry).split('_')[1]
+        for stale_entry in path_entries:
+            if os.path.basename(stale_entry).split('_')[1] != version:
+                log.debug("Removing {} of an older version of {} from the cache ...".format(stale_entry, file))
+                try:
+                    os.remove(stale_entry)
+                except FileNotFoundError:
+                    pass
+
+
+class SparseDocumentTermMatrix:
+    """Sparse document-term matrix for small corpora.
+
+    With this class you can hold a ``document_term_matrix`` as `compressed sparse row <https://docs.scipy.org/doc/scipy/reference/generated/scipy.sparse.csr_matrix.html>`_ \
+    matrix, with rows corresponding to ``document_labels`` and columns corresponding \
+    to types, sorted by their frequency in the corpus. Only non-zero frequencies \
+    are stored, so even large vocabularies fit into memory.
+    Use the function :func:`create_document_term_matrix()` with ``sparse=True`` \
+    to create an instance, and :meth:`to_dataframe()` to get the pandas DataFrame \
+    known from the small corpus model.
+
+    Args:
+        matrix (scipy.sparse.csr_matrix): Sparse matrix of type frequencies.
+        document_labels (list): Name or label of each row.
+        types (list): Type of each column.
+
+    Example:
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+        >>> document_term_matrix.shape
+        (2, 5)
+        >>> document_term_matrix.to_dataframe() #doctest: +NORMALIZE_WHITESPACE
+                      this  is  document  one  two
+        document_one     1   1         1    1    0
+        document_two     1   1         1    0    1
+    """
+    def __init__(self, matrix, document_labels, types):
+        self.matrix = csr_matrix(matrix)
+        self.index = pd.Index(document_labels)
+        self.columns = pd.Index(types)
+        if self.matrix.shape != (len(self.index), len(self.columns)):
+            raise ValueError("The shape of the matrix {} does not match {} document labels and {} types.".format(self.matrix.shape, len(self.index), len(self.columns)))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def __repr__(self):
+        return "<{} with {} documents, {} types and {} stored frequencies>".format(self.__class__.__name__, *self.matrix.shape, self.matrix.nnz)
+
+    @property
+    def shape(self):
+        """Number of documents and types."""
+        return self.matrix.shape
+
+    def drop(self, labels, axis=1):
+        """Removes documents or types.
+
+        Args:
+            labels (list): Document labels (if ``axis`` is 0) or types (if
+                ``axis`` is 1) to remove.
+            axis (int, optional): 0 for documents, 1 for types. Defaults to 1.
+
+        Returns:
+            A new :class:`SparseDocumentTermMatrix`.
+        """
+        if axis == 0:
+            keep = ~self.index.isin(labels)
+            return SparseDocumentTermMatrix(self.matrix[keep], self.index[keep], self.columns)
+        elif axis == 1:
+            keep = ~self.columns.isin(labels)
+            return SparseDocumentTermMatrix(self.matrix[:, keep], self.index, self.columns[keep])
+        else:
+            raise ValueError("No axis named {}.".format(axis))
+
+    def max(self, axis=0):
+        """Returns the maximum frequency of each type (or document, if ``axis`` is 1) as NumPy array."""
+        return self.matrix.max(axis=axis).toarray().ravel()
+
+    def sum(self, axis=0):
+        """Returns the frequency of each type (or length of each document, if ``axis`` is 1) as NumPy array."""
+        return np.asarray(self.matrix.sum(axis=axis)).ravel()
+
+    def to_dataframe(self):
+        """Converts the matrix to a dense pandas DataFrame.
+
+        Returns:
+            Document-term matrix as pandas DataFrame.
+        """
+        return pd.DataFrame(self.matrix.toarray(), index=self.index, columns=self.columns)
+
+
+class TokenizedCorpus:
+    """Tokenized corpus stored as identifiers in one flat array.
+
+    With this class you can hold a ``tokenized_corpus`` with 4 bytes per \
+    token instead of one Python string per token: Tokens are replaced by their \
+    identifiers in a shared :class:`Vocabulary`, and all documents are stored \
+    one after another in one NumPy array of 32-bit integers, with the start of \
+    each document in an array of offsets. Iterating yields each \
+    ``tokenized_document`` as list of strings, so a :class:`TokenizedCorpus` \
+    can be used wherever a ``tokenized_corpus`` is expected. Besides, \
+    :func:`create_document_term_matrix()`, :func:`remove_features()`, \
+    :func:`segment()` and :func:`postprocessing.save_tokenized_corpus()` work \
+    on the arrays directly.
+
+    Args:
+        tokens (numpy.ndarray): Identifiers of all tokens, document after document.
+        offsets (numpy.ndarray): Start of each document in ``tokens``, and the end
+            of the last one.
+        vocabulary (Vocabulary): :class:`Vocabulary` the identifiers belong to.
+        document_labels (list): Name or label of each document.
+
+    Example:
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> corpus = TokenizedCorpus.from_tokenized_corpus(tokenized_corpus, ['document_one', 'document_two'])
+        >>> corpus
+        <TokenizedCorpus with 2 documents, 8 tokens and 5 types>
+        >>> corpus.ids(1).tolist(), corpus[1]
+        ([1, 2, 3, 5], ['this', 'is', 'document', 'two'])
+        >>> list(corpus) == tokenized_corpus
         True
     """
-    document_ids = _token2id(document_labels)
-    type_ids = _token2id(tokenized_corpus)
-    bag_of_words = defaultdict(dict)
-    for document_label, tokenized_document in zip(document_labels, tokenized_corpus):
-        bag_of_words[document_label] = Counter([type_ids[token] for token in tokenized_document])
-    return {document_ids[id_]: doc for id_, doc in bag_of_words.items()}, document_ids, type_ids
+    def __init__(self, tokens, offsets, vocabulary, document_labels):
+        self.tokens = np.asarray(tokens, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.vocabulary = vocabulary
+        self.document_labels = list(document_labels)
+        if len(self.offsets) != len(self.document_labels) + 1 or self.offsets[-1] != len(self.tokens):
+            raise ValueError("The offsets do not match {} document labels and {} tokens.".format(len(self.document_labels), len(self.tokens)))
+        self._types = None
+
+    def __getitem__(self, n):
+        return self._type_array()[self.ids(n)].tolist()
+
+    def __iter__(self):
+        types = self._type_array()
+        offsets = self.offsets.tolist()
+        return (types[self.tokens[start:end]].tolist() for start, end in zip(offsets[:-1], offsets[1:]))
+
+    def __len__(self):
+        return len(self.document_labels)
+
+    def __repr__(self):
+        return "<{} with {} documents, {} tokens and {} types>".format(self.__class__.__name__, len(self), len(self.tokens), len(self.vocabulary))
+
+    @classmethod
+    def from_tokenized_corpus(cls, tokenized_corpus, document_labels=None, vocabulary=None):
+        """Creates a :class:`TokenizedCorpus` from tokens.
+
+        Documents are consumed one after another, so ``tokenized_corpus`` may \
+        be a generator, e.g. :func:`stream_tokenized_corpus()`.
+
+        Args:
+            tokenized_corpus (list): Tokenized corpus as an iterable containing
+                one or more iterables containing tokens. If ``document_labels``
+                is None, an iterable of ``(document_label, tokenized_document)`` pairs.
+            document_labels (list, optional): Name or label of each document.
+                Defaults to None.
+            vocabulary (Vocabulary, optional): :class:`Vocabulary` to assign
+                identifiers, e.g. of another :class:`TokenizedCorpus`. If it is
+                frozen, unknown tokens are dropped. Defaults to None, a new
+                :class:`Vocabulary`.
+
+        Returns:
+            A :class:`TokenizedCorpus`.
+        """
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        labels = []
+        tokens = array('i')
+        offsets = array('q', [0])
+        for document_label, tokenized_document in _labeled_corpus(tokenized_corpus, document_labels):
+            labels.append(document_label)
+            tokens.extend(id_ for id_ in map(vocabulary.add, tokenized_document) if id_ is not None)
+            offsets.append(len(tokens))
+        return cls(np.frombuffer(tokens, dtype=np.int32), np.frombuffer(offsets, dtype=np.int64), vocabulary, labels)
+
+    def ids(self, n):
+        """Returns the identifiers of the tokens of the ``n``-th document as NumPy array (a view)."""
+        return self.tokens[self.offsets[n]:self.offsets[n + 1]]
+
+    def lengths(self):
+        """Returns the number of tokens of each document as NumPy array."""
+        return np.diff(self.offsets)
+
+    def remove(self, features):
+        """Removes tokens of some types.
+
+        Args:
+            features (list): Iterable of types to remove. Unknown types are ignored.
+
+        Returns:
+            A new :class:`TokenizedCorpus` with the same :class:`Vocabulary`.
+
+        Example:
+            >>> corpus = TokenizedCorpus.from_tokenized_corpus([['this', 'is', 'this'], ['it']], ['one', 'two'])
+            >>> list(corpus.remove(['this', 'that']))
+            [['is'], ['it']]
+        """
+        feature_ids = np.array([self.vocabulary[feature] for feature in set(features) if feature in self.vocabulary], dtype=np.int32)
+        kept = ~np.isin(self.tokens, feature_ids)
+        kept_before = np.zeros(len(kept) + 1, dtype=np.int64)
+        np.cumsum(kept, out=kept_before[1:])
+        return TokenizedCorpus(self.tokens[kept], kept_before[self.offsets], self.vocabulary, self.document_labels)
+
+    def segment(self, segment_size=1000, tolerance=0):
+        """Segments each document like :func:`segment()`.
+
+        Args:
+            segment_size (int, optional): The target size of each segment, in
+                tokens. Defaults to 1000.
+            tolerance (float, optional): Tolerance for the segment size, see
+                :func:`segment()`. Defaults to 0.
+
+        Returns:
+            A new :class:`TokenizedCorpus` with the same :class:`Vocabulary` and
+                one document per segment, labeled with the document label and a
+                four-digit number.
+
+        Example:
+            >>> corpus = TokenizedCorpus.from_tokenized_corpus([['this', 'is', 'the', 'first', 'example']], ['document'])
+            >>> segments = corpus.segment(2)
+            >>> segments.document_labels, list(segments)
+            (['document_0001', 'document_0002', 'document_0003'], [['this', 'is'], ['the', 'first'], ['example']])
+        """
+        labels = []
+        offsets = [0]
+        for document_label, start, length in zip(self.document_labels, self.offsets.tolist(), self.lengths().tolist()):
+            for number, (_, end) in enumerate(segment_spans([length], segment_size, tolerance), 1):
+                labels.append(_segment_label(document_label, number))
+                offsets.append(start + end)
+        return TokenizedCorpus(self.tokens, offsets, self.vocabulary, labels)
+
+    def _type_array(self):
+        if self._types is None or len(self._types) != self.vocabulary.next_id:
+            self._types = np.array([None] + list(self.vocabulary._id2token), dtype=object)
+        return self._types
+
+
+class Vocabulary(Mapping):
+    """Mapping of types to identifiers, built while tokens stream past.
+
+    With this class you can assign identifiers to types incrementally, e.g. \
+    while counting the tokens of a ``tokenized_corpus`` document by document. \
+    Identifiers start with 1 and are assigned in order of first occurrence, so \
+    they are the same for every run on the same corpus. Besides the identifiers, \
+    the frequency and document frequency of each type are counted.
+    A :class:`Vocabulary` can be used like a ``type_ids`` dictionary. It can \
+    be frozen (unknown types will be ignored), pruned (identifiers of removed \
+    types will never be reused) and compacted (identifiers will be contiguous \
+    again). Use :meth:`save()` and :meth:`load()` to store it in a binary file.
+
+    Args:
+        tokens (list, optional): Iterable of tokens to add. Defaults to None.
+
+    Example:
+        >>> vocabulary = Vocabulary()
+        >>> sorted(vocabulary.update(['this', 'is', 'this']).items())
+        [(1, 2), (2, 1)]
+        >>> vocabulary['is'], vocabulary.token(1)
+        (2, 'this')
+        >>> vocabulary.prune(['this'])
+        [1]
+        >>> vocabulary.add('document')
+        3
+        >>> vocabulary.compact().tolist()
+        [0, 0, 1, 2]
+        >>> dict(vocabulary)
+        {'is': 1, 'document': 2}
+    """
+    def __init__(self, tokens=None):
+        self._token2id = {}
+        self._id2token = []
+        self.frequencies = array('q')
+        self.document_frequencies = array('q')
+        self.num_documents = 0
+        self.frozen = False
+        if tokens is not None:
+            for token in tokens:
+                self.add(token)
+
+    def __getitem__(self, token):
+        return self._token2id[token]
+
+    def __iter__(self):
+        return (token for token in self._id2token if token is not None)
+
+    def __len__(self):
+        return len(self._token2id)
+
+    def __contains__(self, token):
+        return token in self._token2id
+
+    def __repr__(self):
+        return "<{} with {} types{}>".format(self.__class__.__name__, len(self), ' (frozen)' if self.frozen else '')
+
+    @classmethod
+    def from_dict(cls, token2id):
+        """Creates a :class:`Vocabulary` with the identifiers of a ``token2id`` dictionary.
+
+        Args:
+            token2id (dict): A dictionary with tokens as keys and identifiers as values.
+
+        Returns:
+            A :class:`Vocabulary`.
+
+        Example:
+            >>> Vocabulary.from_dict({'this': 1, 'example': 3}).token(3)
+            'example'
+        """
+        vocabulary = cls()
+        max_id = max(token2id.values(), default=0)
+        vocabulary._id2token = [None] * max_id
+        for token, id_ in token2id.items():
+            if id_ < 1:
+                raise ValueError("Identifiers have to be positive, but {} has {}.".format(token, id_))
+            vocabulary._id2token[id_ - 1] = token
+        vocabulary._token2id = dict(token2id)
+        vocabulary.frequencies = array('q', bytes(8 * max_id))
+        vocabulary.document_frequencies = array('q', bytes(8 * max_id))
+        return vocabulary
+
+    @classmethod
+    def load(cls, filepath):
+        """Reads a :class:`Vocabulary` from a binary file.
+
+        Args:
+            filepath (str): Path to the file written by :meth:`save()`.
+
+        Returns:
+            A :class:`Vocabulary`.
+        """
+        with np.load(filepath) as arrays:
+            tokens = _decode_strings(arrays['tokens'], arrays['offsets'])
+            ids = arrays['ids']
+            vocabulary = cls.from_dict(dict(zip(tokens, ids.tolist())))
+            vocabulary._id2token.extend([None] * (int(arrays['next_id']) - 1 - len(vocabulary._id2token)))
+            vocabulary.frequencies = array('q', arrays['frequencies'].astype(np.int64).tobytes())
+            vocabulary.document_frequencies = array('q', arrays['document_frequencies'].astype(np.int64).tobytes())
+            vocabulary.num_documents = int(arrays['num_documents'])
+            vocabulary.frozen = bool(arrays['frozen'])
+        return vocabulary
+
+    @property
+    def next_id(self):
+        """Identifier the next new type will get."""
+        return len(self._id2token) + 1
+
+    def add(self, token):
+        """Adds a type.
+
+        Args:
+            token (str): Token.
+
+        Returns:
+            The identifier of ``token``, or None if ``token`` is unknown and
+                the vocabulary is frozen.
+        """
+        id_ = self._token2id.get(token)
+        if id_ is None and not self.frozen:
+            self._id2token.append(token)
+            self.frequencies.append(0)
+            self.document_frequencies.append(0)
+            id_ = self._token2id[token] = len(self._id2token)
+        return id_
+
+    def compact(self):
+        """Assigns contiguous identifiers to the types left after pruning.
+
+        The order of the types is kept.
+
+        Returns:
+            A NumPy array mapping each former identifier (as position) to the
+                new one, or to 0 if the type has been pruned.
+        """
+        live = np.array([n for n, token in enumerate(self._id2token) if token is not None], dtype=np.int64)
+        mapping = np.zeros(len(self._id2token) + 1, dtype=np.int64)
+        mapping[live + 1] = np.arange(1, len(live) + 1)
+        self._id2token = [self._id2token[n] for n in live]
+        self._token2id = {token: id_ for id_, token in enumerate(self._id2token, 1)}
+        self.frequencies = array('q', np.frombuffer(self.frequencies, dtype=np.int64)[live].tobytes())
+        self.document_frequencies = array('q', np.frombuffer(self.document_frequencies, dtype=np.int64)[live].tobytes())
+        return mapping
+
+    def freeze(self):
+        """Stops assigning identifiers to new types.
+
+        Returns:
+            The frozen :class:`Vocabulary`.
+        """
+        self.frozen = True
+        return self
+
+    def id2token(self):
+        """Returns a dictionary with identifiers as keys and types as values, e.g. for Gensim."""
+        return {id_: token for id_, token in enumerate(self._id2token, 1) if token is not None}
+
+    def prune(self, tokens):
+        """Removes types.
+
+        The identifiers of removed types will not be assigned again, use \
+        :meth:`compact()` to close the gaps.
+
+        Args:
+            tokens (list): Iterable of types to remove. Unknown types are ignored.
+
+        Returns:
+            The identifiers of the removed types as list.
+        """
+        removed = []
+        for token in tokens:
+            id_ = self._token2id.pop(token, None)
+            if id_ is not None:
+                self._id2token[id_ - 1] = None
+                self.frequencies[id_ - 1] = 0
+                self.document_frequencies[id_ - 1] = 0
+                removed.append(id_)
+        return removed
+
+    def save(self, filepath):
+        """Writes the :class:`Vocabulary` to a binary file.
+
+        Types, identifiers and frequencies are stored as NumPy arrays in an \
+        uncompressed ``.npz`` file. Use :meth:`load()` or :func:`read_token2id()` \
+        to read it.
+
+        Args:
+            filepath (str): Path to the file, e.g. ``type_ids.npz``.
+
+        Returns:
+            None.
+
+        Example:
+            >>> import tempfile
+            >>> vocabulary = Vocabulary(['this', 'is', 'an', 'example'])
+            >>> with tempfile.NamedTemporaryFile(suffix='.npz') as tmpfile:
+            ...     vocabulary.save(tmpfile.name)
+            ...     dict(Vocabulary.load(tmpfile.name)) == dict(vocabulary)
+            True
+        """
+        ids = np.array([id_ for id_, token in enumerate(self._id2token, 1) if token is not None], dtype=np.int64)
+        blob, offsets = _encode_strings(self._id2token[id_ - 1] for id_ in ids)
+        with open(filepath, 'wb') as file:
+            np.savez(file, tokens=blob, offsets=offsets, ids=ids,
+                     frequencies=np.frombuffer(self.frequencies, dtype=np.int64),
+                     document_frequencies=np.frombuffer(self.document_frequencies, dtype=np.int64),
+                     next_id=self.next_id, num_documents=self.num_documents, frozen=self.frozen)
+        return None
+
+    def token(self, type_id):
+        """Returns the type of an identifier.
+
+        Raises:
+            KeyError, if there is no type with the identifier ``type_id``.
+        """
+        if 0 < type_id <= len(self._id2token) and self._id2token[type_id - 1] is not None:
+            return self._id2token[type_id - 1]
+        raise KeyError(type_id)
+
+    def update(self, tokenized_document):
+        """Counts the tokens of a document.
+
+        Types without identifier get one (unless the vocabulary is frozen, \
+        then they are ignored), and frequencies and document frequencies are \
+        updated.
+
+        Args:
+            tokenized_document (list): Iterable of tokens.
+
+        Returns:
+            A :class:`collections.Counter` with identifiers as keys and
+                frequencies in ``tokenized_document`` as values.
+        """
+        bag_of_words = Counter()
+        for token, frequency in Counter(tokenized_document).items():
+            id_ = self.add(token)
+            if id_ is not None:
+                bag_of_words[id_] = frequency
+                self.frequencies[id_ - 1] += frequency
+                self.document_frequencies[id_ - 1] += 1
+        self.num_documents += 1
+        return bag_of_words
+
+
+class _PartQueue:
+    """Hands the parts of a streamed file from a worker thread to the caller.
+
+    This private class is used by :func:`_read_files()` with ``streaming`` \
+    and ``workers``. A daemon thread reads the file with :meth:`parse()`, so \
+    the incremental parser of lxml stays in the thread that started it, and \
+    parses at most one part ahead of the caller. While it waits for the \
+    caller, it releases ``running``, so the threads of other files can parse. \
+    The caller gets the ``document`` from :meth:`document()`, an error raised \
+    while reading is raised there or while consuming the parts. Once the \
+    caller moves on to the next file, the queue is detached (:meth:`detach()`) \
+    and the rest of the file is parsed without waiting for the caller. If the \
+    caller closes the parts or stops reading (:meth:`close()`), the thread \
+    stops parsing.
+
+    Args:
+        file (str): Path to the file.
+        running (threading.Semaphore, optional): Limits the number of threads
+            parsing at the same time. Defaults to None.
+
+    Example:
+        >>> part_queue = _PartQueue('document.xml').start(lambda file: iter(['first', 'second']))
+        >>> list(part_queue.document())
+        ['first', 'second']
+    """
+
+    def __init__(self, file, running=None):
+        self.file = file
+        self._running = running
+        self._messages = queue.Queue()
+        self._slots = threading.Semaphore(1)
+        self._detached = threading.Event()
+        self._closed = threading.Event()
+
+    def close(self):
+        """Stops parsing the file.
+
+        Returns:
+            None.
+        """
+        self._closed.set()
+        self._slots.release()
+        return None
+
+    def detach(self):
+        """Lets the thread parse the rest of the file without waiting.
+
+        Returns:
+            None.
+        """
+        self._detached.set()
+        self._slots.release()
+        return None
+
+    def document(self):
+        """Waits for the ``document`` read by the thread.
+
+        Returns:
+            The ``document``, or an iterator over its parts.
+        """
+        kind, value = self._messages.get()
+        if kind == 'error':
+            raise value
+        elif kind == 'parts':
+            return self._parts()
+        return value
+
+    def parse(self, read_file):
+        """Reads the file and puts the ``document`` or its parts into the queue.
+
+        Args:
+            read_file (callable): A function reading a file, see :func:`_read_file()`.
+
+        Returns:
+            None.
+        """
+        if self._running is not None:
+            self._running.acquire()
+        try:
+            self._parse(read_file)
+        finally:
+            if self._running is not None:
+                self._running.release()
+        return None
+
+    def start(self, read_file):
+        """Starts a daemon thread calling :meth:`parse()`.
+
+        Args:
+            read_file (callable): A function reading a file, see :func:`_read_file()`.
+
+        Returns:
+            The :class:`_PartQueue`.
+        """
+        threading.Thread(target=self.parse, args=(read_file,), daemon=True).start()
+        return self
+
+    def _parse(self, read_file):
+        try:
+            document = read_file(self.file)
+        except Exception as error:
+            self._put('error', error)
+            return
+        if not isinstance(document, Iterator):
+            self._put('document', document)
+            return
+        self._put('parts', None)
+        try:
+            for part in document:
+                if not self._put('part', part):
+                    return
+        except Exception as error:
+            self._put('error', error)
+        else:
+            self._put('end', None)
+        finally:
+            if hasattr(document, 'close'):
+                document.close()
+
+    def _parts(self):
+        try:
+            while True:
+                kind, value = self._messages.get()
+                if kind == 'end':
+                    return
+                elif kind == 'error':
+                    raise value
+                self._slots.release()
+                yield value
+        finally:
+            self.close()
+
+    def _put(self, kind, value):
+        if kind == 'part' and not self._detached.is_set() and not self._slots.acquire(blocking=False):
+            if self._running is not None:
+                self._running.release()
+            self._slots.acquire()
+            if self._running is not None:
+                self._running.acquire()
+        if self._closed.is_set():
+            return False
+        self._messages.put((kind, value))
+        return True
+
+
+def _add_document_id(document_ids, document_label):
+    """Assigns the next document ID to a document label.
+
+    This private function is wrapped in the functions counting a corpus. If \
+    ``document_ids`` is a list, the labels of the rows of a small corpus model, \
+    every document gets its own ID, also if its label is not unique.
+
+    Args:
+        document_ids (dict): Document labels as keys and IDs as values, or a
+            list of document labels.
+        document_label (str): Label of the next document.
+
+    Returns:
+        The document ID.
+
+    Raises:
+        ValueError, if ``document_ids`` is a dict and ``document_label`` has
+            already an ID.
+
+    Example:
+        >>> document_ids = {'one': 1}
+        >>> _add_document_id(document_ids, 'two'), document_ids
+        (2, {'one': 1, 'two': 2})
+        >>> _add_document_id(document_ids, 'one')
+        Traceback (most recent call last):
+        ...
+        ValueError: Duplicate document label one: documents with the same label would be merged.
+        >>> document_labels = ['one']
+        >>> _add_document_id(document_labels, 'one'), document_labels
+        (2, ['one', 'one'])
+    """
+    if isinstance(document_ids, list):
+        document_ids.append(document_label)
+        return len(document_ids)
+    if document_label in document_ids:
+        raise ValueError("Duplicate document label {}: documents with the same label would be merged.".format(document_label))
+    document_id = document_ids[document_label] = len(document_ids) + 1
+    return document_id
+
+
+def _add_ngrams(tokenized_corpus, document_labels, ngram_range, max_ngrams=None):
+    """Adds n-grams to each document of a tokenized corpus.
 
+    This private function is wrapped in :func:`create_document_term_matrix()`. \
+    If ``max_ngrams`` is set, the most frequent n-grams are determined by \
+    :func:`top_ngrams()` in a first pass, and only these are added.
 
-def _create_large_corpus_model(tokenized_corpus, document_labels):
+    Args:
+        tokenized_corpus (list): Tokenized corpus as a list containing one or
+            more iterables containing tokens. If ``document_labels`` is None,
+            a list of ``(document_label, tokenized_document)`` pairs.
+        document_labels (list): Iterable of document labels, or None.
+        ngram_range (tuple): Smallest and largest ``n`` of n-grams.
+        max_ngrams (int, optional): Number of n-grams (with ``n`` larger than 1)
+            to add. Defaults to None, i.e. all.
+
+    Returns:
+        A generator of ``(document_label, tokenized_document)`` pairs.
+
+    Example:
+        >>> labeled_corpus = _add_ngrams([['a', 'b', 'a', 'b', 'c']], ['document'], (1, 2), 1)
+        >>> [(document_label, list(tokenized_document)) for document_label, tokenized_document in labeled_corpus]
+        [('document', ['a', 'b', 'a', 'b', 'c', 'a b', 'a b'])]
+    """
+    min_n, max_n = ngram_range
+    if document_labels is None:
+        documents = (tokenized_document for _, tokenized_document in _labeled_corpus(tokenized_corpus))
+    else:
+        documents = tokenized_corpus
+    selected = None
+    if max_ngrams is not None and max_n > 1:
+        if iter(tokenized_corpus) is tokenized_corpus:
+            raise ValueError("To select the most frequent n-grams, tokenized_corpus has to be iterated twice, "
+                             "but it is an iterator. Pass a list instead.")
+        selected = frozenset(top_ngrams(documents, (max(min_n, 2), max_n), max_ngrams))
+        log.info("Counting tokens and {} n-grams ...".format(len(selected)))
+    for document_label, tokenized_document in _labeled_corpus(tokenized_corpus, document_labels):
+        tokenized_document = list(tokenized_document)
+        ngrams = _ngrams(tokenized_document, (max(min_n, 2), max_n))
+        if selected is not None:
+            ngrams = (ngram for ngram in ngrams if ngram in selected)
+        yield document_label, chain(tokenized_document if min_n == 1 else [], ngrams)
+
+
+def _absolute_threshold(threshold, total):
+    """Converts a proportion to an absolute number.
+
+    This private function is used by :class:`CorpusStatistics`.
+
+    Args:
+        threshold (int or float): Absolute number (int) or proportion (float).
+        total (int): Number the proportion refers to.
+
+    Returns:
+        An absolute number.
+
+    Example:
+        >>> _absolute_threshold(0.5, 10), _absolute_threshold(3, 10)
+        (5.0, 3)
+    """
+    if isinstance(threshold, float):
+        return threshold * total
+    return threshold
+
+
+def _check_errors(errors):
+    """Checks the handling of files that cannot be read.
+
+    Args:
+        errors (str): Either ``raise`` or ``skip``.
+
+    Returns:
+        None.
+
+    Raises:
+        ValueError, if ``errors`` is not supported.
+    """
+    if errors not in {'raise', 'skip'}:
+        raise ValueError("Unable to handle unreadable files by {}, use 'raise' or 'skip'.".format(errors))
+
+
+def _corpus_statistics(document_term_matrix, type_ids=None):
+    """Returns :class:`CorpusStatistics` of a ``document_term_matrix``.
+
+    This private function is wrapped in :func:`find_hapax_legomena()` and \
+    :func:`find_stopwords()`. If ``document_term_matrix`` is already a \
+    :class:`CorpusStatistics`, it is returned as it is.
+    """
+    if isinstance(document_term_matrix, CorpusStatistics):
+        return document_term_matrix
+    return CorpusStatistics(document_term_matrix, type_ids)
+
+
+def _count_corpus(tokenized_corpus, document_labels=None, type_ids=None, pruning=None, unique_labels=True):
+    """Counts the types of each document.
+
+    This private function is wrapped in :func:`_create_large_corpus_model()` and \
+    :func:`_create_sparse_corpus_model()`. Documents are consumed one after \
+    another, type IDs are assigned by a :class:`Vocabulary` in the same pass, \
+    and the frequencies are appended to three aligned arrays of document IDs, \
+    type IDs and frequencies (also known as `coordinate format <https://en.wikipedia.org/wiki/Sparse_matrix#Coordinate_list_(COO)>`_). \
+    So, ``tokenized_corpus`` and each ``tokenized_document`` may be generators, \
+    only one document has to be in memory at a time. A :class:`TokenizedCorpus` \
+    is counted at once by :func:`_count_tokenized_corpus()` instead. Afterwards, \
+    types are pruned by :func:`_prune_types()`, and their entries are dropped.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens. If ``document_labels``
+            is None, an iterable of ``(document_label, tokenized_document)`` pairs.
+        document_labels (list, optional): Iterable of document labels. Defaults to None.
+        type_ids (Vocabulary, optional): :class:`Vocabulary` or :class:`HashingVocabulary`
+            to assign type IDs. Defaults to None, a new :class:`Vocabulary`.
+        pruning (dict, optional): Thresholds to prune types, keyword arguments
+            of :func:`_prune_types()`. Defaults to None.
+        unique_labels (bool, optional): If True, ``document_ids`` is a dict and
+            duplicate document labels raise a ValueError. Otherwise, it is the
+            list of document labels, one for each document. Defaults to True.
+
+    Returns:
+        ``document_ids``, ``type_ids``, and document IDs, type IDs and frequencies
+            as NumPy arrays.
+
+    Example:
+        >>> tokenized_corpus = [['this', 'is', 'this'], [], ['is', 'it']]
+        >>> document_ids, type_ids, *arrays = _count_corpus(tokenized_corpus, ['one', 'two', 'three'])
+        >>> document_ids, dict(type_ids)
+        ({'one': 1, 'two': 2, 'three': 3}, {'this': 1, 'is': 2, 'it': 3})
+        >>> [array.tolist() for array in arrays]
+        [[1, 1, 3, 3], [1, 2, 2, 3], [2, 1, 1, 1]]
+        >>> document_ids, type_ids, *arrays = _count_corpus(tokenized_corpus, ['one', 'two', 'three'], pruning={'min_tf': 2})
+        >>> dict(type_ids), [array.tolist() for array in arrays]
+        ({'this': 1, 'is': 2}, [[1, 1, 3], [1, 2, 2], [2, 1, 1]])
+    """
+    if isinstance(tokenized_corpus, TokenizedCorpus) and type_ids is None:
+        document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr = _count_tokenized_corpus(tokenized_corpus, document_labels, unique_labels)
+    else:
+        document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr = _count_documents(tokenized_corpus, document_labels, type_ids, unique_labels)
+    if pruning and any(threshold is not None for threshold in pruning.values()):
+        type_id_arr = _prune_types(type_ids, **pruning)[type_id_arr]
+        kept = type_id_arr > 0
+        document_id_arr, type_id_arr, frequency_arr = document_id_arr[kept], type_id_arr[kept], frequency_arr[kept]
+    return document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr
+
+
+def _count_documents(tokenized_corpus, document_labels=None, type_ids=None, unique_labels=True):
+    """Counts the types of each document, one document after another.
+
+    This private function is wrapped in :func:`_count_corpus()`.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens. If ``document_labels``
+            is None, an iterable of ``(document_label, tokenized_document)`` pairs.
+        document_labels (list, optional): Iterable of document labels. Defaults to None.
+        type_ids (Vocabulary, optional): :class:`Vocabulary` or :class:`HashingVocabulary`
+            to assign type IDs. Defaults to None, a new :class:`Vocabulary`.
+        unique_labels (bool, optional): See :func:`_count_corpus()`. Defaults
+            to True.
+
+    Returns:
+        ``document_ids``, ``type_ids``, and document IDs, type IDs and frequencies
+            as NumPy arrays.
+    """
+    document_ids = {} if unique_labels else []
+    if type_ids is None:
+        type_ids = Vocabulary()
+    document_id_arr = array('q')
+    type_id_arr = array('q')
+    frequency_arr = array('q')
+    for document_label, tokenized_document in _labeled_corpus(tokenized_corpus, document_labels):
+        log.debug("Counting {} ...".format(document_label))
+        document_id = _add_document_id(document_ids, document_label)
+        bag_of_words = type_ids.update(tokenized_document)
+        document_id_arr.extend(repeat(document_id, len(bag_of_words)))
+        type_id_arr.extend(bag_of_words.keys())
+        frequency_arr.extend(bag_of_words.values())
+    document_id_arr = np.frombuffer(document_id_arr, dtype=np.int64)
+    type_id_arr = np.frombuffer(type_id_arr, dtype=np.int64)
+    frequency_arr = np.frombuffer(frequency_arr, dtype=np.int64)
+    return document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr
+
+
+def _count_shard(shard, directory):
+    """Counts a shard of documents and writes the counts to disk.
+
+    This private function is wrapped in :func:`_create_sharded_corpus_model()` \
+    and runs in a worker process. The types of the shard are sorted \
+    alphabetically and get their rank as local type ID, so the vocabularies \
+    of all shards can be merged without loading them into memory.
+
+    Args:
+        shard (list): List of ``(document_id, tokenized_document)`` pairs.
+        directory (str): Path to the output directory of the shard.
+
+    Returns:
+        Path to the output directory.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     arrays = _load_arrays(_count_shard([(3, ['this', 'is', 'this'])], tmpdir))
+        ...     _decode_strings(arrays['types'], arrays['offsets']), arrays['type_ids'].tolist(), arrays['frequencies'].tolist()
+        (['is', 'this'], [2, 1], [2, 1])
+    """
+    document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr = _count_corpus(shard)
+    types = list(type_ids)
+    order = np.array(sorted(range(len(types)), key=types.__getitem__), dtype=np.int64)
+    ranks = np.zeros(len(types) + 1, dtype=np.int64)
+    ranks[order + 1] = np.arange(1, len(types) + 1)
+    blob, offsets = _encode_strings(types[n] for n in order)
+    _save_arrays(directory,
+                 types=blob, offsets=offsets,
+                 type_frequencies=np.frombuffer(type_ids.frequencies, dtype=np.int64)[order],
+                 document_frequencies=np.frombuffer(type_ids.document_frequencies, dtype=np.int64)[order],
+                 document_ids=np.array(list(document_ids), dtype=np.int64)[document_id_arr - 1],
+                 type_ids=ranks[type_id_arr],
+                 frequencies=frequency_arr)
+    return directory
+
+
+def _count_tokenized_corpus(tokenized_corpus, document_labels=None, unique_labels=True):
+    """Counts the types of each document of a :class:`TokenizedCorpus`.
+
+    This private function is wrapped in :func:`_count_corpus()`. All tokens \
+    are counted at once by sorting their identifiers, instead of looking up \
+    each token. Type IDs are assigned in order of first occurrence, and the \
+    entries of each document are ordered by first occurrence, too, so the \
+    result is the same as counting document after document.
+
+    Args:
+        tokenized_corpus (TokenizedCorpus): The corpus to count.
+        document_labels (list, optional): Iterable of document labels. Defaults
+            to None, the labels of ``tokenized_corpus``.
+        unique_labels (bool, optional): See :func:`_count_corpus()`. Defaults
+            to True.
+
+    Returns:
+        ``document_ids``, ``type_ids``, and document IDs, type IDs and frequencies
+            as NumPy arrays.
+
+    Example:
+        >>> tokenized_corpus = TokenizedCorpus.from_tokenized_corpus([['is', 'it'], [], ['this', 'is', 'this']], ['one', 'two', 'three'])
+        >>> document_ids, type_ids, *arrays = _count_tokenized_corpus(tokenized_corpus.remove(['it']))
+        >>> document_ids, dict(type_ids)
+        ({'one': 1, 'two': 2, 'three': 3}, {'is': 1, 'this': 2})
+        >>> [array.tolist() for array in arrays]
+        [[1, 3, 3], [1, 2, 1], [1, 2, 1]]
+    """
+    if document_labels is None:
+        document_labels = tokenized_corpus.document_labels
+    document_ids = {} if unique_labels else []
+    document_id_per_document = np.array([_add_document_id(document_ids, document_label)
+                                         for document_label in document_labels], dtype=np.int64)
+    lengths = tokenized_corpus.lengths()
+    if len(document_id_per_document) != len(lengths):
+        raise ValueError("{} document labels for {} documents.".format(len(document_id_per_document), len(lengths)))
+    corpus_type_ids, first_occurrences, inverse = np.unique(tokenized_corpus.tokens, return_index=True, return_inverse=True)
+    order = np.argsort(first_occurrences, kind='mergesort')
+    ranks = np.empty(len(order) + 1, dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    num_type_ids = len(order) + 1
+    keys = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths) * num_type_ids + ranks[inverse.ravel()]
+    entries, first_entries, frequency_arr = np.unique(keys, return_index=True, return_counts=True)
+    entry_order = np.argsort(first_entries, kind='mergesort')
+    entries, frequency_arr = entries[entry_order], frequency_arr[entry_order].astype(np.int64)
+    document_id_arr = document_id_per_document[entries // num_type_ids]
+    type_id_arr = entries % num_type_ids
+    type_ids = Vocabulary(tokenized_corpus.vocabulary.token(type_id) for type_id in corpus_type_ids[order].tolist())
+    type_ids.frequencies = array('q', np.bincount(type_id_arr, frequency_arr, num_type_ids)[1:].astype(np.int64).tobytes())
+    type_ids.document_frequencies = array('q', np.bincount(type_id_arr, minlength=num_type_ids)[1:].astype(np.int64).tobytes())
+    type_ids.num_documents = len(lengths)
+    return document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr
+
+
+def _create_large_corpus_model(tokenized_corpus, document_labels=None, type_ids=None, pruning=None):
     """Creates a document-term matrix for large corpora.
 
     This private function is wrapped in :func:`create_document_term_matrix()` and \
     creates a pandas DataFrame containing document and type IDs as MultiIndex \
     and type frequencies as values representing the counts of tokens for each \
-    token in each document.
+    token in each document. The frequencies are collected in flat arrays by \
+    :func:`_count_corpus()` and wrapped in one MultiIndex, instead of setting \
+    each value separately.
 
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable
             containing one or more iterables containing tokens.
-        document_labels (list): Iterable of document labels.
+        document_labels (list, optional): Iterable of document labels. If None,
+            ``tokenized_corpus`` has to contain ``(document_label, tokenized_document)``
+            pairs. Defaults to None.
+        type_ids (Vocabulary, optional): :class:`Vocabulary` or :class:`HashingVocabulary`
+            to assign type IDs. Defaults to None.
+        pruning (dict, optional): Thresholds to prune types, keyword arguments
+            of :func:`_prune_types()`. Defaults to None.
 
     Returns:
         A document-term matrix as pandas DataFrame, ``document_ids`` and ``type_ids``.
 
-    Todo:
-        * Make the whole function faster.
-
     Example:
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> document_term_matrix, document_ids, type_ids = _create_large_corpus_model(tokenized_corpus, document_labels)
-        >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, dict)
+        >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, Vocabulary)
         True
+        >>> int(document_term_matrix.loc[(document_ids['document_one'], type_ids['this']), 0])
+        1
     """
-    bag_of_words, document_ids, type_ids = _create_bag_of_words(document_labels, tokenized_corpus)
-    multi_index = _create_multi_index(bag_of_words)
-    document_term_matrix = pd.DataFrame(np.zeros((len(multi_index), 1), dtype=int), index=multi_index)
-    index_iterator = multi_index.groupby(multi_index.get_level_values('document_id'))
-
-    for document_id in range(1, len(multi_index.levels[0]) + 1):
-        for type_id in [val[1] for val in index_iterator[document_id]]:
-            document_term_matrix.set_value((document_id, type_id), 0, int(bag_of_words[document_id][type_id]))
+    log.info("Creating document-term matrix for large corpus ...")
+    document_ids, type_ids, document_id_arr, type_id_arr, frequency_arr = _count_corpus(tokenized_corpus, document_labels, type_ids, pruning)
+    document_term_matrix = _create_large_corpus_model_from_arrays(document_id_arr, type_id_arr, frequency_arr, len(document_ids))
     return document_term_matrix, document_ids, type_ids
 
 
-def _create_multi_index(bag_of_words):
+def _create_large_corpus_model_from_arrays(document_ids, type_ids, frequencies, num_documents):
+    """Creates a document-term matrix for large corpora from flat arrays.
+
+    This private function is wrapped in :func:`_create_large_corpus_model()`. \
+    An empty document is represented by type ID 0 with frequency 0.
+
+    Args:
+        document_ids (numpy.ndarray): Document ID of each entry, ordered by document.
+        type_ids (numpy.ndarray): Type ID of each entry.
+        frequencies (numpy.ndarray): Frequency of each entry.
+        num_documents (int): Number of documents.
+
+    Returns:
+        A document-term matrix as pandas DataFrame.
+
+    Example:
+        >>> document_term_matrix = _create_large_corpus_model_from_arrays(np.array([1, 1, 3]), np.array([1, 2, 2]), np.array([2, 1, 1]), 3)
+        >>> document_term_matrix.index.tolist(), document_term_matrix[0].tolist()
+        ([(1, 1), (1, 2), (2, 0), (3, 2)], [2, 1, 0, 1])
+    """
+    empty_documents = np.setdiff1d(np.arange(1, num_documents + 1), document_ids)
+    if len(empty_documents):
+        log.debug("Adding {} empty documents ...".format(len(empty_documents)))
+        document_ids = np.concatenate([document_ids, empty_documents])
+        order = np.argsort(document_ids, kind='mergesort')
+        document_ids = document_ids[order]
+        type_ids = np.concatenate([type_ids, np.zeros(len(empty_documents), dtype=type_ids.dtype)])[order]
+        frequencies = np.concatenate([frequencies, np.zeros(len(empty_documents), dtype=frequencies.dtype)])[order]
+    multi_index = _create_multi_index(document_ids, type_ids)
+    return pd.DataFrame(np.asarray(frequencies)[:, np.newaxis], index=multi_index)
+
+
+def _create_multi_index(document_ids, type_ids):
     """Creates a MultiIndex for a pandas DataFrame.
 
     This private function is wrapped in :func:`_create_large_corpus_model()`.
 
     Args:
-        bag_of_words (dict): A bag-of-words model of ``{document_id: {type_id: frequency}}``.
+        document_ids (numpy.ndarray): Document ID of each entry.
+        type_ids (numpy.ndarray): Type ID of each entry.
 
     Returns:
         Pandas MultiIndex.
 
     Example:
-        >>> bag_of_words = {1: {1: 2, 2: 3, 3: 4}}
-        >>> _create_multi_index(bag_of_words)
-        MultiIndex(levels=[[1], [1, 2, 3]],
-                   labels=[[0, 0, 0], [0, 1, 2]],
-                   names=['document_id', 'type_id'])
-    """
-    tuples = []
-    for document_id in range(1, len(bag_of_words) + 1):
-        if len(bag_of_words[document_id]) == 0:
-            tuples.append((document_id, 0))
-        for type_id in bag_of_words[document_id]:
-            tuples.append((document_id, type_id))
-    return pd.MultiIndex.from_tuples(tuples, names=['document_id', 'type_id'])
-
-
-def _create_small_corpus_model(tokenized_corpus, document_labels):
+        >>> multi_index = _create_multi_index(np.array([1, 1, 1]), np.array([1, 2, 3]))
+        >>> multi_index.names
+        FrozenList(['document_id', 'type_id'])
+        >>> multi_index.tolist()
+        [(1, 1), (1, 2), (1, 3)]
+    """
+    return pd.MultiIndex.from_arrays([document_ids, type_ids], names=['document_id', 'type_id'])
+
+
+def _create_sharded_corpus_model(tokenized_corpus, document_labels=None, shard_size=10000, processes=None,
+                                 matrix_market=None, tmpdir=None, pruning=None):
+    """Creates a document-term matrix for large corpora out-of-core.
+
+    This private function is wrapped in :func:`create_document_term_matrix()`. \
+    Documents are collected in shards of ``shard_size`` documents, which are \
+    counted by :func:`_count_shard()` in worker processes (at most two shards \
+    per process at the same time) and written to a temporary directory. \
+    Afterwards, the alphabetically sorted vocabularies of the shards are \
+    merged by :func:`_merge_shards()`, and the counts of the shards are \
+    translated to global type IDs, one shard after another.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens.
+        document_labels (list, optional): Iterable of document labels. If None,
+            ``tokenized_corpus`` has to contain ``(document_label, tokenized_document)``
+            pairs. Defaults to None.
+        shard_size (int, optional): Number of documents per shard. Defaults to 10000.
+        processes (int, optional): Number of worker processes. If None, the
+            number of CPUs will be used. If 1, shards will be counted in the
+            calling process. Defaults to None.
+        matrix_market (str, optional): Path to a Matrix Market file. If None,
+            a pandas DataFrame will be created. Defaults to None.
+        tmpdir (str, optional): Directory for the temporary shard files.
+            Defaults to None.
+        pruning (dict, optional): Thresholds to prune types after merging the
+            vocabularies, keyword arguments of :func:`_prune_types()`. Defaults to None.
+
+    Returns:
+        A document-term matrix as pandas DataFrame (or the path to the Matrix
+            Market file), ``document_ids`` and ``type_ids``.
+
+    Example:
+        >>> import tempfile
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], [], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'empty_document', 'document_two']
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepath = os.path.join(tmpdir, 'document_term_matrix.mm')
+        ...     _, document_ids, type_ids = _create_sharded_corpus_model(tokenized_corpus, document_labels, 2, 1, filepath)
+        ...     with open(filepath, 'r', encoding='utf-8') as file:
+        ...         file.read().split('\\n')[1:3]
+        ['3 5 8', '1 4 1']
+        >>> document_ids['document_two'], type_ids['this']
+        (3, 4)
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    log.info("Creating document-term matrix for large corpus in shards of {} documents with {} processes ...".format(shard_size, processes))
+    document_ids = {}
+    labeled_corpus = ((_add_document_id(document_ids, document_label), list(tokenized_document))
+                      for document_label, tokenized_document in _labeled_corpus(tokenized_corpus, document_labels))
+    directory = tempfile.mkdtemp(prefix='dariah_topics_', dir=tmpdir)
+    try:
+        shard_directories = []
+        shards = iter(lambda: list(islice(labeled_corpus, shard_size)), [])
+        if processes == 1:
+            for shard in shards:
+                shard_directories.append(_count_shard(shard, os.path.join(directory, str(len(shard_directories)))))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                pending = deque()
+                for shard in chain(shards, [None]):
+                    if shard is not None:
+                        shard_directory = os.path.join(directory, str(len(shard_directories) + len(pending)))
+                        pending.append(pool.apply_async(_count_shard, (shard, shard_directory)))
+                    while pending and (shard is None or len(pending) >= 2 * processes):
+                        shard_directories.append(pending.popleft().get())
+        log.info("Merging vocabularies of {} shards ...".format(len(shard_directories)))
+        type_ids = _merge_shards(shard_directories)
+        type_ids.num_documents = len(document_ids)
+        if pruning and any(threshold is not None for threshold in pruning.values()):
+            pruned_type_ids = _prune_types(type_ids, **pruning)
+        else:
+            pruned_type_ids = np.arange(type_ids.next_id, dtype=np.int64)
+
+        def blocks():
+            for shard_directory in shard_directories:
+                arrays = _load_arrays(shard_directory)
+                mapping = np.load(os.path.join(shard_directory, 'mapping.npy'), mmap_mode='r')
+                type_id_arr = pruned_type_ids[mapping[arrays['type_ids']]]
+                kept = type_id_arr > 0
+                yield arrays['document_ids'][kept], type_id_arr[kept], arrays['frequencies'][kept]
+
+        if matrix_market is not None:
+            num_entries = sum(len(block[2]) for block in blocks())
+            log.info("Writing {} entries to {} ...".format(num_entries, matrix_market))
+            _write_matrix_market(matrix_market, len(document_ids), len(type_ids), num_entries, blocks())
+            return matrix_market, document_ids, type_ids
+        document_id_arr, type_id_arr, frequency_arr = (np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+                                                        for arrays in zip(*blocks()))
+        document_term_matrix = _create_large_corpus_model_from_arrays(document_id_arr, type_id_arr, frequency_arr, len(document_ids))
+        return document_term_matrix, document_ids, type_ids
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _create_small_corpus_model(tokenized_corpus, document_labels=None, type_ids=None, pruning=None):
     """Creates a document-term matrix for small corpora.
 
     This private function is wrapped in :func:`create_document_term_matrix()`.
@@ -768,7 +3100,13 @@ def _create_small_corpus_model(tokenized_corpus, document_labels):
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable
             containing one or more iterables containing tokens.
-        document_labels (list): Name or label of each text file.
+        document_labels (list, optional): Name or label of each text file. If
+            None, ``tokenized_corpus`` has to contain ``(document_label, tokenized_document)``
+            pairs. Defaults to None.
+        type_ids (Vocabulary, optional): :class:`Vocabulary` or :class:`HashingVocabulary`
+            to assign type IDs. Defaults to None.
+        pruning (dict, optional): Thresholds to prune types, keyword arguments
+            of :func:`_prune_types()`. Defaults to None.
 
 
     Returns:
@@ -778,44 +3116,504 @@ def _create_small_corpus_model(tokenized_corpus, document_labels):
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> _create_small_corpus_model(tokenized_corpus, document_labels) #doctest: +NORMALIZE_WHITESPACE
-                      this   is  document  two  one
-        document_one   1.0  1.0       1.0  0.0  1.0
-        document_two   1.0  1.0       1.0  1.0  0.0
+                      this  is  document  one  two
+        document_one     1   1         1    1    0
+        document_two     1   1         1    0    1
+    """
+    return _create_sparse_corpus_model(tokenized_corpus, document_labels, type_ids, pruning).to_dataframe()
+
+
+def _create_sparse_corpus_model(tokenized_corpus, document_labels=None, type_ids=None, pruning=None):
+    """Creates a sparse document-term matrix for small corpora.
+
+    This private function is wrapped in :func:`create_document_term_matrix()` and \
+    :func:`_create_small_corpus_model()`. The matrix is built in one pass by \
+    :func:`_count_corpus()`, counting each document once, and converted to a \
+    compressed sparse row matrix. Afterwards, the columns are sorted by the \
+    frequency of the types in the corpus (types with equal frequencies keep the \
+    order of their first occurrence).
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens.
+        document_labels (list, optional): Name or label of each text file. If
+            None, ``tokenized_corpus`` has to contain ``(document_label, tokenized_document)``
+            pairs. Defaults to None.
+        type_ids (Vocabulary, optional): :class:`Vocabulary` or :class:`HashingVocabulary`
+            to assign type IDs. Defaults to None.
+        pruning (dict, optional): Thresholds to prune types, keyword arguments
+            of :func:`_prune_types()`. Defaults to None.
+
+    Returns:
+        Document-term matrix as :class:`SparseDocumentTermMatrix`.
+
+    Example:
+        >>> tokenized_corpus = [['this', 'is', 'a', 'document'], ['this', 'is', 'this']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> document_term_matrix = _create_sparse_corpus_model(tokenized_corpus, document_labels)
+        >>> document_term_matrix.columns.tolist()
+        ['this', 'is', 'a', 'document']
+        >>> document_term_matrix.sum().tolist()
+        [3, 2, 1, 1]
     """
     log.info("Creating document-term matrix for small corpus ...")
-    document_term_matrix = pd.DataFrame()
-    for tokenized_document, document_label in zip(tokenized_corpus, document_labels):
-        log.debug("Updating {} in document-term matrix ...".format(document_label))
-        current_document = pd.Series(Counter(tokenized_document))
-        current_document.name = document_label
-        document_term_matrix = document_term_matrix.append(current_document)
-    document_term_matrix = document_term_matrix.loc[:, document_term_matrix.sum().sort_values(ascending=False).index]
-    return document_term_matrix.fillna(0)
+    document_labels, type_ids, document_id_arr, type_id_arr, frequency_arr = _count_corpus(tokenized_corpus, document_labels, type_ids,
+                                                                                           pruning, unique_labels=False)
+    used_type_ids, columns = np.unique(type_id_arr, return_inverse=True)
+    matrix = csr_matrix((frequency_arr, (document_id_arr - 1, columns)), shape=(len(document_labels), len(used_type_ids)))
+    types = np.array([type_ids.token(type_id) for type_id in used_type_ids.tolist()], dtype=object)
+    order = np.argsort(-np.asarray(matrix.sum(axis=0)).ravel(), kind='mergesort')
+    return SparseDocumentTermMatrix(matrix[:, order], document_labels, types[order])
 
 
-def _hapax_legomena_large_corpus_model(document_term_matrix, type_ids):
-    """Determines hapax legomena in large corpus model.
+def _default_label(file):
+    """Returns the label of a file.
 
-    This private function is wrapped in :func:`find_hapax_legomena()`.
+    This private function is wrapped in :func:`_tokenize_files()` and \
+    :meth:`PreprocessingCache.tokenize_pathlist()`. The label is the file \
+    name without extension, so files with the same name in different \
+    directories get the same label.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
-        type_ids (dict): A dictionary with types as key and identifiers as values.
+        file (str): Path to the file.
 
     Returns:
-        Hapax legomena in a list.
+        The document label.
 
     Example:
-        >>> document_labels = ['document']
-        >>> tokenized_corpus = [['hapax', 'stopword', 'stopword']]
-        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
-        >>> find_hapax_legomena(document_term_matrix, type_ids)
-        ['hapax']
+        >>> _default_label('a/document.txt'), _default_label('b/document.txt')
+        ('document', 'document')
+    """
+    return os.path.splitext(os.path.basename(str(file)))[0]
+
+
+def _flat_segments(document, segment_size, tolerance):
+    """Segments a document and flattens the chunks of each segment.
+
+    This private function is wrapped in :func:`segment()`. Tokens of the chunks \
+    are collected in one buffer while :func:`segment_spans()` consumes their \
+    lengths, and each segment is sliced from the buffer once. Tokens of \
+    finished segments are dropped from time to time, so only a few chunks \
+    have to be in memory at a time.
+
+    Args:
+        document (list): Iterable of chunks, each of which is an iterable of tokens.
+        segment_size (int): The target length of each segment in tokens.
+        tolerance (float): Tolerance for the segment size, see :func:`segment_spans()`.
+
+    Yields:
+        Segments as lists of tokens.
+
+    Example:
+        >>> list(_flat_segments([['This', 'is', 'the', 'first'], ['chunk']], 2, 0))
+        [['This', 'is'], ['the', 'first'], ['chunk']]
+    """
+    buffer = []
+    def chunk_lengths():
+        for chunk in document:
+            length = len(buffer)
+            buffer.extend(chunk)
+            yield len(buffer) - length
+    dropped = 0
+    for start, end in segment_spans(chunk_lengths(), segment_size, tolerance):
+        yield buffer[start - dropped:end - dropped]
+        if end - dropped > max(len(buffer) // 2, 4096):
+            del buffer[:end - dropped]
+            dropped = end
+
+
+def _id2type(type_ids):
+    """Returns a function to look up the type of an identifier.
+
+    This private function is used by :class:`CorpusStatistics`. A :class:`Vocabulary` or \
+    :class:`HashingVocabulary` looks up types itself, a ``type_ids`` dictionary \
+    is inverted.
+
+    Args:
+        type_ids (dict): A dictionary with types as key and identifiers as values,
+            or a :class:`Vocabulary`.
+
+    Returns:
+        A function taking an identifier and returning its type.
+
+    Example:
+        >>> _id2type({'this': 1, 'example': 2})(2)
+        'example'
+    """
+    if hasattr(type_ids, 'token'):
+        return type_ids.token
+    return {id_: type_ for type_, id_ in type_ids.items()}.__getitem__
+
+
+def _init_tokenize_worker(pattern, lower):
+    """Compiles the regular expression for a worker process.
+
+    This private function is the initializer of the worker processes in \
+    :func:`tokenize_corpus()`.
+
+    Args:
+        pattern (str): Regular expression to match tokens.
+        lower (boolean): If True, lowers all characters.
+
+    Returns:
+        None.
+    """
+    global _worker_pattern, _worker_lower
+    _worker_pattern = regex.compile(pattern)
+    _worker_lower = lower
+
+
+def _iter_shard_types(directory):
+    """Yields the types of a shard in alphabetical order.
+
+    This private function is wrapped in :func:`_merge_shards()`. The types \
+    are decoded one by one from the memory-mapped string table.
+
+    Args:
+        directory (str): Path to the output directory of :func:`_count_shard()`.
+
+    Yields:
+        A type.
+    """
+    arrays = _load_arrays(directory)
+    types, offsets = arrays['types'], arrays['offsets']
+    for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        yield types[start:end].tobytes().decode('utf-8')
+
+
+def _iterparse_xml(filepath, xpath_expression):
+    """Parses a TEI XML file incrementally.
+
+    This private function is wrapped in :func:`_read_xml()`. The file is \
+    parsed by :func:`lxml.etree.iterparse()`, and the text of each element \
+    matching ``xpath_expression`` is yielded as soon as the element is \
+    complete. Afterwards, the element and everything before it is removed \
+    from the tree, so the memory needed depends on the size of the largest \
+    matching element, not on the size of the file. If matching elements are \
+    nested, only the outermost ones are yielded. Only XPath expressions \
+    matching elements by name anywhere in the file are supported, e.g. \
+    ``//tei:text``, ``//tei:div`` or ``//text`` (without namespace).
+
+    Args:
+        filepath (str): Path to XML file.
+        xpath_expression (str): XPath expression like ``//tei:div``.
+
+    Yields:
+        The text of a matching element.
+
+    Raises:
+        ValueError, if ``xpath_expression`` is not supported or uses a namespace
+            prefix other than ``tei``.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.xml') as tmpfile:
+        ...     tmpfile.write(b"<TEI xmlns='http://www.tei-c.org/ns/1.0'><teiHeader>Header</teiHeader>"
+        ...                   b"<div>First <hi>part</hi>.<div>Nested.</div></div><div>Second part.</div></TEI>") and True
+        ...     tmpfile.flush()
+        ...     list(_iterparse_xml(tmpfile.name, '//tei:div'))
+        True
+        ['First part.Nested.', 'Second part.']
+    """
+    match = regex.fullmatch(r'//(?:(\w+):)?([\w.-]+)', xpath_expression.strip())
+    if match is None:
+        raise ValueError("Unable to parse {} incrementally, only expressions like //tei:div are supported.".format(xpath_expression))
+    prefix, name = match.groups()
+    ns = dict(tei='http://www.tei-c.org/ns/1.0')
+    if prefix is not None and prefix not in ns:
+        raise ValueError("Unable to parse {} incrementally, the namespace prefix {} is unknown.".format(xpath_expression, prefix))
+    tag = '{{{}}}{}'.format(ns[prefix], name) if prefix else name
+    log.debug("Parsing {} matching parts of {} incrementally ...".format(xpath_expression, filepath))
+    depth = 0
+    for event, element in etree.iterparse(filepath, events=('start', 'end'), huge_tree=True):
+        if element.tag == tag:
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                yield ''.join(element.itertext())
+        if event == 'end' and depth == 0:
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def _labeled_corpus(tokenized_corpus, document_labels=None):
+    """Pairs the documents of a tokenized corpus with their labels.
+
+    This private function is wrapped in the functions counting a corpus. \
+    If ``document_labels`` is None, ``tokenized_corpus`` has to contain \
+    ``(document_label, tokenized_document)`` pairs, e.g. from :func:`stream_tokenized_corpus()`. \
+    Each item is checked, so a plain tokenized corpus is not mistaken for pairs.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable containing one
+            or more iterables containing tokens, or an iterable of ``(document_label, tokenized_document)``
+            pairs.
+        document_labels (list, optional): Iterable of document labels. Defaults to None.
+
+    Yields:
+        ``(document_label, tokenized_document)`` pairs.
+
+    Raises:
+        ValueError, if ``document_labels`` is None and an item is not a pair.
+
+    Example:
+        >>> list(_labeled_corpus([['new', 'york']], ['one']))
+        [('one', ['new', 'york'])]
+        >>> list(_labeled_corpus([('one', ['new', 'york'])]))
+        [('one', ['new', 'york'])]
+        >>> list(_labeled_corpus([['new', 'york'], ['big', 'apple']]))
+        Traceback (most recent call last):
+        ...
+        ValueError: Without document_labels, tokenized_corpus has to contain (document_label, tokenized_document) pairs, but got a list.
+    """
+    if document_labels is not None:
+        yield from zip(document_labels, tokenized_corpus)
+        return
+    for item in tokenized_corpus:
+        if not isinstance(item, tuple) or len(item) != 2 or isinstance(item[1], str):
+            raise ValueError("Without document_labels, tokenized_corpus has to contain (document_label, tokenized_document) "
+                             "pairs, but got a {}.".format(type(item).__name__))
+        yield item
+
+
+def _merge_shards(directories):
+    """Merges the vocabularies of shards.
+
+    This private function is wrapped in :func:`_create_sharded_corpus_model()`. \
+    The alphabetically sorted types of all shards are merged like in merge \
+    sort, so only one type per shard has to be in memory besides the \
+    resulting :class:`Vocabulary`. For each shard, a mapping from its local \
+    type IDs to the global ones is written to ``mapping.npy`` in its directory.
+
+    Args:
+        directories (list): Paths to the output directories of :func:`_count_shard()`.
+
+    Returns:
+        A :class:`Vocabulary` with type IDs in alphabetical order of the types.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     directories = [_count_shard([(1, ['b', 'c', 'c'])], os.path.join(tmpdir, '0')),
+        ...                    _count_shard([(2, ['c', 'a'])], os.path.join(tmpdir, '1'))]
+        ...     type_ids = _merge_shards(directories)
+        ...     np.load(os.path.join(directories[1], 'mapping.npy')).tolist()
+        [0, 1, 3]
+        >>> dict(type_ids), list(type_ids.frequencies)
+        ({'a': 1, 'b': 2, 'c': 3}, [1, 1, 3])
+    """
+    type_ids = Vocabulary()
+    mappings = []
+    for directory in directories:
+        num_types = len(np.load(os.path.join(directory, 'offsets.npy'), mmap_mode='r')) - 1
+        mapping = np.lib.format.open_memmap(os.path.join(directory, 'mapping.npy'), mode='w+', dtype=np.int64, shape=(num_types + 1,))
+        mapping[0] = 0
+        mappings.append(mapping)
+    shard_types = (zip(_iter_shard_types(directory), repeat(n), count(1)) for n, directory in enumerate(directories))
+    for token, n, local_id in heapq.merge(*shard_types):
+        mappings[n][local_id] = type_ids.add(token)
+    frequencies = np.zeros(len(type_ids) + 1, dtype=np.int64)
+    document_frequencies = np.zeros(len(type_ids) + 1, dtype=np.int64)
+    for directory, mapping in zip(directories, mappings):
+        mapping.flush()
+        arrays = _load_arrays(directory)
+        np.add.at(frequencies, mapping[1:], arrays['type_frequencies'])
+        np.add.at(document_frequencies, mapping[1:], arrays['document_frequencies'])
+    type_ids.frequencies = array('q', frequencies[1:].tobytes())
+    type_ids.document_frequencies = array('q', document_frequencies[1:].tobytes())
+    return type_ids
+
+
+def _ngrams(tokenized_document, ngram_range):
+    """Yields the n-grams of a tokenized document.
+
+    Args:
+        tokenized_document (list): List of tokens.
+        ngram_range (tuple): Smallest and largest ``n`` of n-grams.
+
+    Yields:
+        First all n-grams with the smallest ``n``, then with the next ``n``,
+            etc., tokens separated by a space.
+
+    Example:
+        >>> list(_ngrams(['this', 'is', 'an', 'example'], (1, 2)))
+        ['this', 'is', 'an', 'example', 'this is', 'is an', 'an example']
+    """
+    min_n, max_n = ngram_range
+    for n in range(min_n, max_n + 1):
+        if n == 1:
+            yield from tokenized_document
+        else:
+            yield from map(' '.join, zip(*(islice(tokenized_document, k, None) for k in range(n))))
+
+
+def _parts_until_unreadable(file, parts):
+    """Yields the parts of a streamed document until one cannot be read.
+
+    This private function is wrapped in :func:`_read_parts()`.
+
+    Args:
+        file (str): Path to the file.
+        parts (iterator): The parts of the ``document``.
+
+    Yields:
+        The parts before the first one that cannot be read.
+    """
+    try:
+        yield from parts
+    except _UNREADABLE as error:
+        log.error("Skipping the rest of {}, because it cannot be read: {}".format(file, error))
+
+
+def _prefetch(function, items, workers, prefetch=None):
+    """Applies a function to items in a thread pool, reading ahead.
+
+    This private function is wrapped in :func:`_read_files()`. At most \
+    ``prefetch`` items are submitted to the pool at the same time, and the \
+    results are yielded in the order of ``items`` as futures, so the caller \
+    decides how to handle exceptions.
+
+    Args:
+        function (callable): A one-argument function.
+        items (list): Iterable of arguments for ``function``.
+        workers (int): Number of threads.
+        prefetch (int, optional): Maximum number of submitted items. Defaults
+            to None, twice the number of ``workers``.
+
+    Yields:
+        ``(item, future)`` pairs.
+
+    Example:
+        >>> [future.result() for _, future in _prefetch(len, ['a', 'bb', 'ccc'], workers=2, prefetch=1)]
+        [1, 2, 3]
+    """
+    if prefetch is None:
+        prefetch = 2 * workers
+    items = iter(items)
+    executor = ThreadPoolExecutor(workers)
+    pending = deque()
+    try:
+        pending.extend((item, executor.submit(function, item)) for item in islice(items, max(prefetch, 1)))
+        while pending:
+            item, future = pending.popleft()
+            for next_item in islice(items, 1):
+                pending.append((next_item, executor.submit(function, next_item)))
+            yield item, future
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _prune_types(type_ids, min_df=None, max_df=None, min_tf=None, keep_n=None):
+    """Prunes types by their frequencies.
+
+    This private function is wrapped in :func:`_count_corpus()` and \
+    :func:`_create_sharded_corpus_model()`, and uses the frequencies counted \
+    by ``type_ids``. Pruned types are removed from a :class:`Vocabulary`, \
+    which is compacted afterwards. A :class:`HashingVocabulary` keeps its \
+    identifiers.
+
+    Args:
+        type_ids (Vocabulary): :class:`Vocabulary` or :class:`HashingVocabulary`.
+        min_df (int or float, optional): Minimum document frequency, as number
+            of documents (int) or proportion of all documents (float). Defaults to None.
+        max_df (int or float, optional): Maximum document frequency, as number
+            of documents (int) or proportion of all documents (float). Defaults to None.
+        min_tf (int, optional): Minimum frequency in the corpus. Defaults to None.
+        keep_n (int, optional): Maximum number of types, the most frequent are
+            kept. Defaults to None.
+
+    Returns:
+        A NumPy array mapping each former type ID (as position) to the new one,
+            or to 0 if the type has been pruned.
+
+    Example:
+        >>> type_ids = Vocabulary()
+        >>> _ = type_ids.update(['this', 'is', 'this']), type_ids.update(['this', 'example'])
+        >>> _prune_types(type_ids, max_df=1, keep_n=1).tolist()
+        [0, 0, 1, 0]
+        >>> dict(type_ids)
+        {'is': 1}
+    """
+    frequencies = np.frombuffer(type_ids.frequencies, dtype=np.int64)
+    document_frequencies = np.frombuffer(type_ids.document_frequencies, dtype=np.int64)
+    keep = frequencies > 0
+    if min_df is not None:
+        keep &= document_frequencies >= _absolute_threshold(min_df, type_ids.num_documents)
+    if max_df is not None:
+        keep &= document_frequencies <= _absolute_threshold(max_df, type_ids.num_documents)
+    if min_tf is not None:
+        keep &= frequencies >= min_tf
+    candidates = np.flatnonzero(keep)
+    if keep_n is not None and len(candidates) > keep_n:
+        keep[:] = False
+        keep[candidates[np.argsort(-frequencies[candidates], kind='mergesort')[:keep_n]]] = True
+    log.info("Pruning {} of {} types ...".format(int((frequencies > 0).sum() - keep.sum()), int((frequencies > 0).sum())))
+    if isinstance(type_ids, HashingVocabulary):
+        return np.concatenate([[0], np.where(keep, np.arange(1, len(keep) + 1), 0)])
+    type_ids.prune([type_ids.token(type_id) for type_id in (np.flatnonzero(~keep & (frequencies > 0)) + 1).tolist()])
+    return type_ids.compact()
+
+
+def _qualified_name(function):
+    """Returns the module and qualified name of a function, or None.
+
+    This private function is used by :class:`PreprocessingCache` to key entries \
+    on a ``chunker``.
+
+    Example:
+        >>> _qualified_name(split_paragraphs)
+        'dariah_topics.preprocessing.split_paragraphs'
+    """
+    if function is None:
+        return None
+    return '{}.{}'.format(getattr(function, '__module__', None), getattr(function, '__qualname__', repr(function)))
+
+
+def _read_binary_document_term_matrix(directory, mmap_mode='r'):
+    """Reads a document-term matrix from binary files.
+
+    This private function is wrapped in :func:`read_document_term_matrix()` \
+    and reads the files written by :func:`postprocessing.save_document_term_matrix()` \
+    with ``binary=True``. The frequencies are not copied, but stay memory-mapped.
+
+    Args:
+        directory (str): Path to the directory ``document_term_matrix``.
+        mmap_mode (str, optional): Memory-map the arrays, see :func:`numpy.load()`.
+            Defaults to ``r``.
+
+    Returns:
+        A document-term matrix as pandas DataFrame, or :class:`SparseDocumentTermMatrix`.
+
+    Example:
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing
+        >>> tokenized_corpus = [['this', 'is', 'this'], ['is', 'it']]
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, ['one', 'two'], sparse=True)
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     postprocessing.save_document_term_matrix(document_term_matrix, tmpdir, binary=True)
+        ...     _read_binary_document_term_matrix(os.path.join(tmpdir, 'document_term_matrix')).to_dataframe() #doctest: +NORMALIZE_WHITESPACE
+             this  is  it
+        one     2   1   0
+        two     0   1   1
     """
-    id2type = {id_: type_ for type_, id_ in type_ids.items()}
-    document_term_matrix_collapsed = document_term_matrix.groupby(document_term_matrix.index.get_level_values('type_id')).sum()
-    hapax_legomena = document_term_matrix_collapsed.loc[document_term_matrix_collapsed[0] == 1]
-    return [id2type[token] for token in hapax_legomena.index.get_level_values('type_id')]
+    with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    arrays = _load_arrays(directory, mmap_mode)
+    log.info("Reading {} document-term matrix with shape {} ...".format(manifest['variant'], tuple(manifest['shape'])))
+    if manifest['variant'] == 'large':
+        multi_index = _create_multi_index(arrays['document_id'], arrays['type_id'])
+        return pd.DataFrame(arrays['frequency'][:, np.newaxis], index=multi_index, copy=False)
+    index = _decode_strings(arrays['index'], arrays['index_offsets'])
+    columns = _decode_strings(arrays['columns'], arrays['columns_offsets'])
+    if manifest['variant'] == 'sparse':
+        matrix = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(manifest['shape']))
+        return SparseDocumentTermMatrix(matrix, index, np.array(columns, dtype=object))
+    return pd.DataFrame(arrays['values'], index=index, columns=columns, copy=False)
 
 
 def _read_csv(filepath, sep, columns):
@@ -853,6 +3651,204 @@ def _read_csv(filepath, sep, columns):
     return pd.read_csv(filepath, sep=sep, quoting=csv.QUOTE_NONE, usecols=columns)
 
 
+def _read_dkpro(filepath, pos_tags, lemma=True, sep='\t', chunksize=100000):
+    """Reads lemmas or tokens with selected POS-tags from a CSV file.
+
+    This private function is wrapped in :func:`stream_dkpro_corpus()`. Each \
+    chunk is filtered by the codes of its categorical columns, and only the \
+    selected lemmas or tokens are kept as strings.
+
+    Args:
+        filepath (str): Path to CSV file.
+        pos_tags (list): List of desired POS-tags.
+        lemma (bool, optional): If True, lemmas will be selected, otherwise tokens.
+            Defaults to True.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
+        chunksize (int, optional): Number of rows read at once. Defaults to 100000.
+
+    Returns:
+        A ``tokenized_document`` as list.
+    """
+    column = 'Lemma' if lemma else 'Token'
+    log.debug("Reading columns {} and CPOS of {} ...".format(column, filepath))
+    reader = pd.read_csv(filepath, sep=sep, quoting=csv.QUOTE_NONE, usecols=[column, 'CPOS'],
+                         dtype={column: 'category', 'CPOS': 'category'}, na_filter=False, chunksize=chunksize)
+    tokenized_document = []
+    with reader:
+        for chunk in reader:
+            tags, tokens = chunk['CPOS'].array, chunk[column].array
+            selected = np.isin(tags.codes, np.flatnonzero(tags.categories.isin(pos_tags)))
+            categories = np.asarray(tokens.categories, dtype=object)
+            tokenized_document.extend(categories[tokens.codes[selected]].tolist())
+    return tokenized_document
+
+
+def _read_file(file, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None, streaming=False):
+    """Reads a file based on its format or extension.
+
+    This private function is wrapped in :func:`_read_files()`.
+
+    Args:
+        file (str): Path to the file.
+        file_format (str, optional): Format of the file. Defaults to None.
+        xpath_expression (str, optional): XPath expressions to match part of the
+            XML file. Defaults to ``//tei:text``.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
+        csv_columns (list, optional): Column name or names for CSV files. Defaults to None.
+        streaming (bool, optional): If True, XML files are parsed incrementally.
+            Defaults to False.
+
+    Returns:
+        A ``document`` or ``dkpro_document``, or None if the file format is
+            not supported and ``file_format`` is None.
+
+    Raises:
+        ValueError, if ``file_format`` is not supported.
+    """
+    _, extension = os.path.splitext(file)
+    if file_format == 'text' or extension == '.txt':
+        return _read_txt(file)
+    elif file_format == 'xml' or extension == '.xml':
+        return _read_xml(file, xpath_expression, streaming)
+    elif file_format == 'csv' or extension == '.csv':
+        return _read_csv(file, sep, csv_columns)
+    elif file_format is None:
+        log.error("Skipping {}, because the file format {} is not supported.".format(file, extension))
+        return None
+    else:
+        raise ValueError("Unable to read {}, because the file format {} is not supported.".format(file, file_format))
+
+
+def _read_files(pathlist, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None,
+                workers=None, prefetch=None, streaming=False, errors='raise'):
+    """Reads files based on a pathlist.
+
+    This private function is wrapped in :func:`read_from_pathlist()` and \
+    :func:`stream_tokenized_corpus()`. With ``workers``, files are read by \
+    :func:`_prefetch()`, or, with ``streaming``, each by the thread of a \
+    :class:`_PartQueue`. A file that cannot be read (it is missing, not UTF-8 \
+    encoded or not well-formed XML) raises an error or, if ``errors`` is \
+    ``skip``, is logged and skipped, with or without ``workers``. So the \
+    position in ``pathlist`` is yielded, too. Other errors, e.g. for an \
+    unsupported ``file_format``, are always raised.
+    With ``streaming``, XML files are parsed up to their first part here, \
+    and lazily while the caller consumes the parts afterwards, so only a few \
+    parts of a file are held in memory. A file that is not XML at all is \
+    handled like any unreadable file, see :func:`_read_parts()` for a parse \
+    error later in the file. The incremental parser of lxml must stay in the \
+    thread that started it, so with ``workers``, each file is parsed by one \
+    thread and its parts are handed over by a :class:`_PartQueue`. At most \
+    ``workers`` of these threads parse at the same time.
+
+    Args:
+        pathlist (list): One or more paths to text files.
+        file_format (str, optional): Format of the files. Defaults to None.
+        xpath_expression (str, optional): XPath expressions to match part of the
+            XML file. Defaults to ``//tei:text``.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
+        csv_columns (list, optional): Column name or names for CSV files. Defaults to None.
+        workers (int, optional): Number of threads. Defaults to None.
+        prefetch (int, optional): Maximum number of files read ahead. Defaults to None.
+        streaming (bool, optional): If True, XML files are parsed incrementally.
+            Defaults to False.
+        errors (str, optional): Either ``raise`` or ``skip``. Defaults to ``raise``.
+
+    Yields:
+        ``(n, file, document)`` triples, with ``n`` the position of ``file``
+            in ``pathlist``.
+
+    Raises:
+        ValueError, if ``errors`` is not supported.
+    """
+    _check_errors(errors)
+    if hasattr(pathlist, '__len__'):
+        log.info("Reading {} files ...".format(len(pathlist)))
+    read_file = partial(_read_file, file_format=file_format, xpath_expression=xpath_expression,
+                        sep=sep, csv_columns=csv_columns, streaming=streaming)
+    if workers is None:
+        for n, file in enumerate(pathlist):
+            log.debug("File #{}".format(n))
+            try:
+                document = _read_parts(file, read_file(file), errors)
+            except _UNREADABLE as error:
+                _skip_unreadable(file, error, errors)
+                continue
+            if document is not None:
+                yield n, file, document
+        return
+
+    log.info("Reading with {} threads ...".format(workers))
+    if not streaming:
+        for n, (file, future) in enumerate(_prefetch(read_file, pathlist, workers, prefetch)):
+            try:
+                document = _read_parts(file, future.result(), errors)
+            except _UNREADABLE as error:
+                _skip_unreadable(file, error, errors)
+                continue
+            if document is not None:
+                yield n, file, document
+        return
+
+    if prefetch is None:
+        prefetch = 2 * workers
+    files = iter(pathlist)
+    running = threading.Semaphore(workers)
+    part_queues = deque(_PartQueue(file, running).start(read_file) for file in islice(files, max(prefetch, 1)))
+    n = -1
+    try:
+        while part_queues:
+            n += 1
+            part_queue = part_queues[0]
+            part_queues.extend(_PartQueue(file, running).start(read_file) for file in islice(files, 1))
+            try:
+                document = _read_parts(part_queue.file, part_queue.document(), errors)
+            except _UNREADABLE as error:
+                _skip_unreadable(part_queue.file, error, errors)
+                part_queues.popleft()
+                continue
+            if document is not None:
+                yield n, part_queue.file, document
+            part_queues.popleft().detach()
+    finally:
+        for part_queue in part_queues:
+            part_queue.close()
+
+
+def _read_parts(file, document, errors='raise'):
+    """Parses the first part of a streamed document.
+
+    This private function is wrapped in :func:`_read_files()`, with and \
+    without ``workers``. If ``document`` is an iterator, e.g. with \
+    ``streaming``, only its first part is parsed here, so an unreadable file \
+    fails before it is yielded. The other parts are parsed lazily by the \
+    caller. If one of them cannot be read, the error is raised, or, if \
+    ``errors`` is ``skip``, logged and the rest of the file is skipped.
+
+    Args:
+        file (str): Path to the file.
+        document: The ``document`` read from ``file``, or an iterator over
+            its parts.
+        errors (str, optional): Either ``raise`` or ``skip``. Defaults to ``raise``.
+
+    Returns:
+        The ``document``, or an iterator over its parts.
+
+    Example:
+        >>> def parse(text):
+        ...     yield from text.split()
+        ...     raise UnicodeDecodeError('utf-8', b'', 0, 1, 'broken')
+        >>> parts = _read_parts('document.xml', parse('first second'), errors='skip')
+        >>> isinstance(parts, Iterator), list(parts)
+        (True, ['first', 'second'])
+    """
+    if isinstance(document, Iterator):
+        first_part = list(islice(document, 1))
+        if errors == 'skip':
+            document = _parts_until_unreadable(file, document)
+        return chain(first_part, document)
+    return document
+
+
 def _read_txt(filepath):
     """Reads a plain text file based on its path.
 
@@ -878,7 +3874,7 @@ def _read_txt(filepath):
         return document.read()
 
 
-def _read_xml(filepath, xpath_expression):
+def _read_xml(filepath, xpath_expression, streaming=False):
     """Reads a TEI XML file based on its path.
     
     This private function is wrapped in `read_from_pathlist()`.
@@ -886,10 +3882,13 @@ def _read_xml(filepath, xpath_expression):
     Args:
         filepath (str): Path to XML file.
         xpath_expression (str): XPath expressions to match part of the XML file.
+        streaming (bool, optional): If True, the file is parsed incrementally
+            by :func:`_iterparse_xml()`. Defaults to False.
     
     Returns:
         Either a ``document`` as str or a list of all parts of the ``document``,
-            e. g. chapters of a novel.
+            e. g. chapters of a novel. If ``streaming`` is True, a generator
+            of all parts.
     
     Example:
         >>> import tempfile
@@ -900,6 +3899,8 @@ def _read_xml(filepath, xpath_expression):
         True
         'This is a XML example.'
     """
+    if streaming:
+        return _iterparse_xml(filepath, xpath_expression)
     log.debug("Reading {} matching part or parts of {} ...".format(xpath_expression, filepath))
     ns = dict(tei='http://www.tei-c.org/ns/1.0')
     tree = etree.parse(filepath)
@@ -930,8 +3931,10 @@ def _remove_features_from_large_corpus_model(document_term_matrix, type_ids, fea
         >>> len(_remove_features_from_large_corpus_model(document_term_matrix, type_ids, ['token']))
         1
     """
-    features = [token for token in set(type_ids.keys()) if token in features]
-    return document_term_matrix.drop([type_ids[token] for token in features], level='type_id')
+    if not isinstance(type_ids, HashingVocabulary):
+        features = [token for token in features if token in type_ids]
+    features = list({type_ids[token] for token in features})
+    return document_term_matrix.drop(features, level='type_id')
 
 
 def _remove_features_from_small_corpus_model(document_term_matrix, features):
@@ -940,11 +3943,13 @@ def _remove_features_from_small_corpus_model(document_term_matrix, features):
     This private function is wrapped in :func:`remove_features()`.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
+        document_term_matrix (pandas.DataFrame): A document-term matrix, either
+            as pandas DataFrame or :class:`SparseDocumentTermMatrix`.
         features (list): A list of tokens.
 
     Returns:
-        A clean document-term matrix as pandas DataFrame.
+        A clean document-term matrix as pandas DataFrame or :class:`SparseDocumentTermMatrix`,
+            respectively.
 
     Example:
         >>> document_labels = ['document']
@@ -952,7 +3957,7 @@ def _remove_features_from_small_corpus_model(document_term_matrix, features):
         >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
         >>> _remove_features_from_small_corpus_model(document_term_matrix, ['token']) #doctest: +NORMALIZE_WHITESPACE
                   stopword
-        document       2.0
+        document         2
 
     """
     features = [token for token in features if token in document_term_matrix.columns]
@@ -962,12 +3967,13 @@ def _remove_features_from_small_corpus_model(document_term_matrix, features):
 def _remove_features_from_tokenized_document(tokenized_document, features):
     """Removes features from a tokenized document.
 
-    This private function is wrapped in :func:`remove_features()`.
+    This private function is wrapped in :func:`remove_features()`, which \
+    passes ``features`` as set. Otherwise, a set is created for each call.
 
     Args:
         tokenized_document (list): The tokenized document to process. This is an iterable of
             tokens.
-        features (list): An iterable of tokens.
+        features (set): A set (or iterable) of tokens.
 
     Returns:
         A clean tokenized document as list.
@@ -978,56 +3984,111 @@ def _remove_features_from_tokenized_document(tokenized_document, features):
         >>> _remove_features_from_tokenized_document(tokenized_document, features)
         ['token']
     """
-    tokenized_document_arr = np.array(tokenized_document)
-    features_arr = np.array(features)
-    indices = np.where(np.in1d(tokenized_document_arr, features_arr))
-    return np.delete(tokenized_document_arr, indices).tolist()
+    if not isinstance(features, (set, frozenset)):
+        features = set(features)
+    return [token for token in tokenized_document if token not in features]
 
 
-def _stopwords_large_corpus_model(document_term_matrix, type_ids, most_frequent_tokens):
-    """Determines stopwords in large corpus model.
+def _segment_label(document_label, number):
+    """Returns the label of the ``number``-th segment of a document.
 
-    This private function is wrapped in :func:`find_stopwords()`.
+    Example:
+        >>> _segment_label('document', 1)
+        'document_0001'
+    """
+    return '{}_{:04d}'.format(document_label, number)
+
+
+def _skip_unreadable(file, error, errors):
+    """Logs and skips a file that cannot be read, or raises the error.
+
+    This private function is wrapped in :func:`_read_files()` and \
+    :func:`stream_dkpro_corpus()`, so both handle unreadable files alike.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
-        type_ids (dict): A dictionary with types as key and identifiers as values.
-        most_frequent_tokens (int, optional): Treshold for most frequent tokens.
+        file (str): Path to the file.
+        error (Exception): The error raised while reading ``file``.
+        errors (str): Either ``raise`` or ``skip``.
 
     Returns:
-        Most frequent tokens in a list.
+        None.
+
+    Raises:
+        ``error``, unless ``errors`` is ``skip``.
+    """
+    if errors != 'skip':
+        raise error
+    log.error("Skipping {}, because it cannot be read: {}".format(file, error))
+
+
+def _single_chunk(document):
+    """Returns the whole ``document`` as one chunk.
+
+    This private function is the default chunker of :func:`stream_tokenized_corpus()`.
 
     Example:
-        >>> document_labels = ['document']
-        >>> tokenized_corpus = [['hapax', 'stopword', 'stopword']]
-        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
-        >>> find_stopwords(document_term_matrix, 1, type_ids)
-        ['stopword']
+        >>> _single_chunk('This is a document.')
+        ['This is a document.']
     """
-    id2type = {id_: type_ for type_, id_ in type_ids.items()}
-    document_term_matrix_collapsed = document_term_matrix.groupby(document_term_matrix.index.get_level_values('type_id')).sum()
-    stopwords = document_term_matrix_collapsed[0].nlargest(most_frequent_tokens)
-    return [id2type[token] for token in stopwords.index.get_level_values('type_id')]
+    return [document]
 
 
-def _token2id(tokens):
-    """Creates a dictionary of tokens as keys and identifier as keys.
+def _tokenize_files(pathlist, document_labels=None, file_format=None, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True,
+                    segment_size=None, tolerance=0.05, chunker=None, **kwargs):
+    """Reads, tokenizes and segments files one after another.
 
-    This private function is wrapped in :func:`_create_largecounter()`.
+    This private function is wrapped in :func:`stream_tokenized_corpus()` and \
+    :meth:`PreprocessingCache.tokenize_pathlist()`. Takes the same arguments \
+    as :func:`stream_tokenized_corpus()`, but yields the pairs of each file \
+    separately, together with its position in ``pathlist``. Files that cannot \
+    be read are handled by :func:`_read_files()` according to ``errors``.
+
+    Yields:
+        ``(n, labeled_segments)`` pairs, with ``labeled_segments`` an iterator
+            of ``(document_label, tokenized_document)`` pairs of the file at
+            position ``n``.
+    """
+    compiled_pattern = regex.compile(pattern)
+    tokenizer = partial(tokenize, pattern=compiled_pattern, lower=lower)
+    if document_labels is not None:
+        document_labels = iter(document_labels)
+    position = 0
+    for n, file, document in _read_files(pathlist, file_format, **kwargs):
+        if document_labels is None:
+            document_label = _default_label(file)
+        else:
+            document_label = next(islice(document_labels, n - position, None))
+            position = n + 1
+        if isinstance(document, pd.DataFrame):
+            raise ValueError("Unable to tokenize {}, because CSV files are not supported.".format(document_label))
+        elif isinstance(document, list):
+            document = '\n'.join(document)
+        if isinstance(document, Iterator):
+            chunks = chain.from_iterable(map(chunker or _single_chunk, document))
+        else:
+            chunks = (chunker or _single_chunk)(document)
+        if segment_size is None:
+            yield n, iter([(document_label, chain.from_iterable(map(tokenizer, chunks)))])
+        else:
+            yield n, segment(chunks, segment_size, tolerance, tokenizer=tokenizer, materialize=False,
+                             document_label=document_label)
+
+
+def _tokenize_chunk(chunk):
+    """Tokenizes a chunk of documents in a worker process.
+
+    This private function is wrapped in :func:`tokenize_corpus()` and uses the \
+    regular expression compiled by :func:`_init_tokenize_worker()`.
 
     Args:
-        tokens (list): Iterable of tokens.
+        chunk (list): List of ``document`` (str).
 
     Returns:
-        A dictionary.
+        A list of ``tokenized_document`` as lists.
 
     Example:
-        >>> _token2id(['token'])
-        {'token': 1}
-        >>> _token2id([['token']])
-        {'token': 1}
-    """
-    log.debug("Creating dictionary of tokens as keys and identifier as keys ...")
-    if all(isinstance(element, list) for element in tokens):
-        tokens = {token for element in tokens for token in element}
-    return {token: id_ for id_, token in enumerate(set(tokens), 1)}
+        >>> _init_tokenize_worker(r'\\p{L}+', False)
+        >>> _tokenize_chunk(["This is 1 example."])
+        [['This', 'is', 'example']]
+    """
+    return [list(tokenize(document, _worker_pattern, _worker_lower)) for document in chunk]
@@ -16,7 +16,7 @@ Contents
     * :meth:`call_mallet()` calls MALLET with a specific executable and additional \
         parameteres.
     * :meth:`import_corpus()` imports a text corpus to the specific MALLET corpus \
-        format. Uses the executable ``import-dir``.
+        format. Uses the executable ``import-file`` (or ``import-dir``).
     * :meth:`train_topics()` creates a topic model with the imported text corpus. \
         Uses the executable ``train-topics``.
 
@@ -35,6 +35,7 @@ import string
 from platform import system
 from subprocess import Popen, PIPE
 import tempfile
+import threading
 
 log = logging.getLogger(__name__)
 
@@ -58,7 +59,7 @@ def _decode(std):
     return [line.decode('utf-8').replace('\n', '') for line in std]
 
 
-def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=False, logfile=False):
+def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=False, logfile=False, input_lines=None):
     """Calls the command-line from within Python.
     
     With this function you can call the command-line with a specific command. Each \
@@ -74,6 +75,11 @@ def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=
         logfile (bool), optional: If True, a logfile (``commandline.log``) will
             be created. Otherwise ``stdout`` (and ``stderr``, respectively) will
             be printed as logging to the console (level: INFO).
+        input_lines (iterable), optional: Lines of text to be written UTF-8
+            encoded to ``stdin`` of the subprocess, one after another, e.g. from
+            a generator. Implies ``stdin='pipe'``. An exception raised while
+            writing is raised again once the subprocess has closed ``stderr``,
+            i.e. exited. Defaults to None.
         
     Returns:
         :class:`Popen` object of the subprocess.
@@ -81,7 +87,13 @@ def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=
     Example:
         >>> call_commandline(['python', '-h']) # doctest: +ELLIPSIS
         <subprocess.Popen object at ...>
+        >>> process = call_commandline(['python', '-c', 'import sys; sys.stdout.write(sys.stdin.read().upper())'],
+        ...                            input_lines=('line {}\\n'.format(n) for n in range(2)))
+        >>> _decode(process.stdout)
+        ['LINE 0', 'LINE 1']
     """
+    if input_lines is not None:
+        stdin = PIPE
     if stdin == 'pipe':
         stdin = PIPE
     if stdout == 'pipe':
@@ -95,7 +107,15 @@ def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=
     log.info("Calling the command-line: {0} ...".format(' '.join(cmd)))
 
     process = Popen(cmd, stdin=stdin, stdout=stdout, stderr=stderr)
+    if input_lines is not None:
+        errors = []
+        writer = threading.Thread(target=_feed, args=(process.stdin, input_lines, errors), daemon=True)
+        writer.start()
     decoded_stderr = _decode(process.stderr)
+    if input_lines is not None:
+        writer.join()
+        if errors:
+            raise errors[0]
 
     if communicate:
         decoded_stderr = _decode(process.stderr)
@@ -108,11 +128,41 @@ def call_commandline(cmd, stdin=None, stdout='pipe', stderr='pipe', communicate=
         else:
             for line_stdout in decoded_stdout:
                 log.info(line_stdout)
-            for line_stdout in decoded_stderr:
+            for line_stderr in decoded_stderr:
                 log.info(line_stderr)
     return process
 
 
+def _feed(stdin, lines, errors):
+    """Writes lines of text to the ``stdin`` of a subprocess.
+    
+    This private function is wrapped in :func:`call_commandline()` and runs in \
+    a separate thread, so a subprocess writing to a full ``stderr`` pipe \
+    while reading its input does not block the caller.
+    
+    Args:
+        stdin (file-like): The binary ``stdin`` pipe of a subprocess.
+        lines (iterable): Lines of text.
+        errors (list): An exception raised while writing is appended, to be
+            raised again by the caller.
+        
+    Returns:
+        None.
+    """
+    try:
+        for line in lines:
+            stdin.write(line.encode('utf-8'))
+    except BrokenPipeError:
+        log.warning("The subprocess stopped reading its input.")
+    except Exception as error:
+        errors.append(error)
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
 def _check_whitespace(string):
     """Checks if whitespaces are in a string.
     
@@ -158,6 +208,40 @@ def _check_mallet_output(keyword, kwargs=None):
         raise OSError("MALLET did not produce any output files. Maybe check your args?")
 
 
+_MALLET_LINE_REGEX = r'^([^\t]*)\t([^\t]*)\t(.*)$'
+
+
+def _mallet_instances(tokenized_corpus, document_labels):
+    """Yields MALLET instances of a tokenized corpus.
+    
+    This private function is wrapped in :meth:`Mallet.import_tokenized_corpus()`. \
+    Each document becomes one line with its name, label and tokens, separated \
+    by tabs as matched by ``_MALLET_LINE_REGEX``. The name is the file name \
+    :func:`postprocessing.save_tokenized_corpus()` would write the document \
+    to, so MALLET's output refers to the same document labels as with \
+    ``import-dir``. Whitespace breaking the line format is replaced by spaces.
+    
+    Args:
+        tokenized_corpus (list): Tokenized corpus containing one or more
+            iterables containing tokens, or a :class:`preprocessing.TokenizedCorpus`.
+        document_labels (list): Name of each `tokenized_document` in `tokenized_corpus`.
+            If None, the labels of a :class:`preprocessing.TokenizedCorpus`.
+        
+    Yields:
+        Lines of the MALLET instance file.
+        
+    Example:
+        >>> list(_mallet_instances([['this', 'is'], ['a\\tdocument']], ['first', 'second label']))
+        ['first.txt\\tfirst\\tthis is\\n', 'second label.txt\\tsecond label\\ta document\\n']
+    """
+    if document_labels is None:
+        document_labels = tokenized_corpus.document_labels
+    for tokenized_document, document_label in zip(tokenized_corpus, document_labels):
+        document_label = re.sub(r'[\t\n\r]', ' ', str(document_label))
+        text = re.sub(r'[\t\n\r]', ' ', ' '.join(tokenized_document))
+        yield '{0}.txt\t{0}\t{1}\n'.format(document_label, text)
+
+
 class Mallet:
     """Python wrapper for MALLET.
     
@@ -176,7 +260,7 @@ class Mallet:
             self.corpus_output = corpus_output
         self.logfile = logfile
 
-    def call_mallet(self, command, **kwargs):
+    def call_mallet(self, command, input_lines=None, **kwargs):
         """Calls the command-line tool MALLET.
         
         With this function you can call `MALLET <http://mallet.cs.umass.edu/topics.php>`_ \
@@ -200,6 +284,8 @@ class Mallet:
                 based on frequency or information gain), ``split`` (divide data
                 into testing, training, and validation portions), ``bulk-load``
                 (for big input files, efficiently prune vocabulary and import docs).
+            input_lines (iterable, optional): Lines of text piped to MALLET's
+                ``stdin``, e.g. for ``import-file`` with ``input='-'``.
 
         Returns:
             :class:`Popen` object of the MALLET subprocess.
@@ -229,21 +315,32 @@ class Mallet:
         else:
             communicate = False
         
-        return call_commandline(args, communicate=communicate, logfile=self.logfile)
+        return call_commandline(args, communicate=communicate, logfile=self.logfile, input_lines=input_lines)
 
-    def import_tokenized_corpus(self, tokenized_corpus, document_labels, **kwargs):
+    def import_tokenized_corpus(self, tokenized_corpus, document_labels, single_file=True, stdin=False, **kwargs):
         """Creates MALLET corpus model.
         
         With this function you can import a ``tokenized_corpus`` to create the \
-        MALLET corpus model. The MALLET command for this step is ``import-dir`` \
+        MALLET corpus model. The MALLET command for this step is ``import-file`` \
         with ``--keep-sequence`` (which is already defined in the function, so \
         you don't have to), but you have the ability to specify all available \
         parameters. The output will be saved in ``output_corpus``.
         
+        The corpus is streamed document by document into a single instance file \
+        ``corpus.txt``, one line per document, or with ``stdin=True`` directly \
+        to MALLET without touching the disk. Set ``single_file=False`` to write \
+        one text file per document and use ``import-dir`` instead.
+        
         Args:
             tokenized_corpus (list): Tokenized corpus containing one or more
                 iterables containing tokens.
             document_labels (list): Name of each `tokenized_document` in `tokenized_corpus`.
+            single_file (bool, optional): If True, import one instance file with
+                ``import-file``, otherwise one file per document with ``import-dir``.
+                Defaults to True.
+            stdin (bool, optional): If True (and ``single_file``), pipe the
+                instances to MALLET instead of writing ``corpus.txt``. Defaults
+                to False.
             encoding (str): Character encoding for input file. Defaults to UTF-8.
             token_regex (str): Divides documents into tokens using a regular
                 expression (supports Unicode regex). Defaults to \p{L}[\p{L}\p{P}]+\p{L}.
@@ -289,8 +386,22 @@ class Mallet:
             True
         """
         corpus_file = os.path.join(self.corpus_output, 'corpus.mallet')
-        postprocessing.save_tokenized_corpus(tokenized_corpus, document_labels, self.corpus_output)
-        self.call_mallet('import-dir', keep_sequence=None, input=self.corpus_output, output=corpus_file, **kwargs)
+        if not single_file:
+            postprocessing.save_tokenized_corpus(tokenized_corpus, document_labels, self.corpus_output)
+            process = self.call_mallet('import-dir', keep_sequence=None, input=self.corpus_output, output=corpus_file, **kwargs)
+        else:
+            instances = _mallet_instances(tokenized_corpus, document_labels)
+            kwargs.setdefault('encoding', 'UTF-8')
+            if stdin:
+                process = self.call_mallet('import-file', input_lines=instances, keep_sequence=None, line_regex=_MALLET_LINE_REGEX,
+                                           input='-', output=corpus_file, **kwargs)
+            else:
+                instance_file = os.path.join(self.corpus_output, 'corpus.txt')
+                with open(instance_file, 'w', encoding='utf-8') as file:
+                    file.writelines(instances)
+                process = self.call_mallet('import-file', keep_sequence=None, line_regex=_MALLET_LINE_REGEX,
+                                           input=instance_file, output=corpus_file, **kwargs)
+        process.wait()
         
         _check_mallet_output(os.path.join(self.corpus_output, 'corpus.mallet'))  
         
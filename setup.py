@@ -31,6 +31,7 @@ setup(
         'gensim>=0.13.2',
         'lda>=1.0.5',
         'numpy>=1.3',
+        'scipy>=0.17.0',
         'lxml>=3.6.4',
         'matplotlib>=1.5.3',
         'bokeh>=0.12.6',
@@ -1,7 +1,69 @@
 from pytest import raises
+import numpy as np
+import pandas as pd
 from dariah_topics.utils import Mallet
 
 def command_not_found_test():
     """When the mallet executable was not found, raise an exception."""
     with raises(FileNotFoundError):
         Mallet(executable="i_am_an_executable_that_does_not_exist")
+
+def test_mallet_instances():
+    """Every document is one line of name, label and tokens."""
+    from dariah_topics.utils import _mallet_instances, _MALLET_LINE_REGEX
+    import re
+    lines = list(_mallet_instances([['a', 'b'], []], ['one', 'two\nlines']))
+    matches = [re.match(_MALLET_LINE_REGEX, line.rstrip('\n')) for line in lines]
+    assert [match.groups() for match in matches] == [('one.txt', 'one', 'a b'), ('two lines.txt', 'two lines', '')]
+
+def test_input_lines_error():
+    """An exception raised while piping input lines is raised by the caller."""
+    from dariah_topics.utils import call_commandline
+    def input_lines():
+        yield 'line\n'
+        raise ValueError("Broken corpus.")
+    with raises(ValueError):
+        call_commandline(['python', '-c', 'import sys; sys.stdin.read()'], input_lines=input_lines())
+
+def test_mallet_document_topics(tmpdir):
+    """both layouts of MALLET's doc-topics file give the same frame for any chunk size"""
+    from dariah_topics.postprocessing import _show_mallet_document_topics
+    index = ['topic {}'.format(n) for n in range(3)]
+    document_labels = ['document_{}'.format(n) for n in range(7)]
+    proportions = np.random.RandomState(0).dirichlet([0.5] * 3, len(document_labels)).round(4).astype(np.float32)
+    proportions[2] = [0, 1, 0]
+    dense = ['{}\tfile:/corpus/{}.txt\t{}\n'.format(n, document_label, '\t'.join(map(str, row)))
+             for n, (document_label, row) in enumerate(zip(document_labels, proportions))]
+    sparse = ['{}\tfile:/corpus/{}.txt\t{}\t\n'.format(n, document_label, '\t'.join(
+              '{}\t{}'.format(topic, row[topic]) for topic in np.argsort(-row, kind='stable') if row[topic]))
+              for n, (document_label, row) in enumerate(zip(document_labels, proportions))]
+    expected = pd.DataFrame(proportions.T, index=index, columns=document_labels)
+    for layout, lines in [('dense', dense), ('sparse', ['#doc name topic proportion ...\n'] + sparse)]:
+        lines = lines[:3] + ['\n', '3\n'] + lines[3:]
+        doc_topics_file = tmpdir.join(layout + '.txt')
+        doc_topics_file.write(''.join(lines).rstrip('\n'))
+        for easy_file_format in [None, layout == 'dense']:
+            for chunksize in [1, 2, 3, 100]:
+                document_topics = _show_mallet_document_topics(str(doc_topics_file), index, easy_file_format, chunksize)
+                pd.testing.assert_frame_equal(document_topics, expected)
+
+def test_top_word_weights(tmpdir):
+    """the top keys of each topic match a full sort and follow changes of the file"""
+    from dariah_topics.postprocessing import _read_top_word_weights
+    random_state = np.random.RandomState(0)
+    word_weights = pd.DataFrame({'topic_id': random_state.randint(0, 4, 200),
+                                 'key': ['key_{}'.format(n % 50) for n in range(200)],
+                                 'weight': random_state.randint(0, 10, 200) / 10})
+    word_weights_file = tmpdir.join('word_weights.txt')
+    word_weights.to_csv(str(word_weights_file), sep='\t', header=False, index=False)
+    word_weights['row'] = np.arange(len(word_weights))
+    expected = word_weights.sort_values(['topic_id', 'weight', 'row'], ascending=[True, False, True], kind='stable')
+    expected = expected.groupby('topic_id').head(5).reset_index(drop=True)
+    for chunksize in [1, 7, 50, 1000]:
+        top_word_weights, offsets = _read_top_word_weights(str(word_weights_file), 5, chunksize)
+        pd.testing.assert_frame_equal(top_word_weights, expected, check_dtype=False)
+        assert offsets == {topic_id: (5 * topic_id, 5 * topic_id + 5) for topic_id in range(4)}
+        assert _read_top_word_weights(str(word_weights_file), 5, chunksize)[0] is top_word_weights
+    word_weights_file.write('0\tchanged\t0.5\n')
+    top_word_weights, offsets = _read_top_word_weights(str(word_weights_file), 5, 1000)
+    assert top_word_weights[['key', 'weight']].values.tolist() == [['changed', 0.5]] and offsets == {0: (0, 1)}
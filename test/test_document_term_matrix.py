@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dariah_topics.preprocessing import create_document_term_matrix, \
+    find_hapax_legomena, find_stopwords, remove_features, stream_tokenized_corpus, tokenize, \
+    SparseDocumentTermMatrix
+from collections import Counter
+from itertools import chain, count
+from lxml import etree
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import pytest
+
+
+project_path = Path(__file__).absolute().parent.parent
+
+
+def _grenzboten_sample(n=5):
+    paths = sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))[:n]
+    tokenized_corpus = [list(tokenize(path.read_text(encoding='utf-8'))) for path in paths]
+    document_labels = [path.stem for path in paths]
+    return tokenized_corpus, document_labels
+
+
+def test_sparse_matches_dense():
+    """sparse and dense small corpus model contain the same frequencies"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    dense = create_document_term_matrix(tokenized_corpus, document_labels)
+    sparse = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+    assert isinstance(sparse, SparseDocumentTermMatrix)
+    assert sparse.to_dataframe().equals(dense)
+    assert list(dense.index) == document_labels
+    assert dense.sum().is_monotonic_decreasing
+
+
+def test_sparse_features():
+    """stopwords, hapax legomena and feature removal on the sparse model"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    dense = create_document_term_matrix(tokenized_corpus, document_labels)
+    sparse = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+    stopwords = find_stopwords(sparse, 50)
+    hapax_legomena = find_hapax_legomena(sparse)
+    assert stopwords == find_stopwords(dense, 50)
+    assert hapax_legomena == find_hapax_legomena(dense)
+    clean = remove_features(stopwords + hapax_legomena, document_term_matrix=sparse)
+    assert clean.to_dataframe().equals(remove_features(stopwords + hapax_legomena, document_term_matrix=dense))
+    assert not set(stopwords) & set(clean.columns)
+
+
+def _legacy_large_corpus_model(bag_of_words):
+    """the former cell-by-cell construction of the large corpus model"""
+    tuples = []
+    for document_id in range(1, len(bag_of_words) + 1):
+        if len(bag_of_words[document_id]) == 0:
+            tuples.append((document_id, 0))
+        for type_id in bag_of_words[document_id]:
+            tuples.append((document_id, type_id))
+    multi_index = pd.MultiIndex.from_tuples(tuples, names=['document_id', 'type_id'])
+    document_term_matrix = pd.DataFrame(np.zeros((len(multi_index), 1), dtype=int), index=multi_index)
+    for document_id, type_id in multi_index:
+        document_term_matrix.at[(document_id, type_id), 0] = bag_of_words[document_id].get(type_id, 0)
+    return document_term_matrix
+
+
+def test_large_corpus_model_matches_legacy():
+    """vectorized large corpus model equals the cell-by-cell construction"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    tokenized_corpus.insert(2, [])
+    document_labels.insert(2, 'empty_document')
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    bag_of_words = {document_ids[document_label]: Counter(type_ids[token] for token in tokenized_document)
+                    for document_label, tokenized_document in zip(document_labels, tokenized_corpus)}
+    expected = _legacy_large_corpus_model(bag_of_words)
+    assert document_term_matrix.equals(expected)
+    assert document_term_matrix.index.equals(expected.index)
+    assert document_term_matrix.loc[document_ids['empty_document']].index.tolist() == [0]
+
+
+def test_large_corpus_model_from_generator():
+    """type IDs are assigned in order of first occurrence while counting"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(
+        (iter(tokenized_document) for tokenized_document in tokenized_corpus), document_labels, large_corpus=True)
+    first_occurrences = list(dict.fromkeys(token for tokenized_document in tokenized_corpus for token in tokenized_document))
+    assert list(type_ids) == first_occurrences
+    assert [type_ids[token] for token in first_occurrences] == list(range(1, len(first_occurrences) + 1))
+    assert list(document_ids.values()) == list(range(1, len(document_labels) + 1))
+    frequencies = document_term_matrix.groupby(level='type_id')[0].sum()
+    assert frequencies.tolist() == list(type_ids.frequencies)
+
+
+def test_stream_tokenized_corpus():
+    """streaming pipeline counts the same as the materialized corpus"""
+    paths = sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))[:5]
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(
+        stream_tokenized_corpus([str(path) for path in paths]), large_corpus=True)
+    expected, expected_document_ids, expected_type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    assert document_term_matrix.equals(expected)
+    assert document_ids == expected_document_ids
+    assert dict(type_ids) == dict(expected_type_ids)
+    segmented = create_document_term_matrix(stream_tokenized_corpus([str(path) for path in paths], segment_size=500), sparse=True)
+    assert segmented.sum().sum() == sum(map(len, tokenized_corpus))
+    assert segmented.index[0] == document_labels[0] + '_0001'
+
+
+def test_duplicate_document_labels(tmpdir):
+    """documents with the same label are not merged"""
+    tokenized_corpus = [['this', 'is'], ['is', 'it']]
+    for kwargs in [{'large_corpus': True}, {'shard_size': 1, 'processes': 1}]:
+        with pytest.raises(ValueError):
+            create_document_term_matrix(tokenized_corpus, ['same', 'same'], **kwargs)
+        with pytest.raises(ValueError):
+            create_document_term_matrix(iter(zip(['same', 'same'], tokenized_corpus)), **kwargs)
+    from dariah_topics.preprocessing import TokenizedCorpus
+    for kwargs in [{}, {'sparse': True}]:
+        for corpus in [iter(zip(['same', 'same'], tokenized_corpus)),
+                       TokenizedCorpus.from_tokenized_corpus(tokenized_corpus, ['same', 'same'])]:
+            document_term_matrix = create_document_term_matrix(corpus, **kwargs)
+            if kwargs:
+                document_term_matrix = document_term_matrix.to_dataframe()
+            assert list(document_term_matrix.index) == ['same', 'same']
+            assert document_term_matrix['it'].tolist() == [0, 1]
+    paths = []
+    for directory in ['one', 'two']:
+        path = tmpdir.mkdir(directory).join('document.txt')
+        path.write_text('Ein Beispiel aus {}'.format(directory), encoding='utf-8')
+        paths.append(str(path))
+    document_term_matrix = create_document_term_matrix(stream_tokenized_corpus(paths))
+    assert list(document_term_matrix.index) == ['document', 'document']
+    assert document_term_matrix[['one', 'two']].values.tolist() == [[1, 0], [0, 1]]
+
+
+def test_missing_document_labels():
+    """without labels, a plain tokenized corpus is not unpacked as pairs"""
+    for tokenized_corpus in [[['new', 'york'], ['big', 'apple']], [('new', 'york')], [['this', 'is', 'it']]]:
+        for kwargs in [{}, {'large_corpus': True}, {'shard_size': 1, 'processes': 1}, {'ngram_range': (1, 2)}]:
+            with pytest.raises(ValueError, match='pairs'):
+                create_document_term_matrix(tokenized_corpus, **kwargs)
+
+
+def test_sharded_corpus_model(tmpdir):
+    """out-of-core model equals the in-memory model, with alphabetical type IDs"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    tokenized_corpus.insert(2, [])
+    document_labels.insert(2, 'empty_document')
+    expected, expected_document_ids, expected_type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(
+        tokenized_corpus, document_labels, shard_size=2, processes=2, tmpdir=str(tmpdir))
+    assert document_ids == expected_document_ids
+    assert list(type_ids) == sorted(expected_type_ids)
+    assert list(type_ids.frequencies) == [expected_type_ids.frequencies[expected_type_ids[token] - 1] for token in type_ids]
+    id2type = type_ids.id2token()
+    expected_id2type = expected_type_ids.id2token()
+    assert sorted((document_id, id2type.get(type_id), frequency) for (document_id, type_id), frequency in document_term_matrix[0].items()) == \
+        sorted((document_id, expected_id2type.get(type_id), frequency) for (document_id, type_id), frequency in expected[0].items())
+    assert tmpdir.listdir() == []
+
+
+def test_sharded_corpus_model_matrix_market(tmpdir):
+    """out-of-core model streamed to a Matrix Market file readable by Gensim"""
+    from gensim.corpora import MmCorpus
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    filepath = str(tmpdir.join('document_term_matrix.mm'))
+    _, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, shard_size=2,
+                                                            processes=1, matrix_market=filepath)
+    corpus = MmCorpus(filepath)
+    assert (corpus.num_docs, corpus.num_terms) == (len(document_ids), len(type_ids))
+    id2type = type_ids.id2token()
+    for tokenized_document, bag_of_words in zip(tokenized_corpus, corpus):
+        assert {id2type[type_id + 1]: frequency for type_id, frequency in bag_of_words} == Counter(tokenized_document)
+
+
+def test_compressed_matrix_market(tmpdir):
+    """compressed Matrix Market files are streamed and indexed like plain ones"""
+    from dariah_topics.postprocessing import _save_matrix_market
+    from dariah_topics.preprocessing import read_matrix_market_file, MatrixMarketCorpus
+    from gensim.corpora import MmCorpus
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    tokenized_corpus[1:1] = [[], []]
+    document_labels[1:1] = ['empty', 'also_empty']
+    document_term_matrix, _, _ = create_document_term_matrix(tokenized_corpus, document_labels, True)
+    _save_matrix_market(document_term_matrix, str(tmpdir), blocksize=500)
+    expected = list(MmCorpus(str(tmpdir.join('document_term_matrix.mm'))))
+    assert len(expected) == len(tokenized_corpus) and expected[1] == []
+    for compression, extension in [(None, '.mm'), ('gzip', '.mm.gz'), ('bz2', '.mm.bz2')]:
+        _save_matrix_market(document_term_matrix, str(tmpdir), compression, blocksize=500)
+        filepath = str(tmpdir.join('document_term_matrix' + extension))
+        corpus = read_matrix_market_file(filepath)
+        assert isinstance(corpus, MatrixMarketCorpus) and corpus.index is not None
+        assert list(MatrixMarketCorpus(filepath, blocksize=1000)) == expected
+        assert [corpus[n] for n in reversed(range(len(corpus)))] == expected[::-1]
+        tmpdir.join('document_term_matrix' + extension + '.index.npz').remove()
+        assert MatrixMarketCorpus(filepath)[3] == expected[3]
+    sharded = str(tmpdir.join('sharded.mm.gz'))
+    create_document_term_matrix(tokenized_corpus, document_labels, shard_size=2, processes=1, matrix_market=sharded)
+    corpus = MatrixMarketCorpus(sharded)
+    assert [len(bag_of_words) for bag_of_words in corpus] == [len(bag_of_words) for bag_of_words in expected]
+    assert corpus[5] == list(corpus)[5] and len(corpus[5]) == len(expected[5])
+
+
+def test_binary_document_term_matrix(tmpdir):
+    """all variants survive a binary round trip and are read memory-mapped"""
+    from dariah_topics.postprocessing import save_document_term_matrix
+    from dariah_topics.preprocessing import read_document_term_matrix, read_token2id
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    path = str(tmpdir)
+    directory = str(tmpdir.join('document_term_matrix'))
+    dense = create_document_term_matrix(tokenized_corpus, document_labels)
+    save_document_term_matrix(dense, path, binary=True)
+    assert read_document_term_matrix(directory).equals(dense)
+    sparse = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)
+    save_document_term_matrix(sparse, path, binary=True)
+    assert read_document_term_matrix(directory).to_dataframe().equals(dense)
+    large, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    save_document_term_matrix(large, path, document_ids, type_ids, binary=True)
+    document_term_matrix = read_document_term_matrix(directory)
+    assert document_term_matrix.equals(large)
+    assert not document_term_matrix[0].values.flags.writeable
+    assert dict(read_token2id(str(tmpdir.join('document_ids.npz')))) == document_ids
+    assert dict(read_token2id(str(tmpdir.join('type_ids.npz')))) == dict(type_ids)
+
+
+def test_hashing_corpus_model():
+    """hashed type IDs with reverse lookup give readable stopwords and topics"""
+    from dariah_topics.postprocessing import doc2bow, show_topics
+    from dariah_topics.preprocessing import HashingVocabulary
+    from gensim.models import LdaModel
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(
+        tokenized_corpus, document_labels, large_corpus=True, hashing=True, n_features=2 ** 18, reverse_lookup=2)
+    assert isinstance(type_ids, HashingVocabulary)
+    assert document_term_matrix[0].sum() == sum(map(len, tokenized_corpus))
+    assert document_term_matrix.index.get_level_values('type_id').max() <= 2 ** 18
+    frequencies = Counter(token for tokenized_document in tokenized_corpus for token in tokenized_document)
+    assert find_stopwords(document_term_matrix, 5, type_ids) == [token for token, _ in frequencies.most_common(5)]
+    sparse = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True, hashing=True,
+                                         n_features=2 ** 18, reverse_lookup=2)
+    assert find_stopwords(sparse, 5) == find_stopwords(document_term_matrix, 5, type_ids)
+    model = LdaModel(corpus=doc2bow(document_term_matrix).tolist(), num_topics=2, iterations=1, passes=1, random_state=0)
+    topics = show_topics(model, vocabulary=type_ids, num_keys=5)
+    assert set(topics.values.ravel()) <= set(frequencies)
+
+
+def test_hashing_vocabulary_membership():
+    """only remembered types are members, but features are removed by their hash"""
+    from dariah_topics.preprocessing import HashingVocabulary, remove_features
+    assert 'never seen' not in HashingVocabulary(16)
+    assert len(HashingVocabulary(16)) == 0
+    tokenized_corpus = [['token', 'stopword', 'stopword']]
+    document_term_matrix, _, type_ids = create_document_term_matrix(
+        tokenized_corpus, ['document'], large_corpus=True, hashing=True, n_features=2 ** 10)
+    assert 'stopword' not in type_ids
+    clean = remove_features(['stopword'], document_term_matrix=document_term_matrix, type_ids=type_ids)
+    assert clean[0].tolist() == [1]
+
+
+def test_corpus_statistics():
+    """frequencies are the same for all variants of the document-term matrix"""
+    from dariah_topics.preprocessing import CorpusStatistics
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    dense = CorpusStatistics(create_document_term_matrix(tokenized_corpus, document_labels))
+    sparse = CorpusStatistics(create_document_term_matrix(tokenized_corpus, document_labels, sparse=True))
+    document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    large = CorpusStatistics(document_term_matrix, type_ids)
+    frequencies = Counter(token for tokenized_document in tokenized_corpus for token in tokenized_document)
+    for statistics in [dense, sparse, large]:
+        assert statistics.term_frequency.to_dict() == frequencies
+        assert statistics.document_lengths.tolist() == list(map(len, tokenized_corpus))
+        assert statistics.stopwords(20) == dense.stopwords(20)
+        assert sorted(statistics.filter_document_frequency(min_df=2, max_df=0.8)) == \
+            sorted(dense.filter_document_frequency(min_df=2, max_df=0.8))
+    assert sparse.document_frequency.equals(dense.document_frequency)
+    assert sparse.max_frequency.equals(dense.max_frequency)
+    assert large.max_frequency.to_dict() == dense.max_frequency.to_dict()
+    assert sorted(large.hapax_legomena()) == sorted(token for token, frequency in frequencies.items() if frequency == 1)
+    assert find_stopwords(large, 20) == find_stopwords(document_term_matrix, 20, type_ids)
+
+
+def test_hapax_legomena_small_corpus_model():
+    """small models keep types occurring at most once in every document"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
+    expected = document_term_matrix.loc[:, document_term_matrix.max() == 1].columns.tolist()
+    assert find_hapax_legomena(document_term_matrix) == expected
+    assert find_hapax_legomena(create_document_term_matrix(tokenized_corpus, document_labels, sparse=True)) == expected
+    assert find_hapax_legomena(create_document_term_matrix([['a', 'b'], ['a']], ['one', 'two'])) == ['a', 'b']
+
+
+def test_hapax_legomena_by_term_frequency():
+    """by term frequency, all models agree on types occurring once in the corpus"""
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    frequencies = Counter(chain.from_iterable(tokenized_corpus))
+    expected = sorted(token for token, frequency in frequencies.items() if frequency == 1)
+    document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
+    assert sorted(find_hapax_legomena(document_term_matrix, type_ids, by='term_frequency')) == expected
+    for sparse in [False, True]:
+        document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=sparse)
+        assert sorted(find_hapax_legomena(document_term_matrix, by='term_frequency')) == expected
+        assert len(find_hapax_legomena(document_term_matrix)) > len(expected)
+    with pytest.raises(ValueError):
+        find_hapax_legomena(document_term_matrix, by='document_frequency')
+
+
+def test_pruning_during_construction():
+    """pruned matrix equals the full matrix without the removed features"""
+    from dariah_topics.preprocessing import CorpusStatistics
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    dense = create_document_term_matrix(tokenized_corpus, document_labels)
+    statistics = CorpusStatistics(dense)
+    features = set(statistics.filter_document_frequency(min_df=2, max_df=0.8))
+    features |= set(statistics.term_frequency.index[statistics.term_frequency.values < 3])
+    expected = remove_features(list(features), document_term_matrix=dense)
+    pruned = create_document_term_matrix(tokenized_corpus, document_labels, min_df=2, max_df=0.8, min_tf=3)
+    assert pruned.equals(expected)
+    document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True,
+                                                                    min_df=2, max_df=0.8, min_tf=3, keep_n=100)
+    assert len(type_ids) == 100
+    assert list(type_ids.values()) == list(range(1, 101))
+    assert set(type_ids) == set(expected.columns[:100])
+    assert document_term_matrix.index.get_level_values('type_id').max() == 100
+    sharded, _, sharded_type_ids = create_document_term_matrix(tokenized_corpus, document_labels, shard_size=2, processes=1,
+                                                               min_df=2, max_df=0.8, min_tf=3)
+    assert set(sharded_type_ids) == set(expected.columns)
+    assert list(sharded_type_ids.values()) == list(range(1, len(expected.columns) + 1))
+    assert sharded[0].sum() == expected.values.sum()
+
+
+def test_read_from_pathlist_workers():
+    """threaded reading keeps the order and handles unreadable files like sequential reading"""
+    from dariah_topics.preprocessing import read_from_pathlist
+    paths = [str(path) for path in sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))[:20]]
+    expected = list(read_from_pathlist(paths))
+    assert list(read_from_pathlist(paths, workers=4, prefetch=3)) == expected
+    paths.insert(3, str(project_path.joinpath('grenzboten_sample', 'missing.txt')))
+    for workers in [None, 4]:
+        with pytest.raises(FileNotFoundError):
+            list(read_from_pathlist(paths, workers=workers))
+        with pytest.raises(FileNotFoundError):
+            list(stream_tokenized_corpus(paths, workers=workers))
+        assert list(read_from_pathlist(paths, workers=workers, errors='skip')) == expected
+        labeled_corpus = stream_tokenized_corpus(paths, document_labels=[str(n) for n in range(len(paths))],
+                                                 workers=workers, errors='skip')
+        assert [document_label for document_label, _ in labeled_corpus] == [str(n) for n in range(len(paths)) if n != 3]
+        with pytest.raises(ValueError):
+            list(read_from_pathlist([str(project_path.joinpath('setup.py'))], file_format='pdf', workers=workers))
+        with pytest.raises(ValueError):
+            list(read_from_pathlist(paths, workers=workers, errors='ignore'))
+
+
+def test_streaming_xml(tmpdir):
+    """incremental XML parsing yields the same parts as XPath"""
+    from dariah_topics.preprocessing import read_from_pathlist
+    tokenized_corpus, _ = _grenzboten_sample()
+    divs = ''.join('<div n="{}"><p>{}</p><p><hi>{}</hi></p></div>'.format(n, ' '.join(tokens[:100]), ' '.join(tokens[100:200]))
+                   for n, tokens in enumerate(tokenized_corpus))
+    tei = '<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader><title>Grenzboten</title></teiHeader>' \
+          '<text><body>{}</body></text></TEI>'.format(divs)
+    filepath = tmpdir.join('volume.xml')
+    filepath.write_text(tei, encoding='utf-8')
+    for xpath_expression in ['//tei:div', '//tei:text']:
+        expected = list(read_from_pathlist([str(filepath)], xpath_expression=xpath_expression))
+        streamed = list(read_from_pathlist([str(filepath)], xpath_expression=xpath_expression, streaming=True))
+        assert [list(document) for document in streamed] == [expected[0] if isinstance(expected[0], list) else [expected[0]]]
+    expected = [(label, list(tokens)) for label, tokens in stream_tokenized_corpus([str(filepath)], xpath_expression='//tei:div', segment_size=150)]
+    streamed = [(label, list(tokens)) for label, tokens in stream_tokenized_corpus([str(filepath)], xpath_expression='//tei:div',
+                                                                                   segment_size=150, streaming=True,
+                                                                                   chunker=lambda part: [part])]
+    assert len(streamed) == len(expected) > 1
+    assert [token for _, tokens in streamed for token in tokens] == [token for _, tokens in expected for token in tokens]
+    broken = tmpdir.join('broken.xml')
+    broken.write_text('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><div>Part</div>', encoding='utf-8')
+    not_xml = tmpdir.join('not_xml.xml')
+    not_xml.write_text('Not XML at all.', encoding='utf-8')
+    paths = [str(filepath), str(broken), str(not_xml), str(filepath)]
+    complete = [list(document) for document in read_from_pathlist([str(filepath)], xpath_expression='//tei:div', streaming=True)]
+    for workers in [None, 2]:
+        documents = read_from_pathlist(paths, xpath_expression='//tei:div', streaming=True, workers=workers)
+        assert list(next(documents)) == complete[0]
+        broken_document = next(documents)
+        assert next(broken_document) == 'Part'
+        with pytest.raises(etree.XMLSyntaxError):
+            list(broken_document)
+        skipped = read_from_pathlist(paths, xpath_expression='//tei:div', streaming=True, workers=workers, errors='skip')
+        assert [list(document) for document in skipped] == [complete[0], ['Part'], complete[0]]
+    held = list(read_from_pathlist([str(filepath)] * 5, xpath_expression='//tei:div', streaming=True, workers=2, prefetch=1))
+    assert [list(document) for document in held] == complete * 5
+    with pytest.raises(ValueError):
+        list(read_from_pathlist([str(filepath)], xpath_expression='//xhtml:div', streaming=True))
+
+
+def test_streaming_xml_workers(tmpdir, monkeypatch):
+    """with workers, streamed XML files are parsed by the worker threads"""
+    import threading
+    from dariah_topics import preprocessing
+    iterparse_xml = preprocessing._iterparse_xml
+    threads = set()
+    def recording_iterparse_xml(filepath, xpath_expression):
+        threads.add(threading.get_ident())
+        yield from iterparse_xml(filepath, xpath_expression)
+    monkeypatch.setattr(preprocessing, '_iterparse_xml', recording_iterparse_xml)
+    paths = []
+    for n in range(6):
+        path = tmpdir.join('volume_{}.xml'.format(n))
+        path.write_text('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text>{}</text></TEI>'.format(
+                        ''.join('<div>Part {} of volume {}</div>'.format(part, n) for part in range(50))), encoding='utf-8')
+        paths.append(str(path))
+    documents = preprocessing.read_from_pathlist(paths, xpath_expression='//tei:div', streaming=True, workers=2)
+    assert [list(document)[-1] for document in documents] == ['Part 49 of volume {}'.format(n) for n in range(6)]
+    assert threads and threading.get_ident() not in threads
+
+
+def test_stream_dkpro_corpus(tmpdir):
+    """chunked, categorical reading selects the same lemmas as a full read"""
+    from dariah_topics.preprocessing import stream_dkpro_corpus
+    tokenized_corpus, document_labels = _grenzboten_sample(3)
+    tags = np.array(['NN', 'V', 'ART', 'ADJ', 'PUNC'])
+    pathlist, expected = [], []
+    for n, tokens in enumerate(tokenized_corpus):
+        dkpro_document = pd.DataFrame({'SectionId': 'b', 'ParagraphId': np.arange(len(tokens)) // 50, 'Token': tokens,
+                                       'Lemma': [token.lower() for token in tokens],
+                                       'CPOS': tags[np.arange(len(tokens)) * (n + 1) % len(tags)]})
+        filepath = str(tmpdir.join('{}.csv'.format(document_labels[n])))
+        dkpro_document.to_csv(filepath, sep='\t', index=False)
+        pathlist.append(filepath)
+        selected = dkpro_document[dkpro_document['CPOS'].isin(['ADJ', 'V', 'NN'])]
+        expected.append((document_labels[n], selected['Lemma'].tolist(), selected['Token'].tolist()))
+    lemmas = list(stream_dkpro_corpus(pathlist, chunksize=70))
+    assert lemmas == [(document_label, lemma) for document_label, lemma, _ in expected]
+    missing = str(tmpdir.join('missing.csv'))
+    without_lemma = str(tmpdir.join('without_lemma.csv'))
+    pd.DataFrame({'Token': ['word'], 'CPOS': ['NN']}).to_csv(without_lemma, sep='\t', index=False)
+    for workers in [None, 2]:
+        tokens = list(stream_dkpro_corpus(pathlist + [missing], lemma=False, workers=workers, errors='skip'))
+        assert tokens == [(document_label, token) for document_label, _, token in expected]
+        with pytest.raises(FileNotFoundError):
+            list(stream_dkpro_corpus(pathlist + [missing], workers=workers))
+        with pytest.raises(ValueError):
+            list(stream_dkpro_corpus([without_lemma], workers=workers, errors='skip'))
+
+
+def test_preprocessing_cache(tmpdir, monkeypatch):
+    """warm runs are served from the cache without reading files"""
+    from dariah_topics import preprocessing
+    paths = [str(path) for path in sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))[:4]]
+    expected = [(label, list(tokens)) for label, tokens in stream_tokenized_corpus(paths, segment_size=500)]
+    cache = preprocessing.PreprocessingCache(str(tmpdir.join('cache')))
+    assert list(cache.tokenize_pathlist(paths, segment_size=500)) == expected
+    assert len(cache) == 4
+    with monkeypatch.context() as patched:
+        patched.setattr(preprocessing, '_read_file', None)
+        assert list(cache.tokenize_pathlist(paths, segment_size=500, workers=2)) == expected
+    assert cache.get(paths[0], segment_size=1000) is None
+    assert cache.invalidate(paths[0]) == 1 and len(cache) == 3
+    content_cache = preprocessing.PreprocessingCache(str(tmpdir.join('content')), key='content')
+    list(content_cache.tokenize_pathlist(paths))
+    list(content_cache.tokenize_pathlist(paths, lower=False))
+    assert len(content_cache) == 8
+    content_cache.max_size = content_cache.size // 2
+    content_cache.get(paths[0])
+    list(content_cache.tokenize_pathlist(paths[:1], pattern=r'\w+'))
+    assert content_cache.size <= content_cache.max_size
+    assert content_cache.get(paths[0], **dict(file_format=None, pattern=r'\w+', lower=True, segment_size=None,
+                                               tolerance=0.05, chunker=None)) is not None
+    content_cache.clear()
+    assert len(content_cache) == 0
+
+    document = tmpdir.join('document.txt')
+    document.write('This is the first version.')
+    missing = str(tmpdir.join('missing.txt'))
+    with pytest.raises(FileNotFoundError):
+        list(cache.tokenize_pathlist([missing, str(document)], workers=2))
+    labeled_documents = list(cache.tokenize_pathlist([missing, str(document)], workers=2, errors='skip'))
+    assert labeled_documents == [('document', ['this', 'is', 'the', 'first', 'version'])]
+    assert len(cache) == 4
+    document.write('This is the second, longer version.')
+    assert list(cache.tokenize_pathlist([str(document)]))[0][1][3] == 'second'
+    assert len(cache) == 4
+    document.write('This is the third version.')
+    assert cache.invalidate(str(document)) == 1 and len(cache) == 3
+    list(cache.tokenize_pathlist([str(document)]))
+    document.remove()
+    assert cache.invalidate(str(document)) == 1 and len(cache) == 3
+
+
+def test_preprocessing_cache_batch(tmpdir, monkeypatch):
+    """each file is hashed once and the cache directory is listed once per run"""
+    from dariah_topics import preprocessing
+    paths = [str(path) for path in sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))[:4]]
+    cache = preprocessing.PreprocessingCache(str(tmpdir.join('cache')), max_size=2 ** 40, key='content')
+    calls = Counter()
+    for name in ['_file_key', '_entries']:
+        method = getattr(preprocessing.PreprocessingCache, name)
+        def counted(self, *args, name=name, method=method):
+            calls[name] += 1
+            return method(self, *args)
+        monkeypatch.setattr(preprocessing.PreprocessingCache, name, counted)
+    cold = list(cache.tokenize_pathlist(paths))
+    assert calls == {'_file_key': 4, '_entries': 2}
+    calls.clear()
+    assert list(cache.tokenize_pathlist(paths)) == cold
+    assert calls == {'_file_key': 4, '_entries': 2}
+
+
+def test_tokenized_corpus(tmpdir):
+    """an integer-encoded corpus gives the same results as lists of tokens"""
+    from dariah_topics.preprocessing import segment, TokenizedCorpus
+    from dariah_topics.postprocessing import save_tokenized_corpus
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    tokenized_corpus.insert(2, [])
+    document_labels.insert(2, 'empty')
+    corpus = TokenizedCorpus.from_tokenized_corpus(tokenized_corpus, document_labels)
+    assert list(corpus) == tokenized_corpus
+    assert corpus.tokens.dtype == np.int32 and corpus.tokens.nbytes == 4 * sum(map(len, tokenized_corpus))
+
+    features = find_stopwords(create_document_term_matrix(tokenized_corpus, document_labels), 20)
+    clean_corpus = remove_features(features, tokenized_corpus=corpus)
+    clean_tokenized_corpus = remove_features(features, tokenized_corpus=tokenized_corpus)
+    assert list(clean_corpus) == clean_tokenized_corpus
+
+    labeled_segments = [(label, tokens) for document_label, tokenized_document in zip(document_labels, clean_tokenized_corpus)
+                for label, tokens in zip(('{}_{:04d}'.format(document_label, n) for n in count(1)),
+                                         segment([tokenized_document], 300, 0.1))]
+    segments = segment(clean_corpus, 300, 0.1)
+    assert list(zip(segments.document_labels, segments)) == labeled_segments
+
+    for large_corpus, sparse in [(True, False), (False, True), (False, False)]:
+        expected = create_document_term_matrix(labeled_segments, large_corpus=large_corpus, sparse=sparse, min_df=2)
+        result = create_document_term_matrix(segments, large_corpus=large_corpus, sparse=sparse, min_df=2)
+        if large_corpus:
+            pd.testing.assert_frame_equal(result[0], expected[0])
+            assert result[1] == expected[1]
+            assert dict(result[2]) == dict(expected[2])
+            assert list(result[2].frequencies) == list(expected[2].frequencies)
+            assert list(result[2].document_frequencies) == list(expected[2].document_frequencies)
+        elif sparse:
+            assert (result.matrix != expected.matrix).nnz == 0
+            assert result.columns.equals(expected.columns) and result.index.equals(expected.index)
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+
+    save_tokenized_corpus(clean_corpus, None, str(tmpdir))
+    assert tmpdir.join('empty.txt').read_text('utf-8') == ''
+    assert tmpdir.join(document_labels[0] + '.txt').read_text('utf-8') == '\n'.join(clean_tokenized_corpus[0])
+
+
+def test_ngram_features():
+    """the most frequent n-grams are counted exactly"""
+    from dariah_topics.preprocessing import _ngrams, top_ngrams
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    all_ngrams = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True, ngram_range=(1, 3))
+    counts = Counter(ngram for tokenized_document in tokenized_corpus for ngram in _ngrams(tokenized_document, (2, 3)))
+    assert dict(zip(all_ngrams.columns, all_ngrams.sum())) == dict(Counter(chain.from_iterable(tokenized_corpus)) + counts)
+
+    monitored = top_ngrams(tokenized_corpus, (2, 3), 2000, capacity=2000)
+    assert len(monitored) == 2000
+    threshold = sum(counts.values()) / 2000
+    assert {ngram for ngram, frequency in counts.items() if frequency > threshold} <= set(monitored)
+    top = top_ngrams(tokenized_corpus, (2, 3), 20, capacity=len(counts))
+    assert sorted(counts[ngram] for ngram in top) == sorted(frequency for _, frequency in counts.most_common(20))
+
+    document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels, sparse=True, ngram_range=(2, 3),
+                                                       max_ngrams=20)
+    assert len(document_term_matrix.columns) == 20
+    assert all(counts[ngram] == frequency for ngram, frequency in zip(document_term_matrix.columns, document_term_matrix.sum()))
+    labeled_corpus = list(zip(document_labels, tokenized_corpus))
+    document_term_matrix, _, type_ids = create_document_term_matrix(labeled_corpus, large_corpus=True, ngram_range=(1, 2),
+                                                                    max_ngrams=5)
+    assert len(type_ids) == len(set(chain.from_iterable(tokenized_corpus))) + 5
+    with pytest.raises(ValueError):
+        create_document_term_matrix(iter(labeled_corpus), ngram_range=(1, 2), max_ngrams=5)
+    expected = create_document_term_matrix(labeled_corpus, sparse=True, ngram_range=(1, 2))
+    result = create_document_term_matrix((pair for pair in labeled_corpus), sparse=True, ngram_range=(1, 2))
+    assert list(result.index) == document_labels
+    assert (result.matrix != expected.matrix).nnz == 0 and result.columns.equals(expected.columns)
+
+
+def test_bag_of_words_corpus(tmpdir):
+    """bags of words are split from the arrays, in memory and memory-mapped"""
+    from dariah_topics.postprocessing import doc2bow, save_document_term_matrix, BagOfWordsCorpus
+    from gensim.models import LdaMulticore
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    tokenized_corpus.insert(1, [])
+    document_labels.insert(1, 'empty')
+    document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, True)
+    expected = [sorted(Counter(type_ids[token] for token in tokenized_document).items()) for tokenized_document in tokenized_corpus]
+    bags = doc2bow(document_term_matrix)
+    assert bags.index.tolist() == [str(n) for n in range(len(tokenized_corpus))]
+    assert [sorted(bag) for bag in bags] == expected
+    save_document_term_matrix(document_term_matrix, str(tmpdir), document_ids, type_ids, binary=True)
+    for corpus in [BagOfWordsCorpus(document_term_matrix, blocksize=100),
+                   BagOfWordsCorpus(str(tmpdir.join('document_term_matrix')), blocksize=1)]:
+        assert len(corpus) == len(tokenized_corpus)
+        assert list(corpus) == bags.tolist() == list(corpus)
+        assert corpus[len(corpus) - 1] == bags.iloc[-1]
+    model = LdaMulticore(corpus=corpus, num_topics=2, id2word=type_ids.id2token(), iterations=1, passes=1,
+                         workers=1, random_state=0)
+    assert model.get_topics().shape == (2, max(type_ids.values()) + 1)
+
+
+def test_model_bundle(tmpdir):
+    """a memory-mapped model bundle shows the same topics as the Gensim model"""
+    from dariah_topics.postprocessing import doc2bow, save_model, show_document_topics, show_topics, ModelBundle
+    from dariah_topics.preprocessing import read_model
+    from gensim.models import LdaModel
+    tokenized_corpus, document_labels = _grenzboten_sample()
+    document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, True)
+    bags = doc2bow(document_term_matrix).tolist()
+    model = LdaModel(corpus=bags, num_topics=3, iterations=5, passes=1, random_state=0)
+    save_model(model, str(tmpdir), bundle=True, vocabulary=type_ids, document_labels=document_labels, doc2bow=bags)
+    bundle = read_model(str(tmpdir))
+    assert isinstance(bundle, ModelBundle) and isinstance(bundle.topic_word, np.memmap)
+    assert bundle.manifest['library'] == 'gensim' and bundle.manifest['hyperparameters']['passes'] == 1
+    assert np.array_equal(bundle.alpha, model.alpha)
+    topics = show_topics(model, vocabulary=type_ids, num_keys=10)
+    pd.testing.assert_frame_equal(show_topics(bundle, num_keys=10), topics)
+    expected = show_document_topics(topics, model, document_labels, doc2bow=bags)
+    document_topics = show_document_topics(topics, bundle)
+    assert document_topics.shape == expected.shape and document_topics.columns.tolist() == document_labels
+    assert np.allclose(document_topics.sum(), 1, atol=1e-3)
+    save_model(model, str(tmpdir), bundle=True)
+    bundle = read_model(str(tmpdir))
+    assert bundle.doc_topic is None and bundle.document_labels is None
+    assert bundle.vocabulary == [model.id2word[type_id] for type_id in range(len(model.id2word))]
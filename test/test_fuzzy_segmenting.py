@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dariah_topics.preprocessing import segment_fuzzy, split_paragraphs, \
-    segment, tokenize
+from dariah_topics.preprocessing import segment_fuzzy, segment_spans, split_paragraphs, \
+    segment, stream_paragraphs, tokenize
 from functools import partial
 from itertools import chain
+import io
+import mmap
+import pandas as pd
 from pathlib import Path
+import random
 import re
 
 
@@ -107,3 +111,73 @@ def test_segment():
     lengths = list(map(len, segments))
     assert min(lengths[:-1]) >= 950, "a segment is too short in " + str(segments)
     assert max(lengths) <= 1050, "a segment is too long in " + str(segments)
+
+
+def test_segment_spans():
+    """spans match the segments of segment_fuzzy"""
+    rng = random.Random(0)
+    for _ in range(2000):
+        segment_size = rng.randint(1, 20)
+        tolerance = rng.choice([-1, 0, 0.05, 0.3, rng.randint(0, segment_size - 1)])
+        max_length = 2 * segment_size - 1 if tolerance < 0 else 3 * segment_size
+        chunk_lengths = [rng.randint(0, max_length) for _ in range(rng.randint(0, 10))]
+        document = [list(range(length)) for length in chunk_lengths]
+        expected = [sum(map(len, chunks)) for chunks in segment_fuzzy(document, segment_size, tolerance)]
+        spans = list(segment_spans(chunk_lengths, segment_size, tolerance))
+        assert [end - start for start, end in spans] == expected, (chunk_lengths, segment_size, tolerance)
+        assert all(end == start for (_, end), (start, _) in zip(spans, spans[1:]))
+        assert segment(document, segment_size, tolerance) == \
+            [list(chain.from_iterable(chunks)) for chunks in segment_fuzzy(document, segment_size, tolerance)]
+
+
+def test_segment_spans_overlong_chunk():
+    """a chunk longer than two segments does not loop without tolerance"""
+    assert list(segment_spans([10, 3], segment_size=4, tolerance=-1)) == [(0, 10), (10, 13)]
+
+
+def test_stream_paragraphs():
+    """paragraphs read block by block match split_paragraphs"""
+    path = project_path.joinpath('grenzboten_sample', 'Beck_1844_Tagebuch_56.txt')
+    text = path.read_text(encoding='utf-8') + '\n\nÄußerst schön.\n'
+    for sep in [r'\n', r'\n\n', re.compile(r'\n\s*\n')]:
+        expected = split_paragraphs(text, sep=sep)
+        assert list(stream_paragraphs(text, sep=sep)) == expected
+        for blocksize in [1, 7, 4096]:
+            assert list(stream_paragraphs(io.StringIO(text), sep=sep, blocksize=blocksize)) == expected
+            assert list(stream_paragraphs(io.BytesIO(text.encode('utf-8')), sep=sep, blocksize=blocksize)) == expected
+    for blocksize in range(1, 14):
+        assert list(stream_paragraphs(io.StringIO('para\n\n \nnext'), sep=r'\n\s*\n', blocksize=blocksize)) == ['para', 'next']
+
+
+def test_stream_paragraphs_random_blocks():
+    """separators of any length split across blocks are found once"""
+    rnd = random.Random(0)
+    for _ in range(200):
+        text = ''.join(rnd.choice(['a', 'ä', ' ', '\n', '\n\n', ' \n \n']) for _ in range(rnd.randint(0, 100)))
+        for sep in [r'\n', r'\n\s*\n']:
+            expected = [paragraph for paragraph in re.split(sep, text) if paragraph.strip()]
+            for blocksize in [1, 2, 3, 64]:
+                assert list(stream_paragraphs(io.StringIO(text), sep=sep, blocksize=blocksize)) == expected
+                assert list(stream_paragraphs(io.BytesIO(text.encode('utf-8')), sep=sep, blocksize=blocksize)) == expected
+
+
+def test_stream_paragraphs_mmap(tmpdir):
+    """a memory-mapped file is segmented like the text"""
+    text = _DEMO_DPAR * 50
+    filepath = tmpdir.join('document.txt')
+    filepath.write_text(text, encoding='utf-8')
+    chunker = partial(split_paragraphs, sep=re.compile(r'\n\n'))
+    expected = segment(text, 100, 0.05, chunker=chunker, tokenizer=tokenize)
+    with open(str(filepath), 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as document:
+        chunker = partial(stream_paragraphs, sep=re.compile(r'\n\n'), blocksize=100)
+        assert segment(document, 100, 0.05, chunker=chunker, tokenizer=tokenize) == expected
+
+
+def test_stream_paragraphs_dkpro():
+    """runs of paragraph IDs match the groups of split_paragraphs"""
+    dkpro_document = pd.DataFrame({'Token': list('abcdefg'), 'ParagraphId': [1, 1, 2, 3, 3, 3, 4]})
+    streamed = list(stream_paragraphs(dkpro_document))
+    expected = split_paragraphs(dkpro_document)
+    assert len(streamed) == len(expected) == 4
+    for paragraph, expected_paragraph in zip(streamed, expected):
+        pd.testing.assert_frame_equal(paragraph, expected_paragraph)
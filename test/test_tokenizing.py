@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dariah_topics.preprocessing import tokenize, tokenize_corpus
+from pathlib import Path
+import regex
+
+
+project_path = Path(__file__).absolute().parent.parent
+
+
+def _corpus(n=100):
+    paths = sorted(project_path.joinpath('grenzboten_sample').glob('*.txt'))
+    texts = [path.read_text(encoding='utf-8')[:2000] for path in paths]
+    return [texts[i % len(texts)][i:] for i in range(n)]
+
+
+def test_tokenize_corpus_order():
+    """documents tokenized in many chunks by several processes keep their order"""
+    corpus = _corpus()
+    expected = [list(tokenize(document)) for document in corpus]
+    assert list(tokenize_corpus(iter(corpus), processes=2, chunksize=3)) == expected
+
+
+def test_tokenize_corpus_single_process():
+    """with one process documents are tokenized in the calling process"""
+    corpus = _corpus(10)
+    expected = [list(tokenize(document, lower=False)) for document in corpus]
+    assert list(tokenize_corpus(corpus, lower=False, processes=1)) == expected
+
+
+def test_tokenize_corpus_compiled_pattern():
+    """a precompiled pattern is used as is, in the calling and in worker processes"""
+    corpus = _corpus(20)
+    pattern = regex.compile(r'\p{Lu}\p{L}+')
+    expected = [list(tokenize(document, pattern, lower=False)) for document in corpus]
+    assert list(tokenize_corpus(corpus, pattern, lower=False, processes=1)) == expected
+    assert list(tokenize_corpus(corpus, pattern, lower=False, processes=2, chunksize=3)) == expected